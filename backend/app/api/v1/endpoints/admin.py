@@ -0,0 +1,31 @@
+from hmac import compare_digest
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.config import settings
+from app.core.profiling.store import ProfileStore, get_profile_store
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Admin routes are closed unless ADMIN_TOKEN is set and sent as ``X-Admin-Token``"""
+    if not settings.ADMIN_TOKEN or not x_admin_token or not compare_digest(
+        x_admin_token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+@router.get("/profiles", summary="List captured request profiles")
+def list_profiles(store: ProfileStore = Depends(get_profile_store)):
+    return {"status": "success", "profiles": store.entries()}
+
+@router.get("/profiles/{profile_id}", summary="Download a profile as collapsed stacks")
+def download_profile(profile_id: str, store: ProfileStore = Depends(get_profile_store)):
+    path = store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    # Collapsed stacks, as read by flamegraph.pl and speedscope
+    return FileResponse(path, media_type="text/plain", filename=path.name)
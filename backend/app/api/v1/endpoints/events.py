@@ -0,0 +1,20 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+from app.core.events.broadcast import EVENT_STREAM_MEDIA_TYPE, EventBroadcaster, get_event_broadcaster
+
+router = APIRouter()
+
+@router.get("/", summary="Stream review and stats changes (Server-Sent Events)")
+async def stream_events(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    broadcaster: EventBroadcaster = Depends(get_event_broadcaster),
+):
+    return StreamingResponse(
+        broadcaster.stream(last_event_id),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        # Proxies must pass events through as they are written
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,90 +1,227 @@
 # backend/app/api/v1/endpoints/reviews.py
-from fastapi import APIRouter, HTTPException
-import json
-from pathlib import Path
-from collections import Counter
-import re
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.config import settings
+from app.core.aggregators.analytics import aggregate_reviews
+from app.core.aggregators.trends import utc_day
+from app.core.cache.results import REVIEW_CONTENT, ResultCache, get_result_cache
+from app.core.metrics.registry import span
+from app.core.normalizers.hostaway import review_payload
+from app.core.store.reviews import ReviewStore, get_review_store
+from app.db.repositories.reviews import ReviewRepository, get_review_repository
+from app.models.enums import ResponseFormat, ReviewSource, SortField, TrendGranularity
+from app.models.review import BulkReviewUpdate, ReviewFilters
+from app.services.moderation import moderate
+from app.utils.filters import decode_cursor, filter_reviews, paginate_reviews, sort_reviews
+from app.utils.responses import listing_response
+from app.utils.validators import validate_date_range
 
 router = APIRouter()
 
-def normalize_source(raw: str) -> str:
-    if not raw:
-        return "unknown"
-    s = str(raw).lower()
-    s_clean = re.sub(r"[^a-z0-9]+", "", s)
-    if "airbnb" in s_clean:
-        return "airbnb"
-    if "booking" in s_clean or "bookingcom" in s_clean:
-        return "booking"
-    if "google" in s_clean:
-        return "google"
-    if "hostaway" in s_clean:
-        return "hostaway"
-    if "manual" in s_clean:
-        return "manual"
-    return "unknown"
-
-def load_mock_reviews():
-    mock_path = Path(__file__).resolve().parents[3] / "data" / "mock_reviews.json"
-    with open(mock_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    for r in data:
-        raw = r.get("channel") or r.get("source") or ""
-        r["source"] = normalize_source(raw)
-    return data
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 500
+MAX_TREND_BUCKETS = 1000
 
 @router.get("/", summary="Get all reviews")
-async def get_reviews():
+def get_reviews(
+    filters: ReviewFilters = Depends(),
+    sort_by: Optional[SortField] = None,
+    sort_desc: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables pagination"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    response_format: ResponseFormat = Query(ResponseFormat.JSON, alias="format"),
+    store: ReviewStore = Depends(get_review_store),
+):
+    validate_date_range(filters.start_date, filters.end_date)
+    paginate = limit is not None or cursor is not None
+    sort_field = sort_by.value if sort_by else ("date" if paginate else None)
+    if cursor:
+        try:
+            decode_cursor(cursor, sort_field, sort_desc)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     try:
-        reviews = load_mock_reviews()
-        return {"status": "success", "result": reviews}
+        criteria = filters.model_dump(exclude_none=True)
+        with span("filter"):
+            matches = filter_reviews(store, **criteria) if criteria else None
+
+        if paginate:
+            with span("paginate"):
+                page, next_cursor = paginate_reviews(
+                    store, matches, sort_field, sort_desc, limit or DEFAULT_PAGE_SIZE, cursor
+                )
+            reviews = store.iter_rows([r["id"] for r in page])
+            envelope = {"status": "success", "next_cursor": next_cursor}
+            return listing_response(reviews, response_format, envelope)
+
+        # Rows are built lazily, so streamed formats start sending right away
+        if matches is not None:
+            if sort_field:
+                with span("sort"):
+                    matches = sort_reviews(matches, sort_field, sort_desc)
+            reviews = store.iter_rows([r["id"] for r in matches])
+        elif sort_field:
+            # The store keeps every sort order precomputed
+            order = store.sort_order(sort_field)
+            ids = [review_id for _, review_id in (reversed(order) if sort_desc else order)]
+            reviews = store.iter_rows(ids)
+        else:
+            reviews = store.iter_rows()
+        return listing_response(reviews, response_format, {"status": "success"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/analytics", summary="Get review analytics")
-async def get_review_analytics():
-    try:
-        reviews = load_mock_reviews()
-        total = len(reviews)
-        if total == 0:
-            return {"status": "success", "ratingDistribution": [], "sourceDistribution": [], "sentiment": []}
-
-        rating_counts = Counter(r.get("rating", 0) for r in reviews)
-        rating_distribution = [
-            {"rating": k, "count": v, "percentage": round((v / total) * 100, 1)}
-            for k, v in sorted(rating_counts.items(), reverse=True)
-        ]
-
-        source_counts = Counter(r.get("source", "unknown") for r in reviews)
-        source_distribution = [{"source": k, "count": v} for k, v in source_counts.items()]
-
-        positive = sum(1 for r in reviews if (r.get("rating") or 0) >= 4)
-        neutral = sum(1 for r in reviews if (r.get("rating") or 0) == 3)
-        negative = sum(1 for r in reviews if (r.get("rating") or 0) <= 2)
-
-        sentiment = [
-            {"label": "Positive", "value": round((positive / total) * 100, 1)},
-            {"label": "Neutral", "value": round((neutral / total) * 100, 1)},
-            {"label": "Negative", "value": round((negative / total) * 100, 1)},
-        ]
-
+def _review_analytics(store: ReviewStore) -> dict:
+    with span("aggregate"):
+        result = aggregate_reviews(*store.analytics_columns())
+    if result.total == 0:
         return {
             "status": "success",
-            "ratingDistribution": rating_distribution,
-            "sourceDistribution": source_distribution,
-            "sentiment": sentiment,
+            "ratingDistribution": [],
+            "sourceDistribution": [],
+            "sentiment": [],
+            "propertySentiment": [],
         }
+
+    rating_distribution = [
+        {"rating": k, "count": v, "percentage": result.percentage(v)}
+        for k, v in result.rating_counts
+    ]
+    source_distribution = [{"source": k, "count": v} for k, v in result.source_counts]
+
+    sentiment = [
+        {"label": "Positive", "value": result.percentage(result.positive)},
+        {"label": "Neutral", "value": result.percentage(result.neutral)},
+        {"label": "Negative", "value": result.percentage(result.negative)},
+    ]
+    property_sentiment = [
+        {"property_id": pid, "positive": positive, "neutral": neutral, "negative": negative, "score": score}
+        for pid, positive, neutral, negative, score in result.property_sentiment
+    ]
+
+    return {
+        "status": "success",
+        "ratingDistribution": rating_distribution,
+        "sourceDistribution": source_distribution,
+        "sentiment": sentiment,
+        "propertySentiment": property_sentiment,
+    }
+
+# Cached results are computed in the threadpool, so concurrent misses can share one computation
+@router.get("/analytics", summary="Get review analytics")
+def get_review_analytics(
+    store: ReviewStore = Depends(get_review_store),
+    cache: ResultCache = Depends(get_result_cache),
+):
+    try:
+        return cache.get_or_compute(
+            "reviews.analytics", {}, lambda: _review_analytics(store), depends_on=[REVIEW_CONTENT]
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    
-@router.get("/stats")
-def get_global_stats():
-    reviews = load_mock_reviews()
-    if not reviews:
+
+def _global_stats(store: ReviewStore) -> dict:
+    with span("aggregate"):
+        result = aggregate_reviews(store.columns())
+    if not result.total:
         return {"total_reviews": 0, "average_rating": 0}
-    ratings = [r["rating"] for r in reviews]
     return {
-        "total_reviews": len(ratings),
-        "average_rating": round(sum(ratings) / len(ratings), 1)
+        "total_reviews": result.total,
+        "average_rating": round(result.rating_sum / result.total, 1)
+    }
+
+@router.get("/stats")
+def get_global_stats(
+    store: ReviewStore = Depends(get_review_store),
+    cache: ResultCache = Depends(get_result_cache),
+):
+    return cache.get_or_compute("reviews.stats", {}, lambda: _global_stats(store), depends_on=[REVIEW_CONTENT])
+
+def _category_analytics(store: ReviewStore, property_id: Optional[str]) -> dict:
+    with span("aggregate"):
+        per_property, overall = store.category_breakdowns()
+    if property_id is not None:
+        per_property = {property_id: per_property[property_id]} if property_id in per_property else {}
+    return {
+        "status": "success",
+        "portfolio": overall.to_dict(),
+        "properties": {pid: breakdown.to_dict() for pid, breakdown in per_property.items()},
+    }
+
+@router.get("/categories", summary="Get per-category rating analytics")
+def get_category_analytics(
+    property_id: Optional[str] = None,
+    store: ReviewStore = Depends(get_review_store),
+    cache: ResultCache = Depends(get_result_cache),
+):
+    return cache.get_or_compute(
+        "reviews.categories",
+        {"property_id": property_id},
+        lambda: _category_analytics(store, property_id),
+        depends_on=[REVIEW_CONTENT],
+    )
+
+@router.get("/trends", summary="Get rating and volume trends")
+def get_review_trends(
+    property_id: Optional[str] = None,
+    source: Optional[ReviewSource] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    granularity: TrendGranularity = TrendGranularity.MONTH,
+    store: ReviewStore = Depends(get_review_store),
+):
+    validate_date_range(start_date, end_date)
+    start = utc_day(start_date) if start_date else None
+    end = utc_day(end_date) if end_date else None
+    try:
+        with span("aggregate"):
+            buckets = store.trends(
+                property_id, source.value if source else None, start, end, granularity.value, MAX_TREND_BUCKETS
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "status": "success",
+        "granularity": granularity.value,
+        "trends": [bucket.to_dict() for bucket in buckets],
+    }
+
+@router.get("/changes", summary="Get reviews changed since a dataset version")
+def get_review_changes(
+    since: str = Query(..., description="Dataset version of the client's last sync"),
+    store: ReviewStore = Depends(get_review_store),
+):
+    # Read first, so writes racing this request are sent again next time rather than missed
+    version = store.version
+    changes = store.changes_since(since)
+    if changes is None:
+        # Another load, or further back than the change log reaches
+        return {"status": "success", "version": version, "resync": True, "upserted": [], "deleted": []}
+    written, deleted = changes
+    return {
+        "status": "success",
+        "version": version,
+        "resync": False,
+        "upserted": [review_payload(record, *store.review_stamps(record["id"])) for record in written],
+        "deleted": deleted,
+    }
+
+@router.post("/moderation", summary="Approve or reject reviews in bulk")
+async def moderate_reviews(
+    update: BulkReviewUpdate,
+    store: ReviewStore = Depends(get_review_store),
+    repository: ReviewRepository = Depends(get_review_repository),
+):
+    if len(update.ids) > settings.MODERATION_MAX_BATCH:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.MODERATION_MAX_BATCH} reviews per request"
+        )
+    outcomes = await moderate(store, repository, update.ids, update.status, update.response)
+    return {
+        "status": "success",
+        "updated": sum(outcome == "updated" for outcome in outcomes.values()),
+        "results": [{"id": review_id, "result": outcome} for review_id, outcome in outcomes.items()],
     }
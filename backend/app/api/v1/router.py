@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import reviews, properties
+from app.api.v1.endpoints import admin, events, reviews, properties
 
 api_router = APIRouter()
 
 api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
 api_router.include_router(properties.router, tags=["properties"]) 
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -4,6 +4,8 @@ from typing import List, Union
 
 class Settings(BaseSettings):
     DATABASE_URL: str | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
     API_PREFIX: str = "/api/v1"
 
     # Hostaway
@@ -11,6 +13,66 @@ class Settings(BaseSettings):
     HOSTAWAY_ACCOUNT_ID: int | None = 61148
     HOSTAWAY_API_KEY: str | None = None
     HOSTAWAY_USE_MOCK: bool = True
+    HOSTAWAY_TIMEOUT: float = 10.0
+    HOSTAWAY_PAGE_SIZE: int = 100
+    HOSTAWAY_MAX_CONCURRENCY: int = 4
+    HOSTAWAY_MAX_RETRIES: int = 5
+    HOSTAWAY_SYNC_ENABLED: bool = True
+    HOSTAWAY_SYNC_INTERVAL: float = 300.0
+    HOSTAWAY_SYNC_BATCH_SIZE: int = 200
+    HOSTAWAY_SYNC_STATE_PATH: str | None = None  # defaults to app/data/hostaway_sync_state.json
+    HOSTAWAY_SYNC_FULL_EVERY: int = 12  # every Nth poll re-reads everything to catch edits (0: first only)
+    HOSTAWAY_SYNC_LOCK_PATH: str | None = None   # defaults to app/data/hostaway_sync.lock
+
+    # Google Places
+    GOOGLE_PLACES_API_KEY: str | None = None
+    GOOGLE_PLACES_TIMEOUT: float = 30.0
+    GOOGLE_PLACES_MAX_CONCURRENCY: int = 8
+    GOOGLE_PLACES_REVIEWS_TTL: float = 3600.0
+    GOOGLE_PLACES_CACHE_PATH: str | None = None  # defaults to app/data/google_place_ids.json
+
+    # Review store
+    REVIEWS_DATA_PATH: str | None = None  # defaults to app/data/mock_reviews.json
+    CHANGE_LOG_SIZE: int = 50000          # review writes kept for delta sync; older clients resync
+    REVIEW_STORE_REFRESH_SECONDS: float = 5.0
+    INGEST_BATCH_SIZE: int = 5000
+    REVIEW_SNAPSHOT_PATH: str | None = None  # shared mmap snapshot for multi-worker deployments
+
+    # Sentiment scoring
+    SENTIMENT_CACHE_PATH: str | None = None  # defaults to app/data/sentiment_scores.tsv
+    SENTIMENT_WORKERS: int | None = None     # process pool size; defaults to the CPU count
+    SENTIMENT_BATCH_SIZE: int = 2000         # texts per pool task
+    SENTIMENT_POOL_THRESHOLD: int = 5000     # fewer uncached texts than this are scored inline
+
+    # Moderation
+    MODERATION_MAX_BATCH: int = 10000  # ids accepted per bulk moderation request
+    MODERATION_POLL_SECONDS: float = 2.0  # how often each worker applies decisions made by the others (0: never)
+
+    # Server-Sent Events
+    EVENTS_BUFFER_SIZE: int = 1024          # changes kept for slow or reconnecting clients
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_MAX_IDS: int = 500               # larger writes are sent as a resync
+
+    # Request metrics
+    METRICS_ENABLED: bool = True  # per-route timings on /metrics (Prometheus format)
+
+    # Profiling (opt-in)
+    ADMIN_TOKEN: str | None = None        # enables /admin routes and X-Profile: <token> per request
+    PROFILER_SAMPLE_RATE: float = 0.0     # fraction of all requests profiled without the header
+    PROFILER_INTERVAL: float = 0.005      # seconds between stack samples
+    PROFILER_DIR: str | None = None       # defaults to app/data/profiles
+    PROFILER_MAX_PROFILES: int = 100      # older profiles are deleted
+
+    # Result cache for analytics endpoints
+    RESULT_CACHE_URL: str | None = None  # redis://... to share across nodes; in-process LRU when unset
+    RESULT_CACHE_MAX_ENTRIES: int = 1024
+    RESULT_CACHE_TTL: float = 300.0
+
+    # HTTP caching: Cache-Control per route prefix (below API_PREFIX); listed routes get ETags
+    HTTP_CACHE_CONTROL: dict[str, str] = {
+        "/reviews": "no-cache",
+        "/properties": "no-cache",
+    }
 
     # CORS
     BACKEND_CORS_ORIGINS: Union[str, List[str]] = []
@@ -1,3 +1,188 @@
+"""Columnar review aggregation engine"""
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.core.normalizers.hostaway import normalize_source
+from app.core.sentiment.lexicon import NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD
+from app.core.sentiment.scorer import get_sentiment_scorer
+
+# Ratings are bucketed to one decimal place (key = rating * 10), which covers
+# both the 1-5 star scale and Hostaway's 1-10 scale without a sort.
+RATING_SCALE = 10
+MAX_RATING_KEY = 10 * RATING_SCALE
+
+# Sentiment codes; reviews with neither text nor a bucketed rating get none
+NEGATIVE, NEUTRAL, POSITIVE, UNLABELLED = 0, 1, 2, -1
+
+
+@dataclass
+class ReviewColumns:
+    """Review fields laid out as parallel NumPy arrays"""
+    ratings: np.ndarray                 # float64
+    sources: np.ndarray                 # int32 codes into source_labels
+    properties: np.ndarray              # int32 codes into property_labels
+    dates: np.ndarray                   # int64 epoch seconds
+    source_labels: list[str] = field(default_factory=list)
+    property_labels: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "ReviewColumns":
+        """Build columns from `Review`-shaped dicts (raw Hostaway items also work)"""
+        records = list(records)
+        n = len(records)
+        source_codes: dict[str, int] = {}
+        property_codes: dict[str, int] = {}
+
+        ratings = np.fromiter((r.get("rating") or 0 for r in records), dtype=np.float64, count=n)
+        sources = np.fromiter(
+            (source_codes.setdefault(_source_of(r), len(source_codes)) for r in records),
+            dtype=np.int32,
+            count=n,
+        )
+        properties = np.fromiter(
+            (property_codes.setdefault(r.get("property_id") or "", len(property_codes)) for r in records),
+            dtype=np.int32,
+            count=n,
+        )
+        dates = np.fromiter(
+            (int(r["date"].timestamp()) if r.get("date") else 0 for r in records),
+            dtype=np.int64,
+            count=n,
+        )
+        return cls(
+            ratings=ratings,
+            sources=sources,
+            properties=properties,
+            dates=dates,
+            source_labels=list(source_codes),
+            property_labels=list(property_codes),
+        )
+
+
+def _source_of(record: dict) -> str:
+    return record.get("source") or normalize_source(record.get("channel") or "")
+
+
+@dataclass
+class ReviewAggregate:
+    """Every distribution the analytics endpoints need, from one pass"""
+    total: int
+    rating_sum: float
+    rating_counts: list[tuple[float, int]]      # (rating, count), highest first
+    source_counts: list[tuple[str, int]]        # first-seen order
+    property_counts: list[tuple[str, int]]
+    positive: int
+    neutral: int
+    negative: int
+    # (property, positive, neutral, negative, mean text score or None), first-seen order
+    property_sentiment: list[tuple[str, int, int, int, Optional[float]]] = field(default_factory=list)
+
+    def percentage(self, count: int) -> float:
+        return round((count / self.total) * 100, 1) if self.total else 0.0
+
+
+def aggregate_reviews(columns: ReviewColumns, sentiment: Optional[np.ndarray] = None) -> ReviewAggregate:
+    """
+    Compute rating, source, property and sentiment distributions
+
+    Rating and source are counted jointly with a single `np.bincount` over a
+    combined key; every marginal (including the rating-based sentiment split)
+    is then read off that histogram without touching the rows again.
+
+    `sentiment` holds a text score per review (NaN for reviews without
+    text). When given, reviews are labelled by their text and only fall
+    back to the rating split when they have none, and the split is also
+    broken down per property.
+    """
+    total = len(columns)
+    n_sources = max(len(columns.source_labels), 1)
+    if total == 0:
+        return ReviewAggregate(0, 0.0, [], [], [], 0, 0, 0)
+
+    rating_keys = np.clip(np.rint(columns.ratings * RATING_SCALE), 0, MAX_RATING_KEY).astype(np.int64)
+    joint = np.bincount(
+        rating_keys * n_sources + columns.sources,
+        minlength=(MAX_RATING_KEY + 1) * n_sources,
+    ).reshape(MAX_RATING_KEY + 1, n_sources)
+
+    by_rating = joint.sum(axis=1)
+    by_source = joint.sum(axis=0)
+    by_property = np.bincount(columns.properties, minlength=len(columns.property_labels))
+
+    property_sentiment = []
+    if sentiment is None:
+        # Sentiment buckets by star rating: >= 4 positive, 3 neutral, <= 2 negative
+        negative = int(by_rating[: 2 * RATING_SCALE + 1].sum())
+        neutral = int(by_rating[3 * RATING_SCALE])
+        positive = int(by_rating[4 * RATING_SCALE:].sum())
+    else:
+        labels, scored = _sentiment_labels(rating_keys, sentiment)
+        labelled = labels != UNLABELLED
+        n_properties = len(columns.property_labels)
+        split = np.bincount(
+            columns.properties[labelled].astype(np.int64) * 3 + labels[labelled],
+            minlength=n_properties * 3,
+        ).reshape(n_properties, 3)
+        text_counts = np.bincount(columns.properties[scored], minlength=n_properties)
+        text_sums = np.bincount(columns.properties[scored], weights=sentiment[scored], minlength=n_properties)
+        negative, neutral, positive = (int(n) for n in split.sum(axis=0))
+        property_sentiment = [
+            (
+                label,
+                int(split[i, POSITIVE]),
+                int(split[i, NEUTRAL]),
+                int(split[i, NEGATIVE]),
+                round(float(text_sums[i] / text_counts[i]), 3) if text_counts[i] else None,
+            )
+            for i, label in enumerate(columns.property_labels)
+            if by_property[i]
+        ]
+
+    present = np.flatnonzero(by_rating)[::-1]
+    rating_counts = [(_rating_label(k), int(by_rating[k])) for k in present]
+    source_counts = [
+        (label, int(by_source[i])) for i, label in enumerate(columns.source_labels) if by_source[i]
+    ]
+    property_counts = [
+        (label, int(by_property[i])) for i, label in enumerate(columns.property_labels) if by_property[i]
+    ]
+
+    return ReviewAggregate(
+        total=total,
+        rating_sum=float(columns.ratings.sum()),
+        rating_counts=rating_counts,
+        source_counts=source_counts,
+        property_counts=property_counts,
+        positive=positive,
+        neutral=neutral,
+        negative=negative,
+        property_sentiment=property_sentiment,
+    )
+
+
+def _sentiment_labels(rating_keys: np.ndarray, sentiment: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-review sentiment codes, plus the mask of reviews labelled by their text"""
+    by_rating = np.full(len(rating_keys), UNLABELLED, dtype=np.int64)
+    by_rating[rating_keys <= 2 * RATING_SCALE] = NEGATIVE
+    by_rating[rating_keys == 3 * RATING_SCALE] = NEUTRAL
+    by_rating[rating_keys >= 4 * RATING_SCALE] = POSITIVE
+    scored = ~np.isnan(sentiment)
+    by_text = np.where(
+        sentiment >= POSITIVE_THRESHOLD, POSITIVE, np.where(sentiment <= NEGATIVE_THRESHOLD, NEGATIVE, NEUTRAL)
+    )
+    return np.where(scored, by_text, by_rating), scored
+
+
+def _rating_label(key: int) -> float:
+    value = key / RATING_SCALE
+    return int(value) if value.is_integer() else value
+
+
 def calculate_review_analytics(reviews: list):
     if not reviews:
         return {
@@ -6,36 +191,19 @@ def calculate_review_analytics(reviews: list):
             "sentiment": {},
         }
 
-    # Rating distribution
-    ratings = {}
-    for r in reviews:
-        rating = r.get("rating", 0) or 0
-        ratings[rating] = ratings.get(rating, 0) + 1
-
-    rating_distribution = [
-        {"rating": k, "count": v}
-        for k, v in sorted(ratings.items(), reverse=True)
-    ]
-
-    # Source breakdown (mock: channel if exists, else "Unknown")
-    sources = {}
-    for r in reviews:
-        src = r.get("channel", "Unknown")
-        sources[src] = sources.get(src, 0) + 1
-
-    source_distribution = [
-        {"source": k, "count": v} for k, v in sources.items()
-    ]
-
-    # Very simple sentiment placeholder
-    sentiment = {
-        "positive": sum(1 for r in reviews if "good" in r.get("publicReview", "").lower()),
-        "negative": sum(1 for r in reviews if "bad" in r.get("publicReview", "").lower()),
-        "neutral": 0,
-    }
+    texts = [r.get("comment") or r.get("publicReview") or "" for r in reviews]
+    result = aggregate_reviews(ReviewColumns.from_records(reviews), get_sentiment_scorer().score(texts))
 
     return {
-        "rating_distribution": rating_distribution,
-        "source_distribution": source_distribution,
-        "sentiment": sentiment,
+        "rating_distribution": [
+            {"rating": k, "count": v} for k, v in result.rating_counts
+        ],
+        "source_distribution": [
+            {"source": k, "count": v} for k, v in result.source_counts
+        ],
+        "sentiment": {
+            "positive": result.positive,
+            "negative": result.negative,
+            "neutral": result.neutral,
+        },
     }
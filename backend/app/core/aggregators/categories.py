@@ -0,0 +1,137 @@
+"""Per-category review scores (cleanliness, communication, ...) as a dense matrix"""
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import numpy as np
+
+# Hostaway scores categories out of 10
+MAX_CATEGORY_SCORE = 10
+WORST_CATEGORIES = 3
+
+
+class CategoryMatrix:
+    """
+    Category scores with one row per table slot and one column per category
+
+    Unscored cells (and rows of deleted or uncategorized reviews) are NaN.
+    Rows are written in place as reviews arrive; new categories add a
+    column and the row capacity doubles as the table grows.
+    """
+
+    def __init__(self, labels: Iterable[str] = (), rows: int = 0):
+        self.labels: list[str] = list(labels)
+        self.columns = {label: i for i, label in enumerate(self.labels)}
+        self.scores = np.full((rows, len(self.labels)), np.nan, dtype=np.float32)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        labels: list[str],
+        rows: int,
+        slots: np.ndarray,
+        names: np.ndarray,
+        scores: np.ndarray,
+    ) -> "CategoryMatrix":
+        """Build from flat (slot, category code, score) triples; NaN scores stay empty"""
+        matrix = cls(labels, rows)
+        matrix.scores[slots, names] = scores
+        return matrix
+
+    def _column(self, label: str) -> int:
+        column = self.columns.get(label)
+        if column is None:
+            column = self.columns[label] = len(self.labels)
+            self.labels.append(label)
+            extra = np.full((len(self.scores), 1), np.nan, dtype=np.float32)
+            self.scores = np.hstack([self.scores, extra])
+        return column
+
+    def reserve(self, rows: int) -> None:
+        if rows > len(self.scores):
+            grown = np.full((max(rows, 2 * len(self.scores)), len(self.labels)), np.nan, dtype=np.float32)
+            grown[:len(self.scores)] = self.scores
+            self.scores = grown
+
+    def set_row(self, slot: int, categories: Any) -> None:
+        """Replace one review's scores with its raw ``reviewCategory`` list"""
+        self.reserve(slot + 1)
+        self.scores[slot] = np.nan
+        for category in categories if isinstance(categories, list) else ():
+            if not isinstance(category, dict) or not isinstance(category.get("category"), str):
+                continue
+            score = category.get("rating")
+            if isinstance(score, (int, float)) and not isinstance(score, bool):
+                column = self._column(category["category"])
+                self.scores[slot, column] = score
+
+    def clear_row(self, slot: int) -> None:
+        if slot < len(self.scores):
+            self.scores[slot] = np.nan
+
+
+@dataclass
+class CategoryBreakdown:
+    """Category statistics for one group of reviews (a property, or every review)"""
+    labels: list[str]
+    counts: np.ndarray          # scored reviews per category
+    sums: np.ndarray
+    histogram: np.ndarray       # categories x MAX_CATEGORY_SCORE, whole-point buckets
+
+    def means(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.sums / self.counts
+
+    def worst(self, limit: int = WORST_CATEGORIES) -> list[str]:
+        """Lowest-scoring categories, worst first"""
+        means = self.means()
+        scored = np.flatnonzero(self.counts > 0)
+        order = scored[np.argsort(means[scored], kind="stable")]
+        return [self.labels[i] for i in order[:limit]]
+
+    def to_dict(self) -> dict:
+        means = self.means()
+        return {
+            "categories": [
+                {
+                    "category": label,
+                    "average": round(float(means[i]), 2),
+                    "count": int(self.counts[i]),
+                    "distribution": {score + 1: int(n) for score, n in enumerate(self.histogram[i])},
+                }
+                for i, label in enumerate(self.labels)
+                if self.counts[i]
+            ],
+            "worst": self.worst(),
+        }
+
+
+def category_breakdowns(
+    matrix: CategoryMatrix,
+    live: np.ndarray,
+    groups: np.ndarray,
+    group_count: int,
+) -> tuple[list[CategoryBreakdown], CategoryBreakdown]:
+    """
+    Per-group and overall category statistics in a few vectorized passes
+
+    `live` selects the matrix rows to include and `groups` gives each of
+    them a group code below `group_count`.
+    """
+    matrix.reserve(int(live.max()) + 1 if len(live) else 0)
+    scores = matrix.scores[live]
+    categories = scores.shape[1]
+    present = ~np.isnan(scores)
+    cells = (np.asarray(groups, dtype=np.int64)[:, None] * categories + np.arange(categories))[present]
+    values = scores[present].astype(np.float64)
+    buckets = np.clip(np.rint(values), 1, MAX_CATEGORY_SCORE).astype(np.int64) - 1
+
+    size = group_count * categories
+    counts = np.bincount(cells, minlength=size).reshape(group_count, categories)
+    sums = np.bincount(cells, weights=values, minlength=size).reshape(group_count, categories)
+    histogram = np.bincount(cells * MAX_CATEGORY_SCORE + buckets, minlength=size * MAX_CATEGORY_SCORE)
+    histogram = histogram.reshape(group_count, categories, MAX_CATEGORY_SCORE)
+
+    labels = list(matrix.labels)
+    per_group = [CategoryBreakdown(labels, counts[g], sums[g], histogram[g]) for g in range(group_count)]
+    overall = CategoryBreakdown(labels, counts.sum(axis=0), sums.sum(axis=0), histogram.sum(axis=0))
+    return per_group, overall
@@ -0,0 +1,73 @@
+"""Incrementally maintained per-property review statistics"""
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+
+class PropertyAggregate:
+    """
+    Running review statistics for one property
+
+    Count, rating sum, the 1-5 histogram and per-status counts are updated in
+    O(1) as reviews come and go. The latest review date only needs a rescan
+    when the current latest review itself is removed.
+    """
+    __slots__ = ("count", "rating_sum", "histogram", "status_counts", "_latest", "_latest_stale")
+
+    def __init__(self):
+        self.count = 0
+        self.rating_sum = 0
+        self.histogram = [0] * 6            # index 1-5; index 0 unused
+        self.status_counts: dict[str, int] = {}
+        self._latest: Optional[datetime] = None
+        self._latest_stale = False
+
+    def add(self, record: dict) -> None:
+        rating = record.get("rating")
+        if rating is not None:
+            star = int(rating)
+            self.count += 1
+            self.rating_sum += star
+            if 1 <= star <= 5:
+                self.histogram[star] += 1
+        status = record["status"]
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if not self._latest_stale and (self._latest is None or record["date"] > self._latest):
+            self._latest = record["date"]
+
+    def remove(self, record: dict) -> None:
+        rating = record.get("rating")
+        if rating is not None:
+            star = int(rating)
+            self.count -= 1
+            self.rating_sum -= star
+            if 1 <= star <= 5:
+                self.histogram[star] -= 1
+        self.status_counts[record["status"]] -= 1
+        if record["date"] == self._latest:
+            self._latest_stale = True
+
+    def change_status(self, old: str, new: str, count: int = 1) -> None:
+        self.status_counts[old] -= count
+        self.status_counts[new] = self.status_counts.get(new, 0) + count
+
+    def latest_date(self, dates: Callable[[], Iterable[datetime]]) -> Optional[datetime]:
+        """Latest review date; `dates` is only called to rebuild a stale value"""
+        if self._latest_stale:
+            self._latest = max(dates(), default=None)
+            self._latest_stale = False
+        return self._latest
+
+    @property
+    def average_rating(self) -> float:
+        if not self.count:
+            return 0
+        if self.rating_sum % self.count == 0:
+            return self.rating_sum // self.count
+        return round(self.rating_sum / self.count, 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "total_reviews": self.count,
+            "average_rating": self.average_rating,
+            "rating_distribution": {i: self.histogram[i] for i in range(1, 6)},
+        }
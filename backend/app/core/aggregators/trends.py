@@ -0,0 +1,249 @@
+"""Daily review rollups answering trend queries over any date range"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+
+# Per-day totals: reviews, rated reviews, rating sum, then the 1-5 star histogram
+REVIEWS, RATED, RATING_SUM, HISTOGRAM = 0, 1, 2, 3
+FIELDS = 8
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def utc_day(value: datetime) -> date:
+    """Calendar day of a timestamp in UTC (naive values are taken as UTC)"""
+    if value.utcoffset():
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+class DailySeries:
+    """
+    Sparse per-day totals for one (property, source) slice
+
+    Writes touch one day's row in O(1). Reads go through prefix sums over
+    the dense day range, rebuilt on the first read after a write, so the
+    totals between any two days cost two lookups.
+    """
+    __slots__ = ("days", "_span", "_prefix")
+
+    def __init__(self):
+        self.days: dict[int, list[float]] = {}
+        self._span: Optional[tuple[int, int]] = None
+        self._prefix: Optional[np.ndarray] = None
+
+    def add(self, day: int, rating: Optional[float], sign: int) -> None:
+        row = self.days.get(day)
+        if row is None:
+            row = self.days[day] = [0.0] * FIELDS
+        row[REVIEWS] += sign
+        if rating is not None:
+            row[RATED] += sign
+            row[RATING_SUM] += sign * rating
+            star = int(rating)
+            if 1 <= star <= 5:
+                row[HISTOGRAM + star - 1] += sign
+        if not row[REVIEWS]:
+            del self.days[day]
+        self._prefix = None
+
+    def span(self) -> Optional[tuple[int, int]]:
+        """First and last day with reviews"""
+        self.prefix()
+        return self._span
+
+    def prefix(self) -> np.ndarray:
+        """Row i holds the totals of every day before `first day + i`"""
+        if self._prefix is None:
+            self._span = (min(self.days), max(self.days)) if self.days else None
+            first, last = self._span or (0, -1)
+            dense = np.zeros((last - first + 2, FIELDS))
+            if self.days:
+                offsets = np.fromiter(self.days.keys(), dtype=np.int64, count=len(self.days)) - first + 1
+                dense[offsets] = np.array(list(self.days.values()))
+            self._prefix = np.cumsum(dense, axis=0)
+        return self._prefix
+
+    def between(self, edges: list[int]) -> np.ndarray:
+        """Totals for each [edges[i], edges[i + 1]) range of day ordinals"""
+        prefix = self.prefix()
+        first = self._span[0] if self._span else 0
+        index = np.clip(np.asarray(edges, dtype=np.int64) - first, 0, len(prefix) - 1)
+        return np.diff(prefix[index], axis=0)
+
+
+@dataclass
+class TrendBucket:
+    """Totals for one day, week or month"""
+    start: date
+    reviews: int
+    rated: int
+    rating_sum: float
+    histogram: list[int]
+
+    @property
+    def average_rating(self) -> Optional[float]:
+        return round(self.rating_sum / self.rated, 2) if self.rated else None
+
+    def to_dict(self) -> dict:
+        return {
+            "period": self.start.isoformat(),
+            "reviews": self.reviews,
+            "average_rating": self.average_rating,
+            "rating_distribution": {i + 1: count for i, count in enumerate(self.histogram)},
+        }
+
+
+def bucket_count(start: date, end: date, granularity: str) -> int:
+    if granularity == "day":
+        return (end - start).days + 1
+    if granularity == "week":
+        return (end - start + timedelta(days=start.weekday())).days // 7 + 1
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def bucket_starts(start: date, end: date, granularity: str) -> list[date]:
+    """Start of every day, ISO week or month overlapping [start, end]"""
+    if granularity == "day":
+        current = start
+    elif granularity == "week":
+        current = start - timedelta(days=start.weekday())
+    elif granularity == "month":
+        current = start.replace(day=1)
+    else:
+        raise ValueError(f"Unknown granularity {granularity!r}")
+    starts = []
+    while current <= end:
+        starts.append(current)
+        if granularity == "day":
+            current += timedelta(days=1)
+        elif granularity == "week":
+            current += timedelta(weeks=1)
+        elif current.month == 12:
+            current = current.replace(year=current.year + 1, month=1)
+        else:
+            current = current.replace(month=current.month + 1)
+    return starts
+
+
+class TrendRollup:
+    """
+    Daily totals per (property, source), plus one series over every review
+
+    A range query at day, week or month granularity reads each matching
+    series' prefix sums at the bucket edges, so it is O(buckets) for the
+    overall and (property, source) series and O(buckets x sources) for a
+    property, however many reviews it covers.
+    """
+
+    def __init__(self):
+        self._series: dict[tuple[str, str], DailySeries] = defaultdict(DailySeries)
+        self._overall = DailySeries()
+
+    @classmethod
+    def from_arrays(
+        cls,
+        properties: np.ndarray,
+        property_labels: list[str],
+        sources: np.ndarray,
+        source_labels: list[str],
+        dates: np.ndarray,
+        ratings: np.ndarray,
+    ) -> "TrendRollup":
+        """
+        Build the rollup for a whole dataset at once
+
+        Takes parallel arrays: property and source codes into their label
+        lists, dates as epoch microseconds and ratings with NaN for none.
+        """
+        rollup = cls()
+        if not len(dates):
+            return rollup
+        days = dates // MICROSECONDS_PER_DAY + EPOCH_ORDINAL
+        rated = ~np.isnan(ratings)
+        scores = np.where(rated, ratings, 0.0)
+        stars = np.trunc(scores)
+        values = [np.ones(len(days)), rated.astype(np.float64), scores]
+        values.extend((stars == star).astype(np.float64) for star in range(1, 6))
+
+        first = int(days.min())
+        span = int(days.max()) - first + 1
+        offsets = days - first
+        pairs = properties.astype(np.int64) * len(source_labels) + sources
+        for group, series_of in (
+            (pairs * span + offsets, lambda key: rollup._series[
+                property_labels[key // len(source_labels)], source_labels[key % len(source_labels)]
+            ]),
+            (offsets, lambda key: rollup._overall),
+        ):
+            keys, inverse = np.unique(group, return_inverse=True)
+            totals = np.column_stack([np.bincount(inverse, weights=v, minlength=len(keys)) for v in values])
+            for key, row in zip(keys.tolist(), totals.tolist()):
+                series_of(key // span).days[first + key % span] = row
+        return rollup
+
+    def add(self, record: dict) -> None:
+        self._apply(record, 1)
+
+    def remove(self, record: dict) -> None:
+        self._apply(record, -1)
+
+    def _apply(self, record: dict, sign: int) -> None:
+        day = utc_day(record["date"]).toordinal()
+        rating = record["rating"]
+        rating = float(rating) if rating is not None else None
+        self._series[record["property_id"], record["source"]].add(day, rating, sign)
+        self._overall.add(day, rating, sign)
+
+    def _matching(self, property_id: Optional[str], source: Optional[str]) -> list[DailySeries]:
+        if property_id is None and source is None:
+            return [self._overall]
+        return [
+            series
+            for (series_property, series_source), series in self._series.items()
+            if (property_id is None or series_property == property_id)
+            and (source is None or series_source == source)
+        ]
+
+    def query(
+        self,
+        property_id: Optional[str] = None,
+        source: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = "month",
+        max_buckets: Optional[int] = None,
+    ) -> list[TrendBucket]:
+        """
+        Buckets covering [start, end], which default to the first and last review
+
+        Raises ValueError when the range would need more than `max_buckets`.
+        """
+        parts = [series for series in self._matching(property_id, source) if series.span()]
+        if not parts:
+            return []
+        start = start or date.fromordinal(min(series.span()[0] for series in parts))
+        end = end or date.fromordinal(max(series.span()[1] for series in parts))
+        if start > end:
+            return []
+        if max_buckets is not None and bucket_count(start, end, granularity) > max_buckets:
+            raise ValueError(f"Range spans more than {max_buckets} {granularity} buckets")
+
+        starts = bucket_starts(start, end, granularity)
+        # Partial first and last buckets only count days inside the range
+        edges = [max(day, start).toordinal() for day in starts] + [end.toordinal() + 1]
+        totals = sum(series.between(edges) for series in parts)
+        return [
+            TrendBucket(
+                start=bucket_start,
+                reviews=int(row[REVIEWS]),
+                rated=int(row[RATED]),
+                rating_sum=float(row[RATING_SUM]),
+                histogram=[int(count) for count in row[HISTOGRAM:]],
+            )
+            for bucket_start, row in zip(starts, totals)
+        ]
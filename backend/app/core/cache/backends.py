@@ -0,0 +1,149 @@
+"""Storage backends for the result cache: in-process LRU, or Redis for multi-node deployments"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+import orjson
+
+from app.utils.responses import dumps
+
+
+class CacheBackend(ABC):
+    """
+    Key/value storage with per-entry TTL and tag-based invalidation
+
+    Values are JSON-compatible results; `get` returns None on a miss, so
+    None itself is never cached. Every entry carries tags, and
+    `invalidate` drops all entries carrying any of the given tags.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """The live value stored under `key`, or None"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None:
+        """Store `value` under `key` for `ttl` seconds, tagged with `tags`"""
+
+    @abstractmethod
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry tagged with any of `tags`; returns how many were dropped"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry"""
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local LRU with TTLs; the default, and the stand-in for Redis in tests"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.pop(tag, ()))
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache shared by every node through Redis (or any server speaking its protocol)
+
+    Entries are orjson-encoded strings with a PX expiry; each tag is a set of
+    entry keys, expiring along with its newest entry. Eviction beyond the
+    TTL is left to the server's ``maxmemory-policy`` (e.g. ``allkeys-lru``).
+    """
+
+    def __init__(self, client: Any, prefix: str = "reviews:cache"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "reviews:cache") -> "RedisBackend":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("A Redis result cache needs the 'redis' package installed") from e
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def _entry(self, key: str) -> str:
+        return f"{self.prefix}:entry:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self._entry(key))
+        return orjson.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None:
+        entry, ttl_ms = self._entry(key), max(1, int(ttl * 1000))
+        pipe = self.client.pipeline()
+        pipe.set(entry, dumps(value), px=ttl_ms)
+        for tag in tags:
+            pipe.sadd(self._tag(tag), entry)
+            pipe.pexpire(self._tag(tag), ttl_ms)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tag_keys = [self._tag(tag) for tag in tags]
+        if not tag_keys:
+            return 0
+        entries = self.client.sunion(tag_keys)
+        self.client.delete(*entries, *tag_keys)
+        return len(entries)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:*"))
+        if keys:
+            self.client.delete(*keys)
@@ -0,0 +1,164 @@
+"""
+Cached endpoint results, invalidated by the review store's writes
+
+Analytics responses are pure functions of the review data and the request
+parameters. `ResultCache` keys them on endpoint and normalized parameters
+(plus the store's generation, so a full reload starts afresh) and tags
+each entry with the data it depends on:
+
+- `property_tag`: the content of one property's reviews (property stats);
+  dropped by upserts and removals touching that property.
+- `REVIEW_CONTENT`: the content of every review, but not moderation
+  state (portfolio analytics, stats, categories); dropped by any upsert
+  or removal.
+- `ALL_REVIEWS` (the default): anything about any review; dropped by
+  every write, moderation included.
+
+Portfolio-wide results are therefore recomputed after any content write,
+wherever it lands; only per-property results survive writes to other
+properties, and only moderation leaves content-tagged results in place.
+"""
+import threading
+from typing import Any, Callable, Iterable, Mapping, Optional
+from urllib.parse import urlencode
+
+from app.config import settings
+from app.core.cache.backends import CacheBackend, MemoryBackend, RedisBackend
+from app.core.store.reviews import ReviewStore, StoreChange, get_review_store
+
+# Tag for results that depend on anything about any review
+ALL_REVIEWS = "all"
+# Tag for results over every review's content, independent of moderation status
+REVIEW_CONTENT = "content"
+
+# Writes that only change moderation status (and responses)
+MODERATION_CHANGES = ("status", "moderate")
+
+
+def property_tag(property_id: str) -> str:
+    return f"property:{property_id}"
+
+
+class _Flight:
+    """A computation in progress that concurrent misses wait on"""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ResultCache:
+    """
+    LRU+TTL cache of endpoint results with dependency-tracked invalidation
+
+    Concurrent misses on the same key are coalesced: the first caller
+    computes, the others block until it finishes and share its result (or
+    its exception). A result is only stored if no invalidation happened
+    while it was being computed, so a write can never be masked by a value
+    computed from the data before it.
+    """
+
+    def __init__(self, store: ReviewStore, backend: CacheBackend, ttl: float):
+        self.store = store
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        # Serializes invalidations against stores; bumped by every invalidation
+        self._write_lock = threading.Lock()
+        self._epoch = 0
+        store.subscribe(self.on_store_change)
+
+    def key(self, endpoint: str, params: Mapping[str, Any]) -> str:
+        query = urlencode(sorted((name, value) for name, value in params.items() if value is not None))
+        return f"{self.store.generation}:{endpoint}?{query}"
+
+    def get_or_compute(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any],
+        compute: Callable[[], Any],
+        depends_on: Iterable[str] = (ALL_REVIEWS,),
+    ) -> Any:
+        """Cached result for `endpoint` with `params`, calling `compute` on a miss"""
+        key = self.key(endpoint, params)
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                epoch = self._epoch
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return flight.wait()
+
+        try:
+            value = compute()
+            with self._write_lock:
+                if value is not None and self._epoch == epoch:
+                    self.backend.set(key, value, self.ttl, depends_on)
+            flight.value = value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+        return value
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._write_lock:
+            self._epoch += 1
+            return self.backend.invalidate(tags)
+
+    def on_store_change(self, change: StoreChange) -> None:
+        if change.kind == "reload":
+            # Keys carry the generation, so earlier entries can no longer be hit
+            with self._write_lock:
+                self._epoch += 1
+            return
+        tags = [ALL_REVIEWS]
+        if change.kind not in MODERATION_CHANGES:
+            tags.append(REVIEW_CONTENT)
+            tags.extend(property_tag(property_id) for property_id in change.properties)
+        self.invalidate(tags)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Dependency for the process-wide result cache over the review store"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.RESULT_CACHE_URL:
+                    backend = RedisBackend.from_url(settings.RESULT_CACHE_URL)
+                else:
+                    backend = MemoryBackend(settings.RESULT_CACHE_MAX_ENTRIES)
+                _cache = ResultCache(get_review_store(), backend, settings.RESULT_CACHE_TTL)
+    return _cache
@@ -0,0 +1,193 @@
+"""
+Server-Sent Events fan-out of review store changes
+
+Each store write becomes one entry in a bounded, in-process broadcast
+buffer: a few SSE events (reviews upserted or removed, statuses changed,
+the touched properties' new stats), each carrying the dataset version the
+write produced. Every client reads the buffer through its own cursor at
+the pace its connection drains, so a slow client never holds up the
+others or the writer. A client whose cursor falls off the end of the
+buffer is sent a ``resync`` event, telling it to refetch instead of
+applying deltas.
+"""
+import asyncio
+import secrets
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Optional
+
+from app.config import settings
+from app.core.normalizers.hostaway import review_payload
+from app.core.store.reviews import ReviewStore, StoreChange, get_review_store
+from app.utils.responses import dumps
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+KEEP_ALIVE = b": keep-alive\n\n"
+
+
+def sse_event(event: str, data: Any, event_id: Optional[str] = None) -> bytes:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode() + b"data: " + dumps(data) + b"\n\n"
+
+
+class EventBroadcaster:
+    """
+    Turns store changes into SSE events and streams them to every client
+
+    Store listeners run on whatever thread wrote, so events are encoded
+    there and handed to the event loop, which appends them to the buffer
+    and wakes waiting clients. Nothing is encoded while no client is
+    connected. Event ids combine a per-process token with a sequence
+    number, so a reconnecting client (``Last-Event-ID``) resumes where it
+    left off when the buffer still holds that point, and resyncs otherwise.
+    """
+
+    def __init__(
+        self,
+        store: ReviewStore,
+        buffer_size: int,
+        heartbeat: float,
+        max_ids: int,
+    ):
+        self.store = store
+        self.heartbeat = heartbeat
+        self.max_ids = max_ids
+        self.clients = 0
+        self.resyncs = 0
+        self._token = secrets.token_hex(4)
+        self._events: deque[tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # Keeps changes from different writer threads in the order they are encoded
+        self._order_lock = threading.Lock()
+        store.subscribe(self.on_store_change)
+
+    # -------------------------
+    # Producing
+    # -------------------------
+
+    def on_store_change(self, change: StoreChange) -> None:
+        loop = self._loop
+        if loop is None or not self.clients or loop.is_closed():
+            return
+        with self._order_lock:
+            events = self._encode(change)
+            try:
+                loop.call_soon_threadsafe(self._append, events)
+            except RuntimeError:
+                # The loop shut down between the check and the call
+                pass
+
+    def _encode(self, change: StoreChange) -> list[tuple[str, dict]]:
+        version = change.version
+        if change.kind == "reload" or len(change.ids) > self.max_ids:
+            return [("resync", {"version": version})]
+
+        events: list[tuple[str, dict]] = []
+        if change.kind == "upsert":
+            records = self.store.records_for(change.ids)
+            events.append(("reviews.upserted", {
+                "version": version,
+                "reviews": [
+                    review_payload(record, *self.store.review_stamps(record["id"])) for record in records
+                ],
+            }))
+        elif change.kind == "remove":
+            events.append(("reviews.removed", {"version": version, "ids": list(change.ids)}))
+        else:
+            records = self.store.records_for(change.ids)
+            events.append(("reviews.status", {
+                "version": version,
+                "reviews": [
+                    {"id": record["id"], "status": record["status"], "response": record["response"]}
+                    for record in records
+                ],
+            }))
+        if change.properties:
+            events.append(("properties.stats", {
+                "version": version,
+                "properties": {
+                    property_id: self.store.property_stats(property_id).to_dict()
+                    for property_id in sorted(change.properties)
+                },
+            }))
+        return events
+
+    def _append(self, events: list[tuple[str, dict]]) -> None:
+        """Runs on the event loop: buffer one change and wake the clients"""
+        self._seq += 1
+        event_id = f"{self._token}-{self._seq}"
+        self._events.append((self._seq, b"".join(sse_event(name, data, event_id) for name, data in events)))
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    # -------------------------
+    # Consuming
+    # -------------------------
+
+    def _resume_point(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Sequence number to resume after, if the buffer still reaches back to it"""
+        token, _, seq = (last_event_id or "").partition("-")
+        if token != self._token or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._events[0][0] if self._events else self._seq + 1
+        return seq if oldest - 1 <= seq <= self._seq else None
+
+    def _resync(self, cursor: int) -> bytes:
+        self.resyncs += 1
+        return sse_event("resync", {"version": self.store.version}, f"{self._token}-{cursor}")
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """SSE byte stream for one client; runs until the client disconnects"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+        self.clients += 1
+        try:
+            cursor = self._resume_point(last_event_id)
+            if cursor is None:
+                cursor = self._seq
+                if last_event_id:
+                    yield self._resync(cursor)
+            yield sse_event("ready", {"version": self.store.version}, f"{self._token}-{cursor}")
+
+            while True:
+                if cursor == self._seq:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.heartbeat)
+                    except asyncio.TimeoutError:
+                        yield KEEP_ALIVE
+                    continue
+                oldest = self._events[0][0]
+                if cursor + 1 < oldest:
+                    # Fell further behind than the buffer holds: skip ahead and refetch
+                    cursor = self._seq
+                    yield self._resync(cursor)
+                    continue
+                seq, chunk = self._events[cursor + 1 - oldest]
+                cursor = seq
+                yield chunk
+        finally:
+            self.clients -= 1
+
+
+_broadcaster: Optional[EventBroadcaster] = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_event_broadcaster() -> EventBroadcaster:
+    """Dependency for the process-wide broadcaster of review store changes"""
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                _broadcaster = EventBroadcaster(
+                    get_review_store(),
+                    settings.EVENTS_BUFFER_SIZE,
+                    settings.EVENTS_HEARTBEAT_SECONDS,
+                    settings.EVENTS_MAX_IDS,
+                )
+    return _broadcaster
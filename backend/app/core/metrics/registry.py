@@ -0,0 +1,205 @@
+"""
+In-process request metrics, exposed in the Prometheus text format
+
+Counts and histogram buckets are plain Python lists and dicts keyed by
+route; nothing is aggregated until `/metrics` is scraped, so recording a
+request costs one dict lookup and a few bisects. Code on a hot path can time
+its phases with `span`, which files them under the request's route.
+"""
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+# Seconds; finer than Prometheus' defaults at the low end, where most routes land
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Label for spans timed outside any request (startup loads, background sync)
+BACKGROUND = "background"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _histogram_lines(
+    name: str, labelnames: tuple[str, ...], labels: tuple, buckets: tuple[float, ...], values: list[float]
+) -> list[str]:
+    """Render one series kept as [bucket counts..., +Inf count, sum] in cumulative ``le`` form"""
+    lines = []
+    total = 0
+    for bound, count in zip((*buckets, "+Inf"), values):
+        total += count
+        le = 'le="%s"' % (bound if bound == "+Inf" else _number(bound))
+        lines.append(f"{name}_bucket{_labels(labelnames, labels, le)} {total}")
+    lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(values[-1])}")
+    lines.append(f"{name}_count{_labels(labelnames, labels)} {total}")
+    return lines
+
+
+def _header(name: str, help: str, kind: str) -> list[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+
+
+class Histogram:
+    """
+    Bucketed observations per label set
+
+    Each series is kept as [bucket counts..., +Inf count, sum], with plain
+    (non-cumulative) counts summed up only when rendered. Observations take
+    a lock, since spans are also recorded from threadpool workers.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.series: dict[tuple, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [0] * (len(self.buckets) + 2)
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = _header(self.name, self.help, "histogram")
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self.series.items())
+        for labels, values in series:
+            lines.extend(_histogram_lines(self.name, self.labelnames, labels, self.buckets, values))
+        return lines
+
+
+class RouteStats:
+    """Everything recorded for one (method, route): one lookup per request"""
+    __slots__ = ("statuses", "errors", "latency", "request_size", "response_size")
+
+    def __init__(self):
+        self.statuses: dict[int, int] = {}
+        self.errors = 0
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 2)
+        self.request_size = [0] * (len(SIZE_BUCKETS) + 2)
+        self.response_size = [0] * (len(SIZE_BUCKETS) + 2)
+
+
+class RequestMetrics:
+    """
+    Every metric the timing middleware and spans record
+
+    Route statistics are only written by the middleware on the event loop
+    (and read there by `/metrics`), so they need no lock.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self.in_flight = 0
+        self.spans = Histogram(
+            "app_span_duration_seconds", "Time in instrumented phases, by route", ("route", "phase"), LATENCY_BUCKETS
+        )
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int,
+        spans: list[tuple[str, float]],
+    ) -> None:
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[method, route] = RouteStats()
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        if status >= 500:
+            stats.errors += 1
+        latency = stats.latency
+        latency[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        latency[-1] += seconds
+        sizes = stats.request_size
+        sizes[bisect_left(SIZE_BUCKETS, request_bytes)] += 1
+        sizes[-1] += request_bytes
+        sizes = stats.response_size
+        sizes[bisect_left(SIZE_BUCKETS, response_bytes)] += 1
+        sizes[-1] += response_bytes
+        for phase, elapsed in spans:
+            self.spans.observe((route, phase), elapsed)
+
+    def render(self) -> str:
+        labelnames = ("method", "route")
+        routes = sorted(self.routes.items())
+        lines = _header("http_requests_total", "Requests handled, by route and status code", "counter")
+        for labels, stats in routes:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f"http_requests_total{_labels((*labelnames, 'status'), (*labels, status))} {count}")
+        lines += _header("http_request_errors_total", "Requests that failed with a 5xx status", "counter")
+        for labels, stats in routes:
+            lines.append(f"http_request_errors_total{_labels(labelnames, labels)} {stats.errors}")
+        lines += _header("http_requests_in_flight", "Requests currently being handled", "gauge")
+        lines.append(f"http_requests_in_flight {self.in_flight}")
+        for name, help, attribute, buckets in (
+            ("http_request_duration_seconds", "Time to the end of the response body", "latency", LATENCY_BUCKETS),
+            ("http_request_size_bytes", "Request body size (Content-Length)", "request_size", SIZE_BUCKETS),
+            ("http_response_size_bytes", "Response body bytes sent", "response_size", SIZE_BUCKETS),
+        ):
+            lines += _header(name, help, "histogram")
+            for labels, stats in routes:
+                lines.extend(_histogram_lines(name, labelnames, labels, buckets, getattr(stats, attribute)))
+        lines.extend(self.spans.render())
+        return "\n".join(lines) + "\n"
+
+
+_metrics = RequestMetrics()
+
+# Spans of the request being handled; set by the middleware, inherited by threadpool calls
+current_spans: ContextVar[Optional[list[tuple[str, float]]]] = ContextVar("current_spans", default=None)
+
+
+def get_request_metrics() -> RequestMetrics:
+    return _metrics
+
+
+class span:
+    """
+    Time a phase of the current request (load, filter, sort, paginate, aggregate, serialize, ...)
+
+    Used as ``with span("filter"): ...``. Inside a request the timing is
+    filed under its route once the route is known; anywhere else it is
+    recorded straight away as background work. A class rather than a
+    generator-based context manager, which would cost several times more.
+    """
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = perf_counter() - self.start
+        spans = current_spans.get()
+        if spans is not None:
+            spans.append((self.phase, elapsed))
+        else:
+            _metrics.spans.observe((BACKGROUND, self.phase), elapsed)
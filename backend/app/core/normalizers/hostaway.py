@@ -1,3 +1,16 @@
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from pydantic import TypeAdapter
+
+from app.core.normalizers.base import BaseNormalizer
+from app.data.properties import LISTING_TO_PROPERTY
+from app.models.enums import ReviewSource
+from app.models.review import Review
+
+
 def normalize_hostaway_review(item: dict) -> dict:
     return {
         "id": item.get("id"),
@@ -12,3 +25,137 @@ def normalize_hostaway_review(item: dict) -> dict:
 def normalize_hostaway_response(data: dict) -> list:
     items = data.get("result", [])
     return [normalize_hostaway_review(item) for item in items]
+
+
+# Channel names repeat across the whole export, so the regex only runs once per
+# distinct value.
+@lru_cache(maxsize=256)
+def normalize_source(raw: str) -> str:
+    if not raw:
+        return "unknown"
+    s = str(raw).lower()
+    s_clean = re.sub(r"[^a-z0-9]+", "", s)
+    if "airbnb" in s_clean:
+        return "airbnb"
+    if "booking" in s_clean or "bookingcom" in s_clean:
+        return "booking"
+    if "google" in s_clean:
+        return "google"
+    if "hostaway" in s_clean:
+        return "hostaway"
+    if "manual" in s_clean:
+        return "manual"
+    return "unknown"
+
+
+def normalize_status(raw: str | None) -> str:
+    if raw in ("published", "approved"):
+        return "approved"
+    if raw == "rejected":
+        return "rejected"
+    return "pending"
+
+
+def resolve_property_id(item: dict) -> str:
+    """Map a raw listing to the property slug used by the API"""
+    name = item.get("listingName")
+    if name in LISTING_TO_PROPERTY:
+        return LISTING_TO_PROPERTY[name]
+    return str(item.get("listingId") or name or "")
+
+
+@lru_cache(maxsize=65536)
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO timestamp, treating naive values as UTC"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def to_review_record(item: dict) -> dict:
+    """
+    Convert a raw Hostaway item into a `Review`-shaped dict
+
+    The one place raw items are interpreted: the review store (and so
+    ingestion and sync) and `HostawayNormalizer` all go through it.
+    """
+    submitted = item.get("submittedAt")
+    return {
+        "id": str(item.get("id", "")),
+        "property_id": resolve_property_id(item),
+        "property_name": item.get("listingName"),
+        "guest_name": item.get("guestName"),
+        "comment": item.get("publicReview") or "",
+        "rating": item.get("rating", 0),
+        "date": parse_timestamp(submitted) if submitted else datetime.now(timezone.utc),
+        "status": normalize_status(item.get("status")),
+        "response": item.get("response"),
+        "source": normalize_source(item.get("channel") or item.get("source") or ""),
+        "categories": item.get("reviewCategory") or [],
+    }
+
+
+def review_payload(
+    record: Mapping[str, Any],
+    created_at: datetime,
+    updated_at: Optional[datetime] = None,
+) -> dict:
+    """
+    A store record in `Review`'s serialized shape, without model validation
+
+    Records were normalized once at ingestion, so only the coercions the
+    model would apply remain: rounded float ratings and enum-valued source
+    and status (sources outside `ReviewSource`, like manual entries, are
+    attributed to Hostaway, where they were exported from).
+    """
+    rating = record["rating"]
+    return {
+        "property_id": record["property_id"],
+        "property_name": record["property_name"],
+        "guest_name": record["guest_name"],
+        "rating": round(float(rating), 1) if rating is not None else None,
+        "comment": record["comment"],
+        "date": record["date"],
+        "source": review_source(record["source"]).value,
+        "id": record["id"],
+        "status": normalize_status(record["status"]),
+        "response": record["response"],
+        "categories": record["categories"],
+        "created_at": created_at,
+        "updated_at": updated_at or created_at,
+    }
+
+
+@lru_cache(maxsize=256)
+def review_source(source: str) -> ReviewSource:
+    """The `ReviewSource` for a normalized source name (Hostaway when there is none)"""
+    try:
+        return ReviewSource(source)
+    except ValueError:
+        return ReviewSource.HOSTAWAY
+
+
+REVIEWS_ADAPTER = TypeAdapter(list[Review])
+
+
+class HostawayNormalizer(BaseNormalizer):
+    """
+    Builds validated `Review` models from raw Hostaway review items
+
+    Items go through `to_review_record` and `review_payload`, exactly as
+    the review store serves them, so a normalized review always matches
+    the API's; the batch is then validated in a single `TypeAdapter` call.
+    Items without a usable rating fail validation.
+    """
+
+    def normalize(self, raw_data: dict[str, Any]) -> Review:
+        return self.normalize_batch([raw_data])[0]
+
+    def normalize_batch(self, raw_data_list: list[dict[str, Any]]) -> list[Review]:
+        if not raw_data_list:
+            return []
+        now = datetime.now(timezone.utc)
+        return REVIEWS_ADAPTER.validate_python(
+            [review_payload(to_review_record(item), now) for item in raw_data_list]
+        )
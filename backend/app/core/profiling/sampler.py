@@ -0,0 +1,78 @@
+"""Wall-clock stack sampling, aggregated as flamegraph "collapsed" stacks"""
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+# Innermost frames of threads that are parked rather than working: the event
+# loop waiting in its selector and threadpool workers waiting for a job
+IDLE_FRAMES = {
+    ("selectors", "select"),
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("queue", "get"),
+    ("concurrent.futures.thread", "_worker"),
+}
+
+MAX_DEPTH = 128
+
+
+def frame_name(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}".replace(";", ":").replace(" ", "_")
+
+
+def collapse(frame: FrameType) -> Optional[str]:
+    """One stack as ``outer;...;inner``, or None if the thread is idle"""
+    if (frame.f_globals.get("__name__"), frame.f_code.co_name) in IDLE_FRAMES:
+        return None
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Samples every busy thread's stack on a fixed interval from a daemon thread
+
+    Sampling is wall-clock and process-wide: a profile shows where each
+    working thread was (the event loop and threadpool workers alike), so
+    requests running concurrently with the profiled one show up too. Idle
+    threads are skipped.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = collapse(frame)
+                if stack is not None:
+                    self.stacks[stack] += 1
+
+
+def render_collapsed(stacks: Counter) -> str:
+    """The format read by flamegraph.pl, speedscope and friends: ``stack count`` per line"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
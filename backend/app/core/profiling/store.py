@@ -0,0 +1,82 @@
+"""Captured profiles kept in a bounded on-disk ring"""
+import json
+import re
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+
+DEFAULT_PROFILE_DIR = Path(__file__).resolve().parents[2] / "data" / "profiles"
+
+PROFILE_ID = re.compile(r"^[0-9a-f]{11,}-[0-9a-f]{6}$")
+
+
+class ProfileStore:
+    """
+    Collapsed-stack profiles, one ``<id>.folded`` file each plus a
+    ``<id>.json`` with request details
+
+    Ids start with the capture time in milliseconds, so they sort
+    oldest first; once there are more than `max_profiles`, the oldest are
+    deleted.
+    """
+
+    def __init__(self, directory: Path, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{int(time.time() * 1000):011x}-{secrets.token_hex(3)}"
+
+    def save(self, profile_id: str, meta: dict, collapsed: str) -> None:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{profile_id}.folded").write_text(collapsed, encoding="utf-8")
+            (self.directory / f"{profile_id}.json").write_text(
+                json.dumps({"id": profile_id, **meta}), encoding="utf-8"
+            )
+            ids = self._ids()
+            for stale in ids[:max(len(ids) - self.max_profiles, 0)]:
+                for suffix in (".folded", ".json"):
+                    (self.directory / f"{stale}{suffix}").unlink(missing_ok=True)
+
+    def _ids(self) -> list[str]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(path.stem for path in self.directory.glob("*.folded"))
+
+    def entries(self) -> list[dict]:
+        """Details of every kept profile, newest first"""
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            try:
+                profiles.append(json.loads((self.directory / f"{profile_id}.json").read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                profiles.append({"id": profile_id})
+        return profiles
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        """The collapsed-stack file of a profile, if it is still kept"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.folded"
+        return path if path.is_file() else None
+
+
+_store: Optional[ProfileStore] = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                directory = Path(settings.PROFILER_DIR) if settings.PROFILER_DIR else DEFAULT_PROFILE_DIR
+                _store = ProfileStore(directory, settings.PROFILER_MAX_PROFILES)
+    return _store
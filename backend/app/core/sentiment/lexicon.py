@@ -0,0 +1,136 @@
+"""
+Rule-based review sentiment: a valence lexicon plus a few VADER-style rules
+
+Pure Python with no model files, so it runs offline and in worker
+processes. Word valences are on a -4..4 scale; each word's valence is
+adjusted for preceding intensifiers and negations, clauses after "but"
+outweigh those before it, exclamation marks add emphasis, and the sum
+is squashed into a compound score in [-1, 1].
+"""
+import math
+import re
+
+# Bump when the lexicon or rules change, so cached scores are recomputed
+LEXICON_VERSION = 1
+
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+LEXICON = {
+    # Praise
+    "amazing": 3.1, "awesome": 3.1, "excellent": 3.2, "fantastic": 3.3, "wonderful": 3.1,
+    "perfect": 3.0, "outstanding": 3.2, "superb": 3.1, "brilliant": 2.9, "incredible": 2.9,
+    "exceptional": 3.0, "lovely": 2.8, "beautiful": 2.9, "gorgeous": 3.0, "stunning": 3.0,
+    "great": 3.0, "good": 1.9, "nice": 1.8, "fine": 0.8, "decent": 1.0, "ok": 0.9, "okay": 0.9,
+    "love": 3.2, "loved": 2.9, "enjoy": 2.2, "enjoyed": 2.3, "like": 1.3, "liked": 1.5,
+    "recommend": 2.0, "recommended": 1.9, "best": 3.2, "better": 1.9, "favourite": 2.3, "favorite": 2.3,
+    "happy": 2.7, "pleased": 2.2, "glad": 2.0, "delighted": 2.9, "impressed": 2.4, "satisfied": 1.8,
+    "thank": 1.5, "thanks": 1.9, "grateful": 2.3,
+    # Stay qualities
+    "clean": 1.9, "spotless": 2.6, "tidy": 1.6, "immaculate": 2.8, "fresh": 1.3,
+    "comfortable": 2.0, "comfy": 1.9, "cozy": 1.9, "cosy": 1.9, "spacious": 1.6, "bright": 1.4,
+    "quiet": 1.1, "peaceful": 2.0, "relaxing": 1.9, "modern": 1.1, "stylish": 1.7, "charming": 2.2,
+    "convenient": 1.6, "central": 1.0, "helpful": 2.0, "friendly": 2.2, "welcoming": 2.1,
+    "responsive": 1.6, "attentive": 1.8, "accommodating": 1.9, "professional": 1.4, "kind": 2.0,
+    "easy": 1.4, "smooth": 1.3, "seamless": 1.8, "quick": 1.0, "efficient": 1.5,
+    "well": 1.1, "value": 1.0, "worth": 1.4, "affordable": 1.3, "safe": 1.5, "secure": 1.3,
+    # Complaints
+    "bad": -2.5, "poor": -2.1, "terrible": -3.1, "awful": -3.1, "horrible": -3.1, "dreadful": -3.0,
+    "worst": -3.1, "worse": -2.1, "disappointing": -2.4, "disappointed": -2.3, "disappointment": -2.3,
+    "hate": -2.7, "hated": -3.0, "unpleasant": -2.1, "uncomfortable": -1.9, "unhappy": -2.1,
+    "dirty": -1.9, "filthy": -2.8, "smelly": -1.8, "smell": -1.1, "stained": -1.4, "dusty": -1.3,
+    "mould": -1.9, "mold": -1.9, "damp": -1.4, "broken": -1.8, "damaged": -1.8, "worn": -1.0,
+    "noisy": -1.6, "noise": -1.2, "loud": -1.0, "cold": -0.9, "cramped": -1.5, "tiny": -0.8,
+    "small": -0.5, "dark": -0.7, "outdated": -1.2, "old": -0.4,
+    "rude": -2.3, "unhelpful": -2.0, "unresponsive": -1.8, "ignored": -1.6, "slow": -1.0,
+    "late": -1.1, "delay": -1.2, "delayed": -1.3, "problem": -1.7, "problems": -1.7, "issue": -1.1,
+    "issues": -1.3, "complaint": -1.6, "complain": -1.6, "avoid": -1.9, "overpriced": -1.9,
+    "expensive": -1.0, "unsafe": -2.2, "cockroach": -2.3, "cockroaches": -2.4, "bugs": -1.8,
+    "lacking": -1.3, "missing": -1.1, "mess": -1.7, "messy": -1.6, "nightmare": -2.9,
+    "refund": -1.2, "cancelled": -1.3, "canceled": -1.3, "wrong": -2.1, "fail": -2.2, "failed": -2.3,
+}
+
+# Intensifiers push a word's valence further from zero; dampeners pull it in
+BOOSTERS = {
+    "very": 0.293, "really": 0.293, "extremely": 0.293, "incredibly": 0.293, "absolutely": 0.293,
+    "so": 0.293, "super": 0.293, "totally": 0.293, "truly": 0.293, "completely": 0.293,
+    "highly": 0.293, "exceptionally": 0.293, "most": 0.293, "such": 0.2, "quite": 0.15,
+    "slightly": -0.293, "somewhat": -0.293, "bit": -0.293, "little": -0.293, "fairly": -0.2,
+    "rather": -0.15, "barely": -0.293,
+}
+
+NEGATIONS = {
+    "not", "no", "never", "none", "nothing", "nobody", "nowhere", "neither", "nor",
+    "without", "hardly", "cannot", "cant", "dont", "didnt", "wasnt", "isnt", "arent",
+    "werent", "wouldnt", "couldnt", "shouldnt", "wont", "doesnt", "havent", "hasnt",
+}
+
+NEGATION_SCALAR = -0.74
+NEGATION_WINDOW = 3
+BUT_BEFORE, BUT_AFTER = 0.5, 1.5
+EXCLAMATION_BOOST = 0.292
+MAX_EXCLAMATIONS = 4
+CAPS_BOOST = 0.733
+NORMALIZATION_ALPHA = 15
+
+TOKEN_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?|!")
+
+
+def _is_negation(word: str) -> bool:
+    return word in NEGATIONS or word.endswith("n't")
+
+
+def score_text(text: str) -> float:
+    """Compound sentiment of one text in [-1, 1]; NaN when there are no words"""
+    tokens = TOKEN_RE.findall(text or "")
+    words = [token for token in tokens if token != "!"]
+    if not words:
+        return math.nan
+    lowered = [word.lower() for word in words]
+    shouting = any(word.isupper() and len(word) > 1 for word in words) and not all(
+        word.isupper() for word in words
+    )
+    try:
+        but = lowered.index("but")
+    except ValueError:
+        but = -1
+
+    total = 0.0
+    for i, word in enumerate(lowered):
+        valence = LEXICON.get(word)
+        if valence is None:
+            continue
+        if shouting and words[i].isupper():
+            valence += CAPS_BOOST if valence > 0 else -CAPS_BOOST
+        for distance in range(1, NEGATION_WINDOW + 1):
+            if i < distance:
+                break
+            previous = lowered[i - distance]
+            boost = BOOSTERS.get(previous)
+            if boost is not None:
+                # Further intensifiers count for less, as in VADER
+                scale = 1.0 if distance == 1 else 0.95 if distance == 2 else 0.9
+                valence += boost * scale if valence > 0 else -boost * scale
+            if _is_negation(previous):
+                valence *= NEGATION_SCALAR
+        if but >= 0:
+            valence *= BUT_BEFORE if i < but else BUT_AFTER if i > but else 1.0
+        total += valence
+
+    if total:
+        exclamations = min(tokens.count("!"), MAX_EXCLAMATIONS)
+        total += math.copysign(exclamations * EXCLAMATION_BOOST, total)
+    return total / math.sqrt(total * total + NORMALIZATION_ALPHA)
+
+
+def score_texts(texts: list[str]) -> list[float]:
+    """Score a batch (the unit of work sent to pool workers)"""
+    return [score_text(text) for text in texts]
+
+
+def label(score: float) -> str:
+    if score >= POSITIVE_THRESHOLD:
+        return "positive"
+    if score <= NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
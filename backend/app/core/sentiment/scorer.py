@@ -0,0 +1,169 @@
+"""Batch sentiment scoring with a content-addressed score cache"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.core.sentiment.lexicon import LEXICON_VERSION, score_texts
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / "data" / "sentiment_scores.tsv"
+
+# First line of the cache file; scores from another lexicon version are discarded
+CACHE_HEADER = f"lexicon-v{LEXICON_VERSION}\n"
+
+
+def content_key(text: str) -> str:
+    """Hash of a text under the current lexicon version"""
+    digest = blake2b(text.encode("utf-8"), digest_size=12, person=b"lexicon-v%d" % LEXICON_VERSION)
+    return digest.hexdigest()
+
+
+class SentimentScorer:
+    """
+    Scores review texts, never scoring the same text twice
+
+    Scores are cached by content hash, so a review whose text has not
+    changed is never rescored, whichever id or process it comes from. The
+    cache is persisted as an append-only file of ``key<TAB>score`` lines:
+    each batch appends only its newly scored texts. Batches with enough
+    uncached texts are split across a process pool, started on first use
+    and kept for the scorer's lifetime; smaller ones are scored inline.
+    Blank texts score NaN and are not cached.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        pool_threshold: Optional[int] = None,
+    ):
+        self.cache_path = Path(cache_path or settings.SENTIMENT_CACHE_PATH or DEFAULT_CACHE_PATH)
+        self.workers = workers or settings.SENTIMENT_WORKERS or os.cpu_count() or 1
+        self.batch_size = batch_size or settings.SENTIMENT_BATCH_SIZE
+        self.pool_threshold = pool_threshold if pool_threshold is not None else settings.SENTIMENT_POOL_THRESHOLD
+        self.scored = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._scores: dict[str, float] = {}
+        # Set when the file is missing, unreadable or from another lexicon: the next append starts it afresh
+        self._rewrite = not self._load()
+
+    # -------------------------
+    # Score cache
+    # -------------------------
+
+    def _load(self) -> bool:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                if f.readline() != CACHE_HEADER:
+                    return False
+                for line in f:
+                    key, _, score = line.partition("\t")
+                    try:
+                        self._scores[key] = float(score)
+                    except ValueError:
+                        # A line cut short by a crash mid-append
+                        continue
+            return True
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def _append(self, scores: Iterable[tuple[str, float]]) -> None:
+        lines = "".join(f"{key}\t{score!r}\n" for key, score in scores)
+        with self._file_lock:
+            mode = "w" if self._rewrite else "a"
+            with open(self.cache_path, mode, encoding="utf-8") as f:
+                f.write((CACHE_HEADER if self._rewrite else "") + lines)
+            self._rewrite = False
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+
+    def score(self, texts: list[str]) -> np.ndarray:
+        """Compound scores in [-1, 1] for `texts`, in order (NaN for blank ones)"""
+        scores = np.full(len(texts), np.nan)
+        keys: list[Optional[str]] = []
+        missing: dict[str, str] = {}
+        with self._lock:
+            for text in texts:
+                if not text or not text.strip():
+                    keys.append(None)
+                    continue
+                key = content_key(text)
+                keys.append(key)
+                if key not in self._scores:
+                    missing[key] = text
+
+        if missing:
+            fresh = list(zip(missing, self._score_batch(list(missing.values()))))
+            with self._lock:
+                self._scores.update(fresh)
+                self.scored += len(missing)
+            try:
+                self._append(fresh)
+            except OSError as e:
+                print(f"Could not save sentiment scores: {e}")
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key is not None:
+                    scores[i] = self._scores[key]
+            self.cache_hits += sum(key is not None for key in keys) - len(missing)
+        return scores
+
+    def _score_batch(self, texts: list[str]) -> list[float]:
+        if self.workers <= 1 or len(texts) < self.pool_threshold:
+            return score_texts(texts)
+        chunks = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        try:
+            return [score for chunk in self._executor().map(score_texts, chunks) for score in chunk]
+        except BrokenProcessPool as e:
+            # A worker died; start a new pool next time and finish this batch inline
+            print(f"Sentiment process pool failed: {e}")
+            self.close()
+            return score_texts(texts)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned rather than forked: the server process has threads (and locks) of its own
+                context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+    def close(self) -> None:
+        """Shut the process pool down (a new one is started if scoring needs it again)"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_scorer: Optional[SentimentScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def get_sentiment_scorer() -> SentimentScorer:
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = SentimentScorer()
+    return _scorer
+
+
+def close_sentiment_scorer() -> None:
+    if _scorer is not None:
+        _scorer.close()
@@ -0,0 +1,49 @@
+"""Bounded log of review writes, for answering "what changed since version N" """
+from bisect import bisect_right
+from typing import Optional
+
+
+class ChangeLog:
+    """
+    (change number, review id, deleted) entries in write order
+
+    Change numbers are the store's write counter, so they only grow within
+    a generation. When the log outgrows `capacity` its oldest half is
+    dropped and `floor` advances to the last change dropped: only clients
+    at or past the floor can be answered from the log, everyone else has
+    to resync.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.floor = 0
+        self._numbers: list[int] = []
+        self._ids: list[str] = []
+        self._deleted: list[bool] = []
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def record(self, change: int, ids: list[str], deleted: bool = False) -> None:
+        self._numbers.extend([change] * len(ids))
+        self._ids.extend(ids)
+        self._deleted.extend([deleted] * len(ids))
+        if len(self._numbers) > self.capacity:
+            # Trimming in halves keeps appends amortized O(1)
+            drop = len(self._numbers) - self.capacity // 2
+            self.floor = self._numbers[drop - 1]
+            del self._numbers[:drop], self._ids[:drop], self._deleted[:drop]
+
+    def since(self, change: int) -> Optional[dict[str, bool]]:
+        """
+        Review ids written after `change`, each mapped to whether its last
+        write deleted it (in first-write order), or None if the log was
+        trimmed past `change`
+        """
+        if change < self.floor:
+            return None
+        start = bisect_right(self._numbers, change)
+        latest: dict[str, bool] = {}
+        for review_id, deleted in zip(self._ids[start:], self._deleted[start:]):
+            latest[review_id] = deleted
+        return latest
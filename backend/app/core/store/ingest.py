@@ -0,0 +1,220 @@
+"""
+Streaming ingestion of review exports (JSON arrays or NDJSON, optionally gzipped)
+
+Backfill the snapshot workers serve from (``REVIEW_SNAPSHOT_PATH``, or a
+``REVIEWS_DATA_PATH`` pointing at a snapshot) with:
+    python -m app.core.store.ingest [--replace] [--snapshot <path>] <export>...
+
+Workers pick the new snapshot up on their next refresh.
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Union
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.core.store.reviews import ReviewStore
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\r\n"
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class IngestProgress:
+    """Running totals for one ingestion, passed to the progress callback"""
+    path: str
+    total_bytes: int
+    records: int = 0
+    batches: int = 0
+    bytes_read: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> float:
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.path}: {self.records} reviews in {self.batches} batches, "
+            f"{self.fraction:.1%} of {self.total_bytes / 1e6:.1f} MB, "
+            f"{self.rate:,.0f} reviews/s"
+        )
+
+
+def print_progress(progress: IngestProgress) -> None:
+    print(f"Ingesting {progress}")
+
+
+def iter_export(path: PathLike, progress: Optional[IngestProgress] = None) -> Iterator[dict]:
+    """
+    Yield review items from an export one at a time
+
+    A file whose first character is ``[`` is read as a JSON array, anything
+    else as NDJSON (one object per line). ``.gz`` files are decompressed on
+    the fly. Only the current chunk and the item being decoded are held in
+    memory, never the whole file.
+    """
+    path = Path(path)
+    with open(path, "rb") as raw:
+        binary = gzip.GzipFile(fileobj=raw) if path.suffix == ".gz" else raw
+        text = io.TextIOWrapper(binary, encoding="utf-8")
+
+        def read() -> str:
+            chunk = text.read(CHUNK_SIZE)
+            if progress is not None:
+                progress.bytes_read = raw.tell()
+            return chunk
+
+        head = read()
+        start = len(head) - len(head.lstrip(WHITESPACE))
+        if head[start:start + 1] == "[":
+            yield from _iter_array(head, start + 1, read)
+        else:
+            yield from _iter_lines(head, read)
+
+
+def _iter_array(buf: str, pos: int, read: Callable[[], str]) -> Iterator[dict]:
+    decoder = json.JSONDecoder()
+    expect_item = True
+    eof = False
+    while True:
+        while pos < len(buf) and buf[pos] in WHITESPACE:
+            pos += 1
+        if pos >= len(buf) - 1 and not eof:
+            # Keep at least one character of lookahead so values are never cut short
+            more = read()
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        if pos >= len(buf):
+            raise ValueError("Unterminated JSON array")
+
+        char = buf[pos]
+        if char == "]":
+            return
+        if char == "," and not expect_item:
+            expect_item, pos = True, pos + 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = read()
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield item
+        expect_item, pos = False, end
+        if pos > CHUNK_SIZE:
+            buf, pos = buf[pos:], 0
+
+
+def _iter_lines(head: str, read: Callable[[], str]) -> Iterator[dict]:
+    pending = head
+    while True:
+        more = read()
+        pending += more
+        lines = pending.split("\n")
+        pending = lines.pop() if more else ""
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        if not more:
+            return
+
+
+def iter_batches(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    """Group items into lists of at most `size`"""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def ingest_files(
+    store: "ReviewStore",
+    paths: Iterable[PathLike],
+    batch_size: Optional[int] = None,
+    replace: bool = False,
+    on_progress: Optional[Callable[[IngestProgress], None]] = print_progress,
+) -> list[IngestProgress]:
+    """
+    Stream exports into the store in fixed-size batches
+
+    With ``replace`` the store is rebuilt from the exports alone (indexes are
+    sorted once at the end); otherwise each batch is upserted into the
+    current data. Memory stays bounded by the store plus one batch, whatever
+    the size of the files. `on_progress` is called after every batch.
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    paths = [Path(p) for p in paths]
+    reports = [IngestProgress(path=str(p), total_bytes=os.path.getsize(p)) for p in paths]
+
+    def batches() -> Iterator[list[dict]]:
+        for path, progress in zip(paths, reports):
+            for batch in iter_batches(iter_export(path, progress), batch_size):
+                yield batch
+                progress.records += len(batch)
+                progress.batches += 1
+                if on_progress is not None:
+                    on_progress(progress)
+
+    if replace:
+        store.replace_all(item for batch in batches() for item in batch)
+    else:
+        for batch in batches():
+            store.upsert(batch)
+    return reports
+
+
+def main(argv: list[str]) -> None:
+    from app.core.store.reviews import ReviewStore
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.store.ingest",
+        description="Stream review exports into a review snapshot in bounded batches",
+    )
+    parser.add_argument("exports", nargs="+", type=Path, help="JSON array or NDJSON exports, optionally .gz")
+    parser.add_argument(
+        "--snapshot", type=Path, default=settings.REVIEW_SNAPSHOT_PATH,
+        help="snapshot to write (default: REVIEW_SNAPSHOT_PATH)",
+    )
+    parser.add_argument(
+        "--replace", action="store_true",
+        help="build the snapshot from the exports alone instead of upserting into the existing one",
+    )
+    parser.add_argument("--batch-size", type=int, default=None, help="reviews per batch (default: INGEST_BATCH_SIZE)")
+    args = parser.parse_args(argv)
+    if args.snapshot is None:
+        parser.error("--snapshot is required when REVIEW_SNAPSHOT_PATH is not set")
+
+    store = ReviewStore()
+    if not args.replace and args.snapshot.exists():
+        store.load_file(args.snapshot)
+    reports = ingest_files(store, args.exports, batch_size=args.batch_size, replace=args.replace)
+    path = store.publish_snapshot(args.snapshot)
+    records = sum(report.records for report in reports)
+    print(f"Ingested {records} reviews; wrote {len(store)} reviews to {path} ({path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
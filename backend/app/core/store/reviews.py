@@ -0,0 +1,734 @@
+"""Shared in-memory review store with secondary indexes"""
+import os
+import secrets
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.core.aggregators.analytics import ReviewColumns
+from app.core.aggregators.categories import CategoryBreakdown, CategoryMatrix, category_breakdowns
+from app.core.aggregators.property_stats import PropertyAggregate
+from app.core.aggregators.trends import TrendBucket, TrendRollup
+from app.core.metrics.registry import span
+from app.core.store.changes import ChangeLog
+from app.core.store.ingest import iter_export
+from app.core.store.search import SearchIndex
+from app.core.store.snapshot import SnapshotTable, is_snapshot, write_snapshot
+from app.core.store.table import ReviewRecord, ReviewTable
+from app.core.normalizers.hostaway import normalize_status, to_review_record
+from app.core.sentiment.scorer import get_sentiment_scorer
+
+DEFAULT_DATA_PATH = Path(__file__).resolve().parents[2] / "data" / "mock_reviews.json"
+
+
+# Precomputed sort orders: field -> key function over a record. Each order is
+# a sorted list of (key, id), so ties break on id and keyset cursors can bisect.
+SORT_KEYS = {
+    "date": lambda record: record["date"],
+    "rating": lambda record: float(record["rating"] or 0),
+    "guest_name": lambda record: (record["guest_name"] or "").lower(),
+    "property": lambda record: (record["property_name"] or "").lower(),
+}
+
+
+# Upserts larger than this re-sort the orders once instead of insorting each review
+BULK_UPSERT_THRESHOLD = 64
+
+
+@dataclass(frozen=True)
+class StoreChange:
+    """
+    One write to the store, as passed to `ReviewStore.subscribe` listeners
+
+    `properties` and `sources` cover both the old and the new version of
+    every touched review. A ``reload`` replaces the whole dataset, so it
+    leaves them empty and starts a new generation.
+    """
+    kind: str                       # "reload", "upsert", "remove", "status" or "moderate"
+    version: str
+    ids: tuple[str, ...] = ()
+    properties: frozenset[str] = frozenset()
+    sources: frozenset[str] = frozenset()
+
+
+def rating_bucket(rating: Any) -> int:
+    """Whole-star bucket used by the rating index (0 when missing)"""
+    try:
+        return int(round(float(rating)))
+    except (TypeError, ValueError):
+        return 0
+
+
+class ReviewStore:
+    """
+    Review data loaded once and kept in memory
+
+    Reviews live in a columnar `ReviewTable`, which rebuilds the raw Hostaway
+    item with a normalized ``source`` (served as-is by ``GET /reviews/``) and
+    hands out ``Review``-shaped `ReviewRecord` views used by the property
+    endpoints and filters. Hash indexes map
+    property, source, status and rating bucket to review ids; sorted
+    (key, id) orders by date, rating and guest name support range scans
+    and keyset pagination. A full-text index covers names and comments.
+
+    The table can also be a memory-mapped snapshot shared with other worker
+    processes; it is swapped for a private copy on the first local write.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._table = ReviewTable()
+        # Hash indexes map a key to an insertion-ordered id set (dict keys)
+        self._by_property: dict[str, dict[str, None]] = defaultdict(dict)
+        self._by_source: dict[str, dict[str, None]] = defaultdict(dict)
+        self._by_status: dict[str, dict[str, None]] = defaultdict(dict)
+        self._by_rating: dict[int, dict[str, None]] = defaultdict(dict)
+        self._sort_orders: dict[str, list[tuple[Any, str]]] = {field: [] for field in SORT_KEYS}
+        self._by_date = self._sort_orders["date"]
+        self._property_stats: dict[str, PropertyAggregate] = defaultdict(PropertyAggregate)
+        self._trends = TrendRollup()
+        self._search: Optional[SearchIndex] = SearchIndex()
+        self._columns: Optional[ReviewColumns] = None
+        # Built from the table on first use, then updated row by row
+        self._categories: Optional[CategoryMatrix] = None
+        # Text sentiment per slot, scored on first use; rewritten slots are rescored
+        self._sentiment: Optional[np.ndarray] = None
+        self._sentiment_scored: Optional[np.ndarray] = None
+
+        self.source_path: Optional[Path] = None
+        self._source_stamp: Optional[tuple[int, int]] = None
+        self._checked_at = 0.0
+
+        # Dataset version: which load this is, plus writes applied since
+        self._generation = secrets.token_hex(4)
+        self._changes = 0
+        self._log = ChangeLog(settings.CHANGE_LOG_SIZE)
+        # (created_at, updated_at) of reviews written since the load; the rest date from it
+        self._loaded_at = datetime.now(timezone.utc)
+        self._stamps: dict[str, tuple[datetime, datetime]] = {}
+        self._listeners: list[Callable[[StoreChange], None]] = []
+
+    # -------------------------
+    # Loading
+    # -------------------------
+
+    def load_file(self, path: Path) -> None:
+        """Load (or reload) the store from a snapshot, JSON array or NDJSON export"""
+        stamp = _file_stamp(path)
+        # Derived from the file, so every worker loading it agrees on versions
+        generation = "%x-%x" % stamp
+        with span("load"):
+            if is_snapshot(path):
+                self.attach_table(SnapshotTable(path), generation)
+            else:
+                self.replace_all(iter_export(path), generation)
+        self.source_path = Path(path)
+        self._source_stamp = stamp
+        self._checked_at = time.monotonic()
+
+    def refresh(self) -> bool:
+        """Reload from the source file if it changed on disk"""
+        self._checked_at = time.monotonic()
+        if self.source_path is None:
+            return False
+        try:
+            stamp = _file_stamp(self.source_path)
+        except OSError:
+            return False
+        if stamp == self._source_stamp:
+            return False
+        self.load_file(self.source_path)
+        return True
+
+    def maybe_refresh(self, interval: float) -> bool:
+        """Call `refresh` at most once per `interval` seconds (0 disables)"""
+        if interval <= 0 or time.monotonic() - self._checked_at < interval:
+            return False
+        return self.refresh()
+
+    def replace_all(self, items: Iterable[dict], generation: Optional[str] = None) -> None:
+        """Swap the whole dataset, rebuilding every index off to the side"""
+        fresh = ReviewStore()
+        for item in items:
+            fresh._insert(item)
+        fresh._finish_bulk_load()
+        self._adopt(fresh, generation)
+
+    def attach_table(self, table: ReviewTable, generation: Optional[str] = None) -> None:
+        """Serve an existing table (e.g. a mapped snapshot), indexing it off to the side"""
+        fresh = ReviewStore()
+        fresh._table = table
+        # Built on first search, so mapping a snapshot stays cheap
+        fresh._search = None
+        for review_id, slot in table.slots.items():
+            fresh._index(review_id, table.record_dict(slot))
+        fresh._finish_bulk_load()
+        self._adopt(fresh, generation)
+
+    def publish_snapshot(self, path: Path) -> Path:
+        """Write the current data as a snapshot for other workers to map"""
+        with self._lock:
+            return write_snapshot(self._table, path)
+
+    def _finish_bulk_load(self) -> None:
+        for order in self._sort_orders.values():
+            order.sort()
+        self._trends = self._table.trends()
+
+    def _adopt(self, fresh: "ReviewStore", generation: Optional[str] = None) -> None:
+        with self._lock:
+            self._table = fresh._table
+            self._by_property = fresh._by_property
+            self._by_source = fresh._by_source
+            self._by_status = fresh._by_status
+            self._by_rating = fresh._by_rating
+            self._set_sort_orders(fresh._sort_orders)
+            self._property_stats = fresh._property_stats
+            self._trends = fresh._trends
+            self._search = fresh._search
+            self._drop_slot_views()
+            self._invalidate_views()
+            self._generation = generation or secrets.token_hex(4)
+            self._changes = 0
+            self._log = ChangeLog(self._log.capacity)
+            self._loaded_at = fresh._loaded_at
+            self._stamps = {}
+            change = StoreChange("reload", self.version)
+        self._notify(change)
+
+    # -------------------------
+    # Writes
+    # -------------------------
+
+    def upsert(self, items: Iterable[dict]) -> list[str]:
+        """Insert new reviews or replace existing ones; returns affected ids"""
+        # Large batches append to the sort orders and re-sort once rather
+        # than paying an insort per review. Sort orders are read without the
+        # lock, so that happens on copies, swapped in whole once sorted; a
+        # reader keeps the sorted list it picked up. Small batches insort in
+        # place, each step leaving the live order sorted. Duplicates within
+        # the batch are dropped (last one wins) and replaced reviews are
+        # unindexed before anything is appended, so bisecting only ever sees
+        # sorted orders.
+        batch = {str(item.get("id", "")): item for item in items}
+        bulk = len(batch) > BULK_UPSERT_THRESHOLD
+        touched: list[tuple[str, str]] = []      # (property_id, source) before and after
+        with self._lock:
+            self._thaw()
+            orders = self._copy_sort_orders() if bulk else self._sort_orders
+            added = {review_id for review_id in batch if review_id not in self._table.slots}
+            if bulk:
+                for review_id in batch:
+                    if review_id in self._table.slots:
+                        touched.append(_change_key(self._unindex(review_id, orders)))
+            for review_id, item in batch.items():
+                if not bulk and review_id in self._table.slots:
+                    touched.append(_change_key(self._unindex(review_id, orders)))
+                touched.append(_change_key(self._insert(item, keep_sorted=not bulk, orders=orders)))
+            if bulk:
+                for order in orders.values():
+                    order.sort()
+                self._trends = self._table.trends()
+                self._set_sort_orders(orders)
+            self._invalidate_views()
+            self._log_write(list(batch), added)
+            change = self._change("upsert", batch, touched)
+        self._notify(change)
+        return list(batch)
+
+    def remove(self, review_id: str) -> bool:
+        with self._lock:
+            if review_id not in self._table.slots:
+                return False
+            self._thaw()
+            touched = [_change_key(self._unindex(review_id, self._sort_orders))]
+            if self._categories is not None:
+                self._categories.clear_row(self._table.slots[review_id])
+            self._table.delete(review_id)
+            self._invalidate_views()
+            self._log.record(self._changes, [review_id], deleted=True)
+            self._stamps.pop(review_id, None)
+            change = self._change("remove", [review_id], touched)
+        self._notify(change)
+        return True
+
+    def set_status(self, review_id: str, status: str) -> Optional[dict]:
+        """Change a review's approval status, keeping the status index in sync"""
+        with self._lock:
+            if review_id not in self._table.slots:
+                return None
+            self._thaw()
+            record = self.get_record(review_id)
+            self._by_status[record["status"]].pop(review_id, None)
+            self._property_stats[record["property_id"]].change_status(record["status"], status)
+            self._table.set_value(self._table.slots[review_id], "status", status)
+            self._by_status[status][review_id] = None
+            self._changes += 1
+            self._log_write([review_id])
+            change = self._change("status", [review_id], [_change_key(record)])
+        self._notify(change)
+        return record
+
+    def moderate(
+        self, review_ids: Iterable[str], status: str, response: Optional[str] = None
+    ) -> dict[str, str]:
+        """
+        Set the status (and optionally the host response) of many reviews in one write
+
+        The whole batch is applied under one lock hold: per-property status
+        counts are shifted once per (property, old status) pair, and the
+        version bump and change notification (hence cache invalidation)
+        happen once, so the cost per review stays constant as batches grow.
+        Returns each id's outcome: "updated", "unchanged" or "not_found".
+        """
+        outcomes: dict[str, str] = {}
+        shifts: Counter = Counter()              # (property_id, old status) -> reviews moved
+        touched: list[tuple[str, str]] = []
+        change = None
+        with self._lock:
+            ids = list(dict.fromkeys(str(review_id) for review_id in review_ids))
+            if any(review_id in self._table.slots for review_id in ids):
+                self._thaw()
+            table = self._table
+            for review_id in ids:
+                slot = table.slots.get(review_id)
+                if slot is None:
+                    outcomes[review_id] = "not_found"
+                    continue
+                old = normalize_status(table.value(slot, "status"))
+                respond = response is not None and response != table.value(slot, "response")
+                if old == status and not respond:
+                    outcomes[review_id] = "unchanged"
+                    continue
+                property_id = table.property_id(slot)
+                if old != status:
+                    self._by_status[old].pop(review_id, None)
+                    self._by_status[status][review_id] = None
+                    table.set_value(slot, "status", status)
+                    shifts[property_id, old] += 1
+                if respond:
+                    table.set_value(slot, "response", response)
+                touched.append((property_id, table.value(slot, "source")))
+                outcomes[review_id] = "updated"
+            for (property_id, old), count in shifts.items():
+                self._property_stats[property_id].change_status(old, status, count)
+            if touched:
+                self._changes += 1
+                updated = [review_id for review_id, outcome in outcomes.items() if outcome == "updated"]
+                self._log_write(updated)
+                change = self._change("moderate", updated, touched)
+        if change is not None:
+            self._notify(change)
+        return outcomes
+
+    def _log_write(self, ids: list[str], added: Iterable[str] = ()) -> None:
+        """Log a write of `ids` (after `_changes` was bumped for it) and restamp them"""
+        self._log.record(self._changes, ids)
+        now = datetime.now(timezone.utc)
+        added = set(added)
+        for review_id in ids:
+            if review_id in added:
+                created = now
+            else:
+                created = self._stamps.get(review_id, (self._loaded_at,))[0]
+            self._stamps[review_id] = (created, now)
+
+    def changes_since(self, version: str) -> Optional[tuple[list[ReviewRecord], list[str]]]:
+        """
+        Reviews written and ids deleted after `version`
+
+        Returns None when `version` belongs to another load or the change log
+        no longer reaches back to it; the caller then has to resync in full.
+        """
+        generation, _, change = version.rpartition(".")
+        with self._lock:
+            if generation != self._generation or not change.isdigit() or int(change) > self._changes:
+                return None
+            latest = self._log.since(int(change))
+            if latest is None:
+                return None
+            table = self._table
+            written = [ReviewRecord(table, table.slots[i]) for i, deleted in latest.items() if not deleted]
+            return written, [i for i, deleted in latest.items() if deleted]
+
+    def review_stamps(self, review_id: str) -> tuple[datetime, datetime]:
+        """(created_at, updated_at) of a review; reviews untouched since the load date from it"""
+        return self._stamps.get(review_id) or (self._loaded_at, self._loaded_at)
+
+    # -------------------------
+    # Change notification
+    # -------------------------
+
+    def subscribe(self, listener: Callable[[StoreChange], None]) -> Callable[[], None]:
+        """Call `listener` after every write (outside the lock); returns an unsubscribe function"""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _change(self, kind: str, ids: Iterable[str], touched: Iterable[tuple[str, str]]) -> StoreChange:
+        touched = set(touched)
+        return StoreChange(
+            kind,
+            self.version,
+            tuple(ids),
+            frozenset(property_id for property_id, _ in touched),
+            frozenset(source for _, source in touched),
+        )
+
+    def _notify(self, change: StoreChange) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"Review store listener failed on {change.kind}: {e}")
+
+    def _thaw(self) -> None:
+        """Switch a read-only (snapshot) table to a private writable copy"""
+        table = self._table.thawed()
+        if table is not self._table:
+            self._table = table
+            self._drop_slot_views()
+
+    def _invalidate_views(self) -> None:
+        self._changes += 1
+        self._columns = None
+        if self._table.needs_compaction():
+            self._table = self._table.compacted()
+            self._drop_slot_views()
+
+    def _drop_slot_views(self) -> None:
+        """Forget the per-slot arrays once slots are renumbered (rebuilt on next use)"""
+        self._categories = None
+        self._sentiment = None
+        self._sentiment_scored = None
+
+    def _copy_sort_orders(self) -> dict[str, list[tuple[Any, str]]]:
+        """Private copies of the sort orders, to edit and then publish with `_set_sort_orders`"""
+        return {field: list(order) for field, order in self._sort_orders.items()}
+
+    def _set_sort_orders(self, orders: dict[str, list[tuple[Any, str]]]) -> None:
+        self._sort_orders = orders
+        self._by_date = orders["date"]
+
+    def _insert(self, item: dict, keep_sorted: bool = False, orders: Optional[dict] = None) -> dict:
+        row = dict(item)
+        record = to_review_record(row)
+        row["source"] = record["source"]
+        slot = self._table.put(row, record["property_id"], record["date"])
+        if self._categories is not None:
+            self._categories.set_row(slot, row.get("reviewCategory"))
+        if self._sentiment_scored is not None and slot < len(self._sentiment_scored):
+            self._sentiment_scored[slot] = False
+        self._index(record["id"], record, keep_sorted, orders)
+        return record
+
+    def _index(
+        self,
+        review_id: str,
+        record: Mapping[str, Any],
+        keep_sorted: bool = False,
+        orders: Optional[dict] = None,
+    ) -> None:
+        orders = self._sort_orders if orders is None else orders
+        self._by_property[record["property_id"]][review_id] = None
+        self._by_source[record["source"]][review_id] = None
+        self._by_status[record["status"]][review_id] = None
+        self._by_rating[rating_bucket(record["rating"])][review_id] = None
+        self._property_stats[record["property_id"]].add(record)
+        if self._search is not None:
+            self._search.add(review_id, record["guest_name"], record["comment"])
+        for field, key_of in SORT_KEYS.items():
+            entry = (key_of(record), review_id)
+            if keep_sorted:
+                insort(orders[field], entry)
+            else:
+                orders[field].append(entry)
+        # Bulk loads rebuild the rollups from the table once, like the sort orders
+        if keep_sorted:
+            self._trends.add(record)
+
+    def _unindex(self, review_id: str, orders: dict) -> ReviewRecord:
+        record = self.get_record(review_id)
+        self._by_property[record["property_id"]].pop(review_id, None)
+        self._by_source[record["source"]].pop(review_id, None)
+        self._by_status[record["status"]].pop(review_id, None)
+        self._by_rating[rating_bucket(record["rating"])].pop(review_id, None)
+        self._property_stats[record["property_id"]].remove(record)
+        self._trends.remove(record)
+        if self._search is not None:
+            self._search.remove(review_id)
+        for field, key_of in SORT_KEYS.items():
+            order = orders[field]
+            entry = (key_of(record), review_id)
+            pos = bisect_left(order, entry)
+            if pos < len(order) and order[pos] == entry:
+                del order[pos]
+        return record
+
+    # -------------------------
+    # Reads
+    # -------------------------
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    @property
+    def generation(self) -> str:
+        """Identifies the current full load; unchanged by incremental writes"""
+        return self._generation
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the data does; equal versions mean identical data"""
+        return f"{self._generation}.{self._changes}"
+
+    def table(self) -> ReviewTable:
+        """The current backing table (treat as read-only)"""
+        with self._lock:
+            return self._table
+
+    def rows(self) -> list[dict]:
+        """Raw rows in ingestion order"""
+        table = self._table
+        return [table.row(slot) for slot in table.live_slots()]
+
+    def columns(self) -> ReviewColumns:
+        """Columnar copy of the records for vectorized aggregation"""
+        columns = self._columns
+        if columns is None:
+            with self._lock:
+                columns = self._columns = self._table.columns()
+        return columns
+
+    def analytics_columns(self) -> tuple[ReviewColumns, np.ndarray]:
+        """`columns()` plus each review's text sentiment (NaN where it has no text), in the same order"""
+        # Unscored texts are scored outside the lock, so writers never wait
+        # on a cold scoring run; the scores are only swapped in if no write
+        # landed meanwhile. Anything left is then scored under the lock,
+        # almost entirely from the scorer's cache.
+        with self._lock:
+            table, changes = self._table, self._changes
+            _, pending = self._sentiment_slots()
+            texts = self._texts(pending)
+        if texts:
+            scores = get_sentiment_scorer().score(texts)
+        with self._lock:
+            if texts and self._table is table and self._changes == changes:
+                self._sentiment[pending] = scores
+                self._sentiment_scored[pending] = True
+            return self.columns(), self._sentiment_scores()
+
+    def _sentiment_slots(self) -> tuple[np.ndarray, np.ndarray]:
+        """Live slots, and those among them whose text has not been scored yet"""
+        table = self._table
+        rows = len(table.keys)
+        if self._sentiment is None or len(self._sentiment) < rows:
+            sentiment = np.full(rows, np.nan)
+            scored = np.zeros(rows, dtype=bool)
+            if self._sentiment is not None:
+                sentiment[:len(self._sentiment)] = self._sentiment
+                scored[:len(self._sentiment_scored)] = self._sentiment_scored
+            self._sentiment, self._sentiment_scored = sentiment, scored
+        live = np.flatnonzero(np.frombuffer(table.alive, dtype=np.uint8))
+        return live, live[~self._sentiment_scored[live]]
+
+    def _texts(self, slots: np.ndarray) -> list[str]:
+        table = self._table
+        return [table.value(slot, "publicReview") or "" for slot in slots.tolist()]
+
+    def _sentiment_scores(self) -> np.ndarray:
+        live, pending = self._sentiment_slots()
+        if len(pending):
+            self._sentiment[pending] = get_sentiment_scorer().score(self._texts(pending))
+            self._sentiment_scored[pending] = True
+        return self._sentiment[live]
+
+    def records(self) -> list[ReviewRecord]:
+        table = self._table
+        return [ReviewRecord(table, slot) for slot in table.live_slots()]
+
+    def get_row(self, review_id: str) -> Optional[dict]:
+        table = self._table
+        slot = table.slots.get(review_id)
+        return table.row(slot) if slot is not None else None
+
+    def get_record(self, review_id: str) -> Optional[ReviewRecord]:
+        table = self._table
+        slot = table.slots.get(review_id)
+        return ReviewRecord(table, slot) if slot is not None else None
+
+    def iter_rows(self, ids: Optional[Iterable[str]] = None) -> Iterator[dict]:
+        """Raw rows built one at a time (all of them, in order, without ids)"""
+        table = self._table
+        if ids is None:
+            for slot in list(table.live_slots()):
+                yield table.row(slot)
+            return
+        slots = table.slots
+        for review_id in ids:
+            slot = slots.get(review_id)
+            if slot is not None:
+                yield table.row(slot)
+
+    def rows_for(self, ids: Iterable[str]) -> list[dict]:
+        table = self._table
+        slots = table.slots
+        return [table.row(slots[i]) for i in ids if i in slots]
+
+    def records_for(self, ids: Iterable[str]) -> list[ReviewRecord]:
+        table = self._table
+        slots = table.slots
+        return [ReviewRecord(table, slots[i]) for i in ids if i in slots]
+
+    def property_ids(self) -> list[str]:
+        return [pid for pid, ids in self._by_property.items() if ids]
+
+    def ids_for_property(self, property_id: str) -> dict[str, None]:
+        return self._by_property.get(property_id, {})
+
+    def property_stats(self, property_id: str) -> PropertyAggregate:
+        """Running stats for a property (empty aggregate if it has no reviews)"""
+        return self._property_stats.get(property_id) or PropertyAggregate()
+
+    def latest_review_date(self, property_id: str) -> Optional[datetime]:
+        stats = self._property_stats.get(property_id)
+        if stats is None:
+            return None
+        ids = self.ids_for_property(property_id)
+        table = self._table
+        return stats.latest_date(lambda: (table.date(table.slots[i]) for i in ids))
+
+    def trends(
+        self,
+        property_id: Optional[str] = None,
+        source: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = "month",
+        max_buckets: Optional[int] = None,
+    ) -> list[TrendBucket]:
+        """Review volume and ratings per day, week or month, from the daily rollups"""
+        with self._lock:
+            return self._trends.query(property_id, source, start, end, granularity, max_buckets)
+
+    def category_breakdowns(self) -> tuple[dict[str, CategoryBreakdown], CategoryBreakdown]:
+        """Category score statistics per property (those with scores) and overall"""
+        with self._lock:
+            if self._categories is None:
+                self._categories = self._table.category_matrix()
+            table = self._table
+            live = np.flatnonzero(np.frombuffer(table.alive, dtype=np.uint8))
+            properties = np.frombuffer(table.properties, dtype=np.uint32)[live]
+            labels = list(table.property_labels.values)
+            per_property, overall = category_breakdowns(self._categories, live, properties, len(labels))
+        return {labels[i]: b for i, b in enumerate(per_property) if b.counts.any()}, overall
+
+    def ids_for_source(self, source: str) -> dict[str, None]:
+        return self._by_source.get(source, {})
+
+    def ids_for_status(self, status: str) -> dict[str, None]:
+        return self._by_status.get(status, {})
+
+    def ids_for_rating(self, bucket: int) -> dict[str, None]:
+        return self._by_rating.get(bucket, {})
+
+    def _search_index(self) -> SearchIndex:
+        search = self._search
+        if search is None:
+            with self._lock:
+                if self._search is None:
+                    search = SearchIndex()
+                    table = self._table
+                    for review_id, slot in table.slots.items():
+                        search.add(review_id, table.value(slot, "guestName"), table.value(slot, "publicReview"))
+                    self._search = search
+                search = self._search
+        return search
+
+    def search_ids(self, query: str) -> set[str]:
+        """Ids matching a full-text query (prefix words, quoted phrases)"""
+        return self._search_index().match_ids(query)
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[tuple[str, float]]:
+        """Ranked (id, score) full-text matches"""
+        return self._search_index().search(query, limit)
+
+    def search_scores(self, query: str, ids: Iterable[str]) -> dict[str, float]:
+        return self._search_index().scores(query, ids)
+
+    def sort_order(self, field: str) -> list[tuple[Any, str]]:
+        """
+        Precomputed ascending (key, id) order for a sortable field
+
+        Read without the lock: bulk writes publish a new list rather than
+        re-sorting this one, and single-review writes insert or delete one
+        entry at a time, so the list is sorted whenever it is read.
+        """
+        return self._sort_orders[field]
+
+    def _date_bounds(
+        self, index: list[tuple[Any, str]], start: Optional[datetime], end: Optional[datetime]
+    ) -> tuple[int, int]:
+        lo = bisect_left(index, (start,)) if start is not None else 0
+        hi = bisect_right(index, (end, "\uffff")) if end is not None else len(index)
+        return lo, max(lo, hi)
+
+    def count_by_date(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+        """Number of reviews dated within [start, end], via two bisections"""
+        lo, hi = self._date_bounds(self._by_date, start, end)
+        return hi - lo
+
+    def ids_by_date(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        descending: bool = False,
+    ) -> list[str]:
+        """Review ids ordered by date, optionally limited to [start, end]"""
+        index = self._by_date
+        lo, hi = self._date_bounds(index, start, end)
+        ids = [review_id for _, review_id in index[lo:hi]]
+        if descending:
+            ids.reverse()
+        return ids
+
+
+def _change_key(record: Mapping[str, Any]) -> tuple[str, str]:
+    return record["property_id"], record["source"]
+
+
+def _file_stamp(path: Path) -> tuple[int, int]:
+    """Identity of a file's current contents; changes when it is replaced"""
+    st = os.stat(path)
+    return st.st_ino, st.st_mtime_ns
+
+
+_store: Optional[ReviewStore] = None
+_store_lock = threading.Lock()
+
+
+def get_review_store() -> ReviewStore:
+    """Dependency for the process-wide review store (loaded on first use)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = ReviewStore()
+                data_path = Path(settings.REVIEWS_DATA_PATH or DEFAULT_DATA_PATH)
+                snapshot = Path(settings.REVIEW_SNAPSHOT_PATH) if settings.REVIEW_SNAPSHOT_PATH else None
+                if snapshot is not None and not snapshot.exists():
+                    # The first worker up publishes the snapshot every worker maps
+                    store.load_file(data_path)
+                    store.publish_snapshot(snapshot)
+                store.load_file(snapshot or data_path)
+                _store = store
+                return store
+    _store.maybe_refresh(settings.REVIEW_STORE_REFRESH_SECONDS)
+    return _store
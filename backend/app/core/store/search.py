@@ -0,0 +1,189 @@
+"""Inverted full-text index over review comments and guest names"""
+import math
+import re
+import threading
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+TOKEN_RE = re.compile(r"\w+")
+PHRASE_RE = re.compile(r'"([^"]*)"')
+
+# BM25 parameters; guest-name hits count double
+K1 = 1.2
+B = 0.75
+NAME_BOOST = 2.0
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class SearchQuery:
+    """Parsed query: bare words match as prefixes, quoted text as a phrase"""
+    __slots__ = ("terms", "phrases")
+
+    def __init__(self, raw: str):
+        self.phrases = [tokens for tokens in map(tokenize, PHRASE_RE.findall(raw)) if tokens]
+        self.terms = tokenize(PHRASE_RE.sub(" ", raw))
+
+    def __bool__(self) -> bool:
+        return bool(self.terms or self.phrases)
+
+
+class SearchIndex:
+    """
+    Token -> document postings for guest names and comments
+
+    Documents are numbered internally so postings are compact int sets.
+    Each document keeps its fields as space-padded token strings, so phrase
+    checks and prefix term frequencies on the (already narrowed) candidates
+    are plain substring operations.
+    Adds and removals are incremental; the sorted vocabulary used for prefix
+    lookups is merged lazily on the next query.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: dict[str, set[int]] = {}
+        self._doc_numbers: dict[str, int] = {}
+        self._doc_keys: list[Optional[str]] = []
+        self._doc_text: list[Optional[tuple[str, str]]] = []
+        self._doc_lengths: list[int] = []
+        self._total_length = 0
+        self._vocab: list[str] = []
+        self._new_terms: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+
+    def add(self, review_id: str, guest_name: Optional[str], comment: Optional[str]) -> None:
+        with self._lock:
+            if review_id in self._doc_numbers:
+                self.remove(review_id)
+            name_tokens, comment_tokens = tokenize(guest_name), tokenize(comment)
+            doc = len(self._doc_keys)
+            self._doc_numbers[review_id] = doc
+            self._doc_keys.append(review_id)
+            self._doc_text.append((_padded(name_tokens), _padded(comment_tokens)))
+            self._doc_lengths.append(len(name_tokens) + len(comment_tokens))
+            self._total_length += self._doc_lengths[doc]
+            for token in set(name_tokens).union(comment_tokens):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    self._new_terms.add(token)
+                postings.add(doc)
+
+    def remove(self, review_id: str) -> None:
+        with self._lock:
+            doc = self._doc_numbers.pop(review_id, None)
+            if doc is None:
+                return
+            name_text, comment_text = self._doc_text[doc]
+            self._total_length -= self._doc_lengths[doc]
+            for token in set(name_text.split()).union(comment_text.split()):
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.discard(doc)
+                    # Emptied terms stay in the vocabulary and match nothing
+            self._doc_keys[doc] = None
+            self._doc_text[doc] = None
+
+    def _vocabulary(self) -> list[str]:
+        if self._new_terms:
+            with self._lock:
+                if self._new_terms:
+                    self._vocab = sorted(set(self._vocab).union(self._new_terms))
+                    self._new_terms = set()
+        return self._vocab
+
+    # -------------------------
+    # Querying
+    # -------------------------
+
+    def _prefix_docs(self, prefix: str) -> set[int]:
+        vocab = self._vocabulary()
+        matches = []
+        i = bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            postings = self._postings.get(vocab[i])
+            if postings:
+                matches.append(postings)
+            i += 1
+        if len(matches) == 1:
+            return matches[0]   # callers never mutate the result
+        return set().union(*matches)
+
+    def _phrase_docs(self, phrase: list[str]) -> set[int]:
+        postings = sorted((self._postings.get(t, set()) for t in phrase), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        needle = _padded(phrase)
+        texts = self._doc_text
+        return {
+            doc for doc in candidates
+            if texts[doc] is not None and (needle in texts[doc][0] or needle in texts[doc][1])
+        }
+
+    def _match(self, query: SearchQuery) -> set[int]:
+        sets = [self._prefix_docs(term) for term in query.terms]
+        sets.extend(self._phrase_docs(phrase) for phrase in query.phrases)
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:]) if sets else set()
+
+    def match_ids(self, raw_query: str) -> set[str]:
+        """Ids of reviews matching every term and phrase of the query"""
+        query = SearchQuery(raw_query)
+        if not query:
+            return set()
+        keys = self._doc_keys
+        return {keys[doc] for doc in self._match(query) if keys[doc] is not None}
+
+    def search(self, raw_query: str, limit: Optional[int] = None) -> list[tuple[str, float]]:
+        """Matching review ids with BM25 relevance scores, best first"""
+        query = SearchQuery(raw_query)
+        if not query:
+            return []
+        docs = self._match(query)
+        ranked = sorted(self._score(docs, query).items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit is not None else ranked
+
+    def scores(self, raw_query: str, review_ids: Iterable[str]) -> dict[str, float]:
+        """Relevance scores for an already-filtered set of reviews"""
+        query = SearchQuery(raw_query)
+        numbers = self._doc_numbers
+        docs = {numbers[i] for i in review_ids if i in numbers}
+        return self._score(docs, query) if query else {}
+
+    def _score(self, docs: set[int], query: SearchQuery) -> dict[str, float]:
+        n_docs = max(len(self._doc_numbers), 1)
+        avg_length = (self._total_length / n_docs) or 1.0
+        words = query.terms + [t for phrase in query.phrases for t in phrase]
+        idf = {}
+        for word in words:
+            df = len(self._postings.get(word, ())) or 1
+            idf[word] = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+        scores: dict[str, float] = {}
+        prefixes = [(word, " " + word) for word in words]
+        for doc in docs:
+            text = self._doc_text[doc]
+            if text is None:
+                continue
+            name_text, comment_text = text
+            norm = K1 * (1 - B + B * self._doc_lengths[doc] / avg_length)
+            score = 0.0
+            for word, prefix in prefixes:
+                # Counting " word" in a space-padded field counts tokens starting with it
+                tf = NAME_BOOST * name_text.count(prefix) + comment_text.count(prefix)
+                if tf:
+                    score += idf[word] * tf * (K1 + 1) / (tf + norm)
+            scores[self._doc_keys[doc]] = score
+        return scores
+
+
+def _padded(tokens: list[str]) -> str:
+    return " " + " ".join(tokens) + " "
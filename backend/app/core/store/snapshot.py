@@ -0,0 +1,203 @@
+"""
+Memory-mapped review snapshots shared between worker processes
+
+A snapshot is one file holding a `ReviewTable`: an 8-byte magic, a JSON
+header (section directory plus the small lookup tables), then every column
+as a fixed-width section and the string data as offset-indexed blobs, each
+section 8-byte aligned. Workers `mmap` the file read-only and index the
+sections through `memoryview` casts, so the kernel keeps a single physical
+copy for all of them. Publishing writes a temporary file and renames it
+over the old one, so readers always see a complete snapshot.
+
+Build one from an export with:
+    python -m app.core.store.snapshot <export.json|.ndjson> <snapshot.bin>
+"""
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Union
+
+from app.core.store.table import INTERNED_FIELDS, TEXT_FIELDS, Interner, ReviewTable, StringArena
+
+MAGIC = b"RVWSNAP1"
+VERSION = 1
+ALIGNMENT = 8
+
+PathLike = Union[str, Path]
+
+
+def is_snapshot(path: PathLike) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _columns(table: ReviewTable) -> dict[str, Any]:
+    """Every fixed-width section of a table, by name"""
+    keys = [key.encode("utf-8") for key in table.keys]
+    key_offsets = array("Q", [0])
+    for key in keys:
+        key_offsets.append(key_offsets[-1] + len(key))
+    sections = {
+        "alive": table.alive,
+        "layout": table.layout,
+        "ids": table.ids,
+        "ratings": table.ratings,
+        "dates": table.dates,
+        "properties": table.properties,
+        "category_start": table.category_start,
+        "category_count": table.category_count,
+        "category_names": table.category_names,
+        "category_scores": table.category_scores,
+        "arena": table.arena.buffer,
+        "key_offsets": key_offsets,
+        "keys": b"".join(keys),
+    }
+    for name in INTERNED_FIELDS:
+        sections[f"code:{name}"] = table.codes[name]
+    for name in TEXT_FIELDS:
+        sections[f"text_offset:{name}"] = table.text_offsets[name]
+        sections[f"text_length:{name}"] = table.text_lengths[name]
+    return sections
+
+
+def write_snapshot(table: ReviewTable, path: PathLike) -> Path:
+    """Write `table` (live rows only) to `path`, replacing any previous snapshot atomically"""
+    if table.dead:
+        table = table.compacted()
+    path = Path(path)
+    sections = _columns(table)
+
+    directory = {}
+    offset = 0
+    for name, data in sections.items():
+        view = memoryview(data)
+        directory[name] = [offset, view.nbytes, getattr(data, "typecode", "B")]
+        offset += -(-view.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({
+        "version": VERSION,
+        "rows": len(table),
+        "built_at": time.time(),
+        "sections": directory,
+        "interners": {name: table.interners[name].values for name in INTERNED_FIELDS},
+        "property_labels": table.property_labels.values,
+        "category_labels": table.category_labels.values,
+        "layouts": [list(layout) for layout in table.layouts.values],
+        "extras": {str(slot): values for slot, values in table.extras.items()},
+    }).encode("utf-8")
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        f.write(b"\0" * (data_start - f.tell()))
+        for name, data in sections.items():
+            start = data_start + directory[name][0]
+            f.write(b"\0" * (start - f.tell()))
+            f.write(memoryview(data).cast("B"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+class SnapshotTable(ReviewTable):
+    """
+    Read-only `ReviewTable` over a memory-mapped snapshot
+
+    Column reads go straight to the shared mapping; only the id -> slot
+    lookup and the small lookup tables are built per process. Writes raise;
+    the store switches to a private copy (`thawed()`) before its first write.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mapped = memoryview(self._mmap)
+        if mapped[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a review snapshot")
+        header_length = int.from_bytes(mapped[len(MAGIC):len(MAGIC) + 8], "little")
+        header_end = len(MAGIC) + 8 + header_length
+        header = json.loads(bytes(mapped[len(MAGIC) + 8:header_end]))
+        if header["version"] != VERSION:
+            raise ValueError(f"Unsupported snapshot version {header['version']}")
+        data_start = -(-header_end // ALIGNMENT) * ALIGNMENT
+
+        def section(name: str) -> memoryview:
+            offset, length, typecode = header["sections"][name]
+            start = data_start + offset
+            return mapped[start:start + length].cast(typecode)
+
+        self.header = header
+        self.alive = section("alive")
+        self.layout = section("layout")
+        self.ids = section("ids")
+        self.ratings = section("ratings")
+        self.dates = section("dates")
+        self.properties = section("properties")
+        self.category_start = section("category_start")
+        self.category_count = section("category_count")
+        self.category_names = section("category_names")
+        self.category_scores = section("category_scores")
+        self.codes = {name: section(f"code:{name}") for name in INTERNED_FIELDS}
+        self.text_offsets = {name: section(f"text_offset:{name}") for name in TEXT_FIELDS}
+        self.text_lengths = {name: section(f"text_length:{name}") for name in TEXT_FIELDS}
+        self.arena = StringArena()
+        self.arena.buffer = section("arena")
+
+        key_offsets, key_blob = section("key_offsets"), section("keys")
+        self.keys = [str(key_blob[key_offsets[i]:key_offsets[i + 1]], "utf-8") for i in range(header["rows"])]
+        self.slots = {key: slot for slot, key in enumerate(self.keys)}
+
+        self.interners = {name: _interner(header["interners"][name]) for name in INTERNED_FIELDS}
+        self.property_labels = _interner(header["property_labels"])
+        self.category_labels = _interner(header["category_labels"])
+        self.layouts = _interner([tuple(map(tuple, layout)) for layout in header["layouts"]])
+        self.layout_maps = [dict(layout) for layout in self.layouts.values]
+        self.extras = {int(slot): values for slot, values in header["extras"].items()}
+        self.category_garbage = 0
+        self.dead = 0
+
+    def thawed(self) -> ReviewTable:
+        return self.compacted()
+
+    def put(self, row: dict, property_id: str, date: Any) -> int:
+        raise TypeError("Snapshot tables are read-only")
+
+    def delete(self, review_id: str) -> bool:
+        raise TypeError("Snapshot tables are read-only")
+
+    def set_value(self, slot: int, key: str, value: Any) -> None:
+        raise TypeError("Snapshot tables are read-only")
+
+
+def _interner(values: list) -> Interner:
+    interner = Interner()
+    for value in values:
+        interner.code(value)
+    return interner
+
+
+def main(argv: list[str]) -> None:
+    from app.core.store.reviews import ReviewStore
+
+    if len(argv) != 2:
+        raise SystemExit("usage: python -m app.core.store.snapshot <export> <snapshot>")
+    source, target = argv
+    store = ReviewStore()
+    store.load_file(Path(source))
+    path = store.publish_snapshot(target)
+    print(f"Wrote {len(store)} reviews to {path} ({path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
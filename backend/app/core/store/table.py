@@ -0,0 +1,425 @@
+"""Compact columnar storage for reviews"""
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from app.core.aggregators.analytics import ReviewColumns
+from app.core.aggregators.categories import CategoryMatrix
+from app.core.aggregators.trends import TrendRollup
+from app.core.normalizers.hostaway import normalize_status
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+# Raw fields stored as interned codes (few distinct values) and as UTF-8 in
+# the string arena (mostly unique values); anything else is kept as-is.
+INTERNED_FIELDS = ("type", "status", "listingId", "listingName", "channel", "source")
+TEXT_FIELDS = ("publicReview", "guestName", "submittedAt")
+NO_SCORE = -32768
+
+
+class Interner:
+    """Maps repeated values to small integer codes"""
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: list[Any] = []
+        self.codes: dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class StringArena:
+    """Many strings stored back to back as UTF-8 in one buffer"""
+    __slots__ = ("buffer", "garbage")
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.garbage = 0
+
+    def add(self, text: str) -> tuple[int, int]:
+        data = text.encode("utf-8")
+        offset = len(self.buffer)
+        self.buffer += data
+        return offset, len(data)
+
+    def get(self, offset: int, length: int) -> str:
+        return str(self.buffer[offset:offset + length], "utf-8")
+
+
+class ReviewTable:
+    """
+    Reviews held column-wise in typed arrays
+
+    Each raw Hostaway row is split over parallel columns: numeric ids,
+    ratings and dates in `array`s, repeated strings (status, channel,
+    listing, source, ...) as interned codes, free text (comments, guest
+    names, timestamps) in a shared `StringArena`, and review categories in
+    their own flat arrays. A per-row layout code records the row's key
+    order and how each value was encoded, so `row()` rebuilds the original
+    dict exactly; values that fit no column are kept in a small side dict.
+
+    Rows are addressed by slot. Replacing a row rewrites its slot in place;
+    deleting leaves a dead slot, reclaimed by `compacted()`.
+    """
+
+    def __init__(self):
+        self.slots: dict[str, int] = {}
+        self.keys: list[Optional[str]] = []
+        self.alive = bytearray()
+        self.layouts = Interner()
+        self.layout_maps: list[dict[str, str]] = []
+        self.layout = array("H")
+        self.ids = array("q")
+        self.ratings = array("d")
+        self.dates = array("q")                 # epoch microseconds (UTC)
+        self.properties = array("I")
+        self.property_labels = Interner()
+        self.interners = {name: Interner() for name in INTERNED_FIELDS}
+        self.codes = {name: array("I") for name in INTERNED_FIELDS}
+        self.arena = StringArena()
+        self.text_offsets = {name: array("Q") for name in TEXT_FIELDS}
+        self.text_lengths = {name: array("I") for name in TEXT_FIELDS}
+        self.category_start = array("Q")
+        self.category_count = array("H")
+        self.category_names = array("H")
+        self.category_scores = array("h")
+        self.category_labels = Interner()
+        self.category_garbage = 0
+        self.extras: dict[int, dict[str, Any]] = {}
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    # -------------------------
+    # Writes
+    # -------------------------
+
+    def put(self, row: dict, property_id: str, date: datetime) -> int:
+        """Store a raw row (with its derived property id and date); returns its slot"""
+        review_id = str(row.get("id", ""))
+        slot = self.slots.get(review_id)
+        if slot is None:
+            slot = self._append_slot(review_id)
+        else:
+            self._release(slot)
+        self._write(slot, row)
+        self.properties[slot] = self.property_labels.code(property_id)
+        self.dates[slot] = (date - EPOCH) // MICROSECOND
+        return slot
+
+    def delete(self, review_id: str) -> bool:
+        slot = self.slots.pop(review_id, None)
+        if slot is None:
+            return False
+        self._release(slot)
+        self.keys[slot] = None
+        self.alive[slot] = 0
+        self.dead += 1
+        return True
+
+    def set_value(self, slot: int, key: str, value: Any) -> None:
+        """Change one raw field; interned fields are updated in place"""
+        if self.layout_maps[self.layout[slot]].get(key) == "code" and (value is None or isinstance(value, str)):
+            self.codes[key][slot] = self.interners[key].code(value)
+            return
+        row = self.row(slot)
+        row[key] = value
+        self._release(slot)
+        self._write(slot, row)
+
+    def _append_slot(self, review_id: str) -> int:
+        slot = len(self.keys)
+        self.slots[review_id] = slot
+        self.keys.append(review_id)
+        self.alive.append(1)
+        for column in (self.layout, self.ids, self.ratings, self.dates, self.properties,
+                       self.category_start, self.category_count,
+                       *self.codes.values(), *self.text_offsets.values(), *self.text_lengths.values()):
+            column.append(0)
+        return slot
+
+    def _write(self, slot: int, row: dict) -> None:
+        layout = []
+        extras = None
+        for key, value in row.items():
+            codec = self._encode(slot, key, value)
+            if codec == "obj":
+                if extras is None:
+                    extras = self.extras[slot] = {}
+                extras[key] = value
+            layout.append((key, codec))
+        layout_key = tuple(layout)
+        code = self.layouts.code(layout_key)
+        if code == len(self.layout_maps):
+            self.layout_maps.append(dict(layout_key))
+        self.layout[slot] = code
+
+    def _encode(self, slot: int, key: str, value: Any) -> str:
+        """Store one raw value in its column and return how it was encoded"""
+        kind = type(value)
+        if key in self.codes:
+            if value is None or kind is str:
+                self.codes[key][slot] = self.interners[key].code(value)
+                return "code"
+        elif key in self.text_offsets:
+            if value is None:
+                return "none"
+            if kind is str:
+                self.text_offsets[key][slot], self.text_lengths[key][slot] = self.arena.add(value)
+                return "text"
+        elif key == "id":
+            if kind is int and -2**63 <= value < 2**63:
+                self.ids[slot] = value
+                return "int"
+        elif key == "rating":
+            if value is None:
+                self.ratings[slot] = float("nan")
+                return "none"
+            if kind is int or kind is float:
+                self.ratings[slot] = value
+                return "int" if kind is int else "float"
+        elif key == "reviewCategory":
+            if self._encode_categories(slot, value):
+                return "cats"
+        return "obj"
+
+    def _encode_categories(self, slot: int, categories: Any) -> bool:
+        if type(categories) is not list or len(categories) > 0xFFFF:
+            return False
+        for c in categories:
+            if type(c) is not dict or tuple(c) != ("category", "rating") or type(c["category"]) is not str:
+                return False
+            score = c["rating"]
+            if score is not None and (type(score) is not int or not NO_SCORE < score < 2**15):
+                return False
+        self.category_start[slot] = len(self.category_names)
+        self.category_count[slot] = len(categories)
+        for c in categories:
+            self.category_names.append(self.category_labels.code(c["category"]))
+            self.category_scores.append(NO_SCORE if c["rating"] is None else c["rating"])
+        return True
+
+    def _release(self, slot: int) -> None:
+        """Account for the arena space of a row about to be overwritten or dropped"""
+        codecs = self.layout_maps[self.layout[slot]] if self.layout_maps else {}
+        for key, codec in codecs.items():
+            if codec == "text":
+                self.arena.garbage += self.text_lengths[key][slot]
+            elif codec == "cats":
+                self.category_garbage += self.category_count[slot]
+        self.extras.pop(slot, None)
+
+    # -------------------------
+    # Reads
+    # -------------------------
+
+    def live_slots(self) -> Iterator[int]:
+        return iter(self.slots.values())
+
+    def value(self, slot: int, key: str, default: Any = None) -> Any:
+        codec = self.layout_maps[self.layout[slot]].get(key)
+        if codec is None:
+            return default
+        return self._decode(slot, key, codec)
+
+    def _decode(self, slot: int, key: str, codec: str) -> Any:
+        if codec == "code":
+            return self.interners[key].values[self.codes[key][slot]]
+        if codec == "text":
+            return self.arena.get(self.text_offsets[key][slot], self.text_lengths[key][slot])
+        if codec == "none":
+            return None
+        if codec == "int":
+            return self.ids[slot] if key == "id" else int(self.ratings[slot])
+        if codec == "float":
+            return self.ratings[slot]
+        if codec == "cats":
+            start = self.category_start[slot]
+            labels = self.category_labels.values
+            return [
+                {"category": labels[self.category_names[i]],
+                 "rating": None if self.category_scores[i] == NO_SCORE else self.category_scores[i]}
+                for i in range(start, start + self.category_count[slot])
+            ]
+        return self.extras[slot][key]
+
+    def row(self, slot: int) -> dict:
+        """The raw row as it was stored (a fresh dict)"""
+        return {key: self._decode(slot, key, codec) for key, codec in self.layout_maps[self.layout[slot]].items()}
+
+    def record_dict(self, slot: int) -> dict:
+        """All `Review`-shaped fields of a row at once, as a plain dict"""
+        codecs = self.layout_maps[self.layout[slot]]
+        decode = self._decode
+
+        def value(key: str, default: Any = None) -> Any:
+            codec = codecs.get(key)
+            return default if codec is None else decode(slot, key, codec)
+
+        return {
+            "id": self.keys[slot],
+            "property_id": self.property_labels.values[self.properties[slot]],
+            "property_name": value("listingName"),
+            "guest_name": value("guestName"),
+            "comment": value("publicReview") or "",
+            "rating": value("rating", 0),
+            "date": EPOCH + self.dates[slot] * MICROSECOND,
+            "status": normalize_status(value("status")),
+            "response": value("response"),
+            "source": value("source"),
+            "categories": value("reviewCategory") or [],
+        }
+
+    def record(self, slot: int) -> "ReviewRecord":
+        return ReviewRecord(self, slot)
+
+    def property_id(self, slot: int) -> str:
+        return self.property_labels.values[self.properties[slot]]
+
+    def date(self, slot: int) -> datetime:
+        return EPOCH + self.dates[slot] * MICROSECOND
+
+    def columns(self) -> ReviewColumns:
+        """Analytics columns straight from the typed arrays"""
+        live = np.flatnonzero(np.frombuffer(self.alive, dtype=np.uint8))
+        ratings = np.nan_to_num(np.frombuffer(self.ratings, dtype=np.float64)[live], nan=0.0)
+        sources, source_labels = _first_seen(np.frombuffer(self.codes["source"], dtype=np.uint32)[live],
+                                             self.interners["source"].values)
+        properties, property_labels = _first_seen(np.frombuffer(self.properties, dtype=np.uint32)[live],
+                                                  self.property_labels.values)
+        return ReviewColumns(
+            ratings=ratings,
+            sources=sources,
+            properties=properties,
+            dates=np.frombuffer(self.dates, dtype=np.int64)[live] // 1_000_000,
+            source_labels=source_labels,
+            property_labels=property_labels,
+        )
+
+    def trends(self) -> TrendRollup:
+        """Daily trend rollups for the live rows, built in one vectorized pass"""
+        live = np.flatnonzero(np.frombuffer(self.alive, dtype=np.uint8))
+        return TrendRollup.from_arrays(
+            properties=np.frombuffer(self.properties, dtype=np.uint32)[live],
+            property_labels=[label or "" for label in self.property_labels.values],
+            sources=np.frombuffer(self.codes["source"], dtype=np.uint32)[live],
+            source_labels=[label or "" for label in self.interners["source"].values],
+            dates=np.frombuffer(self.dates, dtype=np.int64)[live],
+            ratings=np.frombuffer(self.ratings, dtype=np.float64)[live],
+        )
+
+    def category_matrix(self) -> CategoryMatrix:
+        """Category scores of every slot as a dense matrix, built in one vectorized pass"""
+        cats_layouts = [code for code, codecs in enumerate(self.layout_maps) if codecs.get("reviewCategory") == "cats"]
+        alive = np.frombuffer(self.alive, dtype=np.uint8).astype(bool)
+        slots = np.flatnonzero(alive & np.isin(np.frombuffer(self.layout, dtype=np.uint16), cats_layouts))
+        counts = np.frombuffer(self.category_count, dtype=np.uint16)[slots].astype(np.int64)
+        starts = np.frombuffer(self.category_start, dtype=np.uint64)[slots].astype(np.int64)
+        # Position of every category entry in the flat arrays, slot by slot
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(starts, counts) + offsets
+        scores = np.frombuffer(self.category_scores, dtype=np.int16)[positions].astype(np.float32)
+        scores[scores == NO_SCORE] = np.nan
+        matrix = CategoryMatrix.from_arrays(
+            labels=self.category_labels.values,
+            rows=len(self.keys),
+            slots=np.repeat(slots, counts),
+            names=np.frombuffer(self.category_names, dtype=np.uint16)[positions],
+            scores=scores,
+        )
+        # Lists that did not fit the flat arrays were kept as-is
+        for slot, extras in self.extras.items():
+            if "reviewCategory" in extras and self.alive[slot]:
+                matrix.set_row(slot, extras["reviewCategory"])
+        return matrix
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+
+    def needs_compaction(self) -> bool:
+        """True once dead slots or stale arena bytes outweigh live data"""
+        return (
+            self.dead > max(len(self.slots), 1024)
+            or self.arena.garbage > max(len(self.arena.buffer) // 2, 1 << 20)
+            or self.category_garbage > max(len(self.category_names) // 2, 1 << 16)
+        )
+
+    def thawed(self) -> "ReviewTable":
+        """A writable table with this data (read-only subclasses copy)"""
+        return self
+
+    def compacted(self) -> "ReviewTable":
+        """A copy holding only live rows, in the same order"""
+        fresh = ReviewTable()
+        for slot in self.slots.values():
+            fresh.put(self.row(slot), self.property_id(slot), self.date(slot))
+        return fresh
+
+    def nbytes(self) -> int:
+        """Approximate size of the column buffers"""
+        arrays = [self.layout, self.ids, self.ratings, self.dates, self.properties,
+                  self.category_start, self.category_count, self.category_names, self.category_scores,
+                  *self.codes.values(), *self.text_offsets.values(), *self.text_lengths.values()]
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.arena.buffer) + len(self.alive)
+
+
+def _first_seen(codes: np.ndarray, labels: list) -> tuple[np.ndarray, list[str]]:
+    """Renumber codes in order of first appearance, dropping unused labels"""
+    if not len(codes):
+        return codes.astype(np.int32), []
+    present, first = np.unique(codes, return_index=True)
+    order = present[np.argsort(first)]
+    remap = np.zeros(int(present.max()) + 1, dtype=np.int32)
+    remap[order] = np.arange(len(order), dtype=np.int32)
+    return remap[codes], [labels[c] or "" for c in order]
+
+
+# `Review`-shaped fields, in the order `to_review_record` produces them
+RECORD_FIELDS = {
+    "id": lambda t, s: t.keys[s],
+    "property_id": lambda t, s: t.property_labels.values[t.properties[s]],
+    "property_name": lambda t, s: t.value(s, "listingName"),
+    "guest_name": lambda t, s: t.value(s, "guestName"),
+    "comment": lambda t, s: t.value(s, "publicReview") or "",
+    "rating": lambda t, s: t.value(s, "rating", 0),
+    "date": lambda t, s: EPOCH + t.dates[s] * MICROSECOND,
+    "status": lambda t, s: normalize_status(t.value(s, "status")),
+    "response": lambda t, s: t.value(s, "response"),
+    "source": lambda t, s: t.value(s, "source"),
+    "categories": lambda t, s: t.value(s, "reviewCategory") or [],
+}
+
+
+class ReviewRecord(Mapping):
+    """Read-only `Review`-shaped view of one table row"""
+    __slots__ = ("_table", "_slot")
+
+    def __init__(self, table: ReviewTable, slot: int):
+        self._table = table
+        self._slot = slot
+
+    def __getitem__(self, key: str) -> Any:
+        getter = RECORD_FIELDS.get(key)
+        if getter is None:
+            raise KeyError(key)
+        return getter(self._table, self._slot)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RECORD_FIELDS)
+
+    def __len__(self) -> int:
+        return len(RECORD_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"ReviewRecord({dict(self)!r})"
@@ -0,0 +1,40 @@
+"""Static property catalogue used alongside the mock review data"""
+
+# ✅ Mapping property slugs to names in mock data
+PROPERTY_MAP = {
+    "shoreditch-heights": "2B Shoreditch Heights",
+    "kensington-garden": "Kensington Garden House",
+    "central-london-loft": "Central London Loft",
+    "tower-bridge-studio": "Tower Bridge Studio",
+    "soho-modern-flat": "Soho Modern Flat",
+    "city-center-apartment": "City Center Apartment",
+    "riverside-cottage": "Riverside Cottage",
+}
+
+# Reverse lookup used when normalizing raw listings to property slugs
+LISTING_TO_PROPERTY = {name: slug for slug, name in PROPERTY_MAP.items()}
+
+# ✅ Mock property info
+MOCK_PROPERTIES = {
+    "shoreditch-heights": {
+        "id": "shoreditch-heights",
+        "name": "2B Shoreditch Heights",
+        "address": "Shoreditch High St",
+        "city": "London",
+        "image_url": "/images/shoreditch-heights.jpg",
+    },
+    "kensington-garden": {
+        "id": "kensington-garden",
+        "name": "Kensington Garden House",
+        "address": "Kensington Rd",
+        "city": "London",
+        "image_url": "/images/kingston.jpg",
+    },
+    "central-london-loft": {
+        "id": "central-london-loft",
+        "name": "Central London Loft",
+        "address": "King St",
+        "city": "London",
+        "image_url": "/images/central-london-loft.png",
+    },
+}
@@ -1,17 +1,20 @@
-"""Base database model (prepared for SQLAlchemy)"""
-from typing import Any
+"""Base database model"""
 from datetime import datetime
 
+from sqlalchemy import DateTime, func
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
-class Base:
+
+class Base(DeclarativeBase):
     """
-    Base class for database models
-    
-    This is a placeholder for SQLAlchemy Base.
-    When migrating to a real database, replace with:
-    from sqlalchemy.ext.declarative import declarative_base
-    Base = declarative_base()
+    Declarative base for all ORM models
+
+    Every table gets ``created_at``/``updated_at`` columns maintained by the
+    database, mirroring the metadata fields on the Pydantic models.
     """
-    id: Any
-    created_at: datetime
-    updated_at: datetime
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,33 @@
+"""ORM table definitions"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ReviewModel(Base):
+    """Review row; columns mirror `app.models.review.Review`"""
+    __tablename__ = "reviews"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    property_id: Mapped[str] = mapped_column(String(128))
+    property_name: Mapped[str] = mapped_column(String(255))
+    guest_name: Mapped[str] = mapped_column(String(255))
+    # Hostaway sends reviews without an overall rating; moderation still stores them
+    rating: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    comment: Mapped[str] = mapped_column(Text, default="")
+    date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    source: Mapped[str] = mapped_column(String(32))
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        # Property pages list one listing's reviews newest-first
+        Index("ix_reviews_property_date", "property_id", "date"),
+        # Dashboard filters combine channel and moderation state
+        Index("ix_reviews_source_status", "source", "status"),
+        Index("ix_reviews_rating", "rating"),
+    )
@@ -1,68 +1,273 @@
 """Review repository for CRUD operations"""
-from typing import List, Optional
 from datetime import datetime
-from app.models.review import Review
+from typing import Any, List, Optional, Sequence
+from fastapi import Depends
+from sqlalchemy import Select, and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import ReviewModel
+from app.db.session import get_db
+from app.models.review import Review, ReviewFilters
 from app.models.enums import ReviewStatus
 
+# Sortable columns; names sort case-insensitively like `sort_reviews`
+SORT_COLUMNS = {
+    "date": ReviewModel.date,
+    "rating": ReviewModel.rating,
+    "guest_name": func.lower(ReviewModel.guest_name),
+    "property": func.lower(ReviewModel.property_name),
+}
+
 
 class ReviewRepository:
     """
     Repository for review data access
-    
-    Currently uses mock data. When migrating to a database:
-    - Add SQLAlchemy session dependency
-    - Implement actual CRUD operations
-    - Add transaction management
+
+    Filtering, ordering and keyset pagination are pushed down into SQL so
+    only the requested page ever leaves the database. Queries are shaped to
+    hit the composite indexes declared on `ReviewModel`.
     """
-    
-    def __init__(self, db_session=None):
+
+    def __init__(self, db_session: AsyncSession):
         self.db = db_session
-    
+
     async def get_all(
         self,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        filters: Optional[ReviewFilters] = None,
+        sort_by: str = "date",
+        descending: bool = True,
+        after: Optional[tuple[Any, str]] = None,
     ) -> List[Review]:
-        """Get all reviews with pagination"""
-        # TODO: Implement with database query
-        # return self.db.query(ReviewModel).offset(skip).limit(limit).all()
-        raise NotImplementedError("Using mock data - see endpoints/reviews.py")
-    
+        """
+        Get reviews with filtering, sorting and pagination
+
+        Args:
+            skip: Offset for offset pagination (ignored when `after` is set)
+            limit: Maximum number of reviews to return
+            filters: Optional query filters
+            sort_by: Field to sort by (date, rating, guest_name, property)
+            descending: Sort in descending order
+            after: (sort value, id) of the last row of the previous page,
+                enabling keyset pagination
+
+        Returns:
+            One page of reviews
+        """
+        stmt = self._apply_filters(select(ReviewModel), filters)
+        stmt = self._apply_order(stmt, sort_by, descending, after)
+        if after is None and skip:
+            stmt = stmt.offset(skip)
+        result = await self.db.scalars(stmt.limit(limit))
+        return [self._to_review(row) for row in result]
+
+    async def count(self, filters: Optional[ReviewFilters] = None) -> int:
+        """Count reviews matching the filters"""
+        stmt = self._apply_filters(select(func.count()).select_from(ReviewModel), filters)
+        return int(await self.db.scalar(stmt) or 0)
+
     async def get_by_id(self, review_id: str) -> Optional[Review]:
         """Get review by ID"""
-        # TODO: Implement with database query
-        # return self.db.query(ReviewModel).filter(ReviewModel.id == review_id).first()
-        raise NotImplementedError("Using mock data - see endpoints/reviews.py")
-    
+        row = await self.db.get(ReviewModel, review_id)
+        return self._to_review(row) if row else None
+
     async def get_by_property(
         self,
         property_id: str,
-        status: Optional[ReviewStatus] = None
+        status: Optional[ReviewStatus] = None,
+        limit: int = 100,
+        after: Optional[tuple[Any, str]] = None,
     ) -> List[Review]:
-        """Get reviews for a specific property"""
-        # TODO: Implement with database query
-        raise NotImplementedError("Using mock data - see endpoints/reviews.py")
-    
+        """Get reviews for a specific property, newest first"""
+        filters = ReviewFilters(property_id=property_id, status=status)
+        return await self.get_all(limit=limit, filters=filters, after=after)
+
     async def create(self, review: Review) -> Review:
         """Create a new review"""
-        # TODO: Implement with database insert
-        raise NotImplementedError("Using mock data - see endpoints/reviews.py")
-    
+        row = ReviewModel(**self._to_columns(review))
+        self.db.add(row)
+        await self.db.commit()
+        await self.db.refresh(row)
+        return self._to_review(row)
+
+    async def upsert_many(self, reviews: Sequence[Review]) -> int:
+        """Insert or update many reviews in a single statement"""
+        if not reviews:
+            return 0
+        values = [self._to_columns(r) for r in reviews]
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for value in values:
+                await self.db.merge(ReviewModel(**value))
+            await self.db.commit()
+            return len(values)
+
+        stmt = insert(ReviewModel).values(values)
+        updatable = {k: stmt.excluded[k] for k in values[0] if k != "id"}
+        updatable["updated_at"] = func.now()
+        await self.db.execute(
+            stmt.on_conflict_do_update(index_elements=[ReviewModel.id], set_=updatable)
+        )
+        await self.db.commit()
+        return len(values)
+
     async def update_status(
         self,
         review_id: str,
-        status: ReviewStatus
+        status: ReviewStatus,
+        response: Optional[str] = None
     ) -> Optional[Review]:
         """Update review approval status"""
-        # TODO: Implement with database update
-        raise NotImplementedError("Using mock data - see endpoints/reviews.py")
-    
+        values: dict[str, Any] = {"status": status.value, "updated_at": func.now()}
+        if response is not None:
+            values["response"] = response
+        stmt = (
+            update(ReviewModel)
+            .where(ReviewModel.id == review_id)
+            .values(**values)
+            .returning(ReviewModel)
+        )
+        row = (await self.db.scalars(stmt)).first()
+        await self.db.commit()
+        return self._to_review(row) if row else None
+
+    async def insert_missing(self, rows: Sequence[dict[str, Any]], commit: bool = True) -> None:
+        """
+        Insert the review rows not stored yet, leaving rows that already exist untouched
+
+        Rows are `ReviewModel` column values, not `Review`s: they come from
+        raw records, whose ratings the API model would reject.
+        """
+        if not rows:
+            return
+        values = list(rows)
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            stored = set(await self.db.scalars(
+                select(ReviewModel.id).where(ReviewModel.id.in_([value["id"] for value in values]))
+            ))
+            self.db.add_all(ReviewModel(**value) for value in values if value["id"] not in stored)
+            if commit:
+                await self.db.commit()
+            return
+
+        stmt = insert(ReviewModel).values(values)
+        await self.db.execute(stmt.on_conflict_do_nothing(index_elements=[ReviewModel.id]))
+        if commit:
+            await self.db.commit()
+
+    async def update_status_many(
+        self,
+        review_ids: Sequence[str],
+        status: ReviewStatus,
+        response: Optional[str] = None,
+        commit: bool = True,
+    ) -> set[str]:
+        """
+        Update the approval status of many reviews in one statement; returns the ids found
+
+        With `commit=False` the update joins the session's open transaction,
+        for the caller to commit together with its other writes.
+        """
+        if not review_ids:
+            return set()
+        values: dict[str, Any] = {"status": status.value, "updated_at": func.now()}
+        if response is not None:
+            values["response"] = response
+        stmt = (
+            update(ReviewModel)
+            .where(ReviewModel.id.in_(review_ids))
+            .values(**values)
+            .returning(ReviewModel.id)
+        )
+        updated = set((await self.db.scalars(stmt)).all())
+        if commit:
+            await self.db.commit()
+        return updated
+
+    async def get_statuses(self, since: Optional[datetime] = None) -> list[tuple[str, str, Optional[str]]]:
+        """(id, status, response) of every stored review, or of those updated at or after `since`"""
+        stmt = select(ReviewModel.id, ReviewModel.status, ReviewModel.response)
+        if since is not None:
+            stmt = stmt.where(ReviewModel.updated_at >= since)
+        result = await self.db.execute(stmt)
+        return [tuple(row) for row in result]
+
+    async def last_updated(self) -> Optional[datetime]:
+        """When a stored review was last updated (None when there are none)"""
+        return await self.db.scalar(select(func.max(ReviewModel.updated_at)))
+
     async def delete(self, review_id: str) -> bool:
         """Delete a review"""
-        # TODO: Implement with database delete
-        raise NotImplementedError("Using mock data - see endpoints/reviews.py")
+        result = await self.db.execute(delete(ReviewModel).where(ReviewModel.id == review_id))
+        await self.db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    def _apply_filters(stmt: Select, filters: Optional[ReviewFilters]) -> Select:
+        if filters is None:
+            return stmt
+        if filters.property_id:
+            stmt = stmt.where(ReviewModel.property_id == filters.property_id)
+        if filters.source:
+            stmt = stmt.where(ReviewModel.source == filters.source.value)
+        if filters.status:
+            stmt = stmt.where(ReviewModel.status == filters.status.value)
+        if filters.min_rating is not None:
+            stmt = stmt.where(ReviewModel.rating >= filters.min_rating)
+        if filters.max_rating is not None:
+            stmt = stmt.where(ReviewModel.rating <= filters.max_rating)
+        if filters.start_date:
+            stmt = stmt.where(ReviewModel.date >= filters.start_date)
+        if filters.end_date:
+            stmt = stmt.where(ReviewModel.date <= filters.end_date)
+        if filters.search:
+            pattern = f"%{filters.search}%"
+            stmt = stmt.where(
+                or_(ReviewModel.guest_name.ilike(pattern), ReviewModel.comment.ilike(pattern))
+            )
+        return stmt
+
+    @staticmethod
+    def _apply_order(
+        stmt: Select,
+        sort_by: str,
+        descending: bool,
+        after: Optional[tuple[Any, str]],
+    ) -> Select:
+        column = SORT_COLUMNS.get(sort_by, ReviewModel.date)
+        if after is not None:
+            value, last_id = after
+            if descending:
+                stmt = stmt.where(or_(column < value, and_(column == value, ReviewModel.id < last_id)))
+            else:
+                stmt = stmt.where(or_(column > value, and_(column == value, ReviewModel.id > last_id)))
+        if descending:
+            return stmt.order_by(column.desc(), ReviewModel.id.desc())
+        return stmt.order_by(column.asc(), ReviewModel.id.asc())
+
+    @staticmethod
+    def _to_columns(review: Review) -> dict[str, Any]:
+        # Category scores live with the raw export, not in the reviews table
+        data = review.model_dump(exclude={"created_at", "updated_at", "categories"})
+        data["source"] = review.source.value
+        data["status"] = review.status.value
+        return data
+
+    @staticmethod
+    def _to_review(row: ReviewModel) -> Review:
+        return Review.model_validate(row, from_attributes=True)
 
 
-def get_review_repository(db_session=None) -> ReviewRepository:
+def get_review_repository(db: AsyncSession = Depends(get_db)) -> ReviewRepository:
     """Dependency for getting review repository"""
-    return ReviewRepository(db_session)
+    return ReviewRepository(db)
@@ -1,30 +1,81 @@
-"""Database session management (prepared for SQLAlchemy)"""
-from typing import Generator
+"""Database engine and session management"""
+from typing import AsyncGenerator, Optional
 
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
 
-class SessionLocal:
-    """
-    Placeholder for SQLAlchemy session
-    
-    When migrating to a real database, replace with:
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import sessionmaker
-    
-    engine = create_engine(DATABASE_URL)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    """
-    pass
+from app.config import settings
+from app.db.base import Base
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./reviews.db"
+
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 
 
-def get_db() -> Generator:
+def create_engine(url: Optional[str] = None) -> AsyncEngine:
     """
-    Dependency for getting database session
-    
-    When migrating to a real database, implement as:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    Create an async engine with a connection pool suited to the backend
+
+    In-memory SQLite needs a single shared connection; every other URL gets a
+    bounded queue pool with pre-ping so stale connections are recycled.
     """
-    yield None
+    url = url or settings.DATABASE_URL or DEFAULT_DATABASE_URL
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return create_async_engine(
+            url,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+
+
+def get_engine() -> AsyncEngine:
+    """Process-wide engine, created on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine()
+    return _engine
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(get_engine(), expire_on_commit=False)
+    return _session_factory
+
+
+async def init_db(engine: Optional[AsyncEngine] = None) -> None:
+    """Create tables and indexes that do not exist yet"""
+    import app.db.models  # noqa: F401  (register tables on Base.metadata)
+
+    async with (engine or get_engine()).begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def dispose_engine() -> None:
+    """Close pooled connections (called on application shutdown)"""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting database session"""
+    async with get_session_factory()() as session:
+        yield session
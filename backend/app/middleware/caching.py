@@ -0,0 +1,90 @@
+"""Conditional GET: strong ETags from the dataset version, and per-route Cache-Control"""
+from hashlib import blake2b
+from typing import Callable, Mapping, Optional
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def make_etag(version: str, path: str, query_string: bytes) -> str:
+    """Strong ETag for one view of one dataset version (query parameter order ignored)"""
+    query = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    digest = blake2b(f"{version}|{path}|{query}".encode("utf-8"), digest_size=10)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header covers `etag` (weak comparison, per RFC 9110)"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ConditionalGetMiddleware:
+    """
+    Answer repeat GETs with 304 before the route runs
+
+    Every response from a covered route is a function of the review store's
+    version and the request's path and query, so the ETag is known up front:
+    a matching ``If-None-Match`` is answered immediately, without calling the
+    app. `policies` maps path prefixes (below `prefix`) to the Cache-Control
+    value for those routes; the longest matching prefix wins, and paths
+    matching none are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        version: Callable[[], str],
+        policies: Mapping[str, str],
+        prefix: str = "",
+    ):
+        self.app = app
+        self.version = version
+        self.policies = sorted(
+            ((prefix.rstrip("/") + path, value) for path, value in policies.items()),
+            key=lambda policy: len(policy[0]),
+            reverse=True,
+        )
+
+    def cache_control(self, path: str) -> Optional[str]:
+        for route, value in self.policies:
+            if path == route or path.startswith(route.rstrip("/") + "/"):
+                return value
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        cache_control = self.cache_control(scope["path"])
+        if cache_control is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag = make_etag(self.version(), scope["path"], scope["query_string"])
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(b"etag", etag.encode()), (b"cache-control", cache_control.encode())],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers.setdefault("etag", etag)
+                headers.setdefault("cache-control", cache_control)
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
@@ -0,0 +1,93 @@
+"""Per-route request timing, sizes, in-flight count and error metrics"""
+from time import perf_counter
+from typing import Optional
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics.registry import RequestMetrics, current_spans, get_request_metrics
+
+# Requests that match no route (404s) share one label
+UNMATCHED = "unmatched"
+# Route labels remembered per (method, path)
+MAX_CACHED_PATHS = 4096
+
+
+def route_template(path: str, path_params: Optional[dict]) -> str:
+    """The matched route's path, with path parameter values put back as ``{name}``"""
+    if not path_params:
+        return path
+    names = {str(value): name for name, value in path_params.items()}
+    return "/".join("{%s}" % names[part] if part in names else part for part in path.split("/"))
+
+
+class MetricsMiddleware:
+    """
+    Record every HTTP request in `RequestMetrics`
+
+    Latency runs until the last body chunk is sent, so streamed responses
+    count in full. Requests are labelled by route template rather than raw
+    path, keeping label cardinality bounded. The template is recovered from
+    the path parameters the router leaves in the scope (responses sent
+    before routing, like conditional GET 304s, are matched against the
+    routes here instead) and remembered per path. Spans timed while a
+    request is handled are filed under its route.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics or get_request_metrics()
+        self._paths: dict[tuple[str, str], str] = {}
+
+    def route_label(self, scope: Scope) -> str:
+        key = (scope["method"], scope["path"])
+        label = self._paths.get(key)
+        if label is None:
+            if "endpoint" in scope:
+                label = route_template(scope["path"], scope.get("path_params"))
+            else:
+                label = UNMATCHED
+                app = scope.get("app")
+                for route in app.router.routes if app is not None else ():
+                    match, child_scope = route.matches(scope)
+                    if match is Match.FULL:
+                        label = route_template(scope["path"], child_scope.get("path_params"))
+                        break
+            if len(self._paths) < MAX_CACHED_PATHS:
+                self._paths[key] = label
+        return label
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status = 500
+        sent = 0
+        spans: list[tuple[str, float]] = []
+        token = current_spans.set(spans)
+        metrics = self.metrics
+        metrics.in_flight += 1
+
+        async def send_counted(message: Message) -> None:
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_counted)
+        finally:
+            current_spans.reset(token)
+            metrics.in_flight -= 1
+            received = 0
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    received = int(value) if value.isdigit() else 0
+                    break
+            metrics.observe_request(
+                scope["method"], self.route_label(scope), status, perf_counter() - start, received, sent, spans
+            )
@@ -0,0 +1,97 @@
+"""Opt-in sampling profiler for live requests"""
+import asyncio
+import random
+from datetime import datetime, timezone
+from hmac import compare_digest
+from threading import Lock
+from time import perf_counter
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling.sampler import StackSampler, render_collapsed
+from app.core.profiling.store import ProfileStore, get_profile_store
+
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that carry ``X-Profile: <admin token>``, plus a random
+    `sample_rate` fraction of all requests
+
+    A profiled request is stack-sampled from start to the end of its
+    response and saved as collapsed stacks in the `ProfileStore`; its id
+    comes back in an ``X-Profile-Id`` header. One request is profiled at a
+    time (the sampler sees the whole process), so requests arriving while
+    a profile is running are served unprofiled.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        admin_token: Optional[str],
+        sample_rate: float,
+        interval: float,
+        store: Optional[ProfileStore] = None,
+    ):
+        self.app = app
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.store = store or get_profile_store()
+        self._busy = Lock()
+
+    def wants_profile(self, scope: Scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if not self.admin_token:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return compare_digest(value, self.admin_token.encode())
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.wants_profile(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        status = 500
+
+        async def send_tagged(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        started_at = datetime.now(timezone.utc)
+        start = perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_tagged)
+        finally:
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope["query_string"].decode("latin-1"),
+                "status": status,
+                "started_at": started_at.isoformat(),
+                "duration_ms": round((perf_counter() - start) * 1000, 2),
+            }
+            try:
+                await asyncio.to_thread(self._finish, sampler, profile_id, meta)
+            finally:
+                self._busy.release()
+
+    def _finish(self, sampler: StackSampler, profile_id: str, meta: dict) -> None:
+        stacks = sampler.stop()
+        meta["samples"] = sampler.samples
+        try:
+            self.store.save(profile_id, meta, render_collapsed(stacks))
+        except OSError as e:
+            print(f"Could not save profile {profile_id}: {e}")
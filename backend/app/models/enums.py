@@ -18,7 +18,22 @@ class ReviewStatus(str, Enum):
 
 
 class SortField(str, Enum):
-    """Available sort fields"""
+    """Available sort fields (one precomputed order each in the review store)"""
     DATE = "date"
     RATING = "rating"
+    GUEST_NAME = "guest_name"
     PROPERTY = "property"
+
+
+class ResponseFormat(str, Enum):
+    """Serialization of review listings"""
+    JSON = "json"                   # one buffered JSON document
+    JSON_STREAM = "json-stream"     # the same document, sent in chunks
+    NDJSON = "ndjson"               # one review per line, streamed
+
+
+class TrendGranularity(str, Enum):
+    """Bucket size for review trends"""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
@@ -24,11 +24,18 @@ class ReviewBase(BaseModel):
         return round(v, 1)
 
 
+class ReviewCategory(BaseModel):
+    """One category score (Hostaway rates categories out of 10)"""
+    category: str
+    rating: Optional[float] = None
+
+
 class Review(ReviewBase):
     """Full review model with metadata"""
     id: str
     status: ReviewStatus = ReviewStatus.PENDING
     response: Optional[str] = None
+    categories: list[ReviewCategory] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
@@ -51,6 +58,11 @@ class ReviewUpdate(BaseModel):
     response: Optional[str] = None
 
 
+class BulkReviewUpdate(ReviewUpdate):
+    """The same status update (and response) applied to many reviews"""
+    ids: list[str] = Field(..., min_length=1)
+
+
 class PropertyStats(BaseModel):
     """Property review statistics"""
     property_id: str
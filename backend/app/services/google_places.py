@@ -1,18 +1,124 @@
 """Google Places API client for fetching Google Reviews"""
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
 import httpx
-from typing import List, Dict, Any, Optional
+
 from app.config import get_settings
 
 settings = get_settings()
 
+DEFAULT_PLACE_CACHE_PATH = Path(__file__).resolve().parents[1] / "data" / "google_place_ids.json"
+
+T = TypeVar("T")
+
 
 class GooglePlacesClient:
-    """Client for interacting with Google Places API"""
-    
-    def __init__(self, api_key: Optional[str] = None):
+    """
+    Client for interacting with Google Places API
+
+    One pooled `httpx.AsyncClient` serves every call. Place ids resolved by
+    `search_place` are persisted to a small JSON file, since they almost
+    never change; place reviews are cached per (place_id, language) for
+    `reviews_ttl` seconds. Concurrent place searches or review fetches for
+    the same key share a single upstream call. Failed lookups are not
+    cached.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        http: Optional[httpx.AsyncClient] = None,
+        cache_path: Optional[Path] = None,
+        reviews_ttl: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ):
         self.api_key = api_key or settings.GOOGLE_PLACES_API_KEY
         self.base_url = "https://maps.googleapis.com/maps/api/place"
-    
+        self.cache_path = Path(cache_path or settings.GOOGLE_PLACES_CACHE_PATH or DEFAULT_PLACE_CACHE_PATH)
+        self.reviews_ttl = reviews_ttl if reviews_ttl is not None else settings.GOOGLE_PLACES_REVIEWS_TTL
+        self.max_concurrency = max_concurrency or settings.GOOGLE_PLACES_MAX_CONCURRENCY
+
+        self._http = http
+        self._owns_http = http is None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._place_ids: Dict[str, str] = self._load_place_ids()
+        self._reviews: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+        self._inflight: Dict[Tuple[str, ...], asyncio.Future] = {}
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.GOOGLE_PLACES_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency * 2,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None and self._owns_http:
+            await self._http.aclose()
+        self._http = None
+
+    # -------------------------
+    # Place id cache
+    # -------------------------
+
+    def _load_place_ids(self) -> Dict[str, str]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_place_ids(self) -> None:
+        tmp = self.cache_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._place_ids, f, indent=2, sort_keys=True)
+        tmp.replace(self.cache_path)
+
+    @staticmethod
+    def _place_key(query: str, location: Optional[str]) -> str:
+        return f"{query.strip().lower()}|{location or ''}"
+
+    # -------------------------
+    # Requests
+    # -------------------------
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._semaphore:
+            response = await self.http.get(f"{self.base_url}{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _coalesce(self, key: Tuple[str, ...], fetch: Callable[[], Awaitable[T]]) -> T:
+        """Run `fetch`, or wait on the identical call already in flight"""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+            future.set_result(result)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            # Retrieve the exception so an unawaited future does not warn
+            if future.done() and not future.cancelled():
+                future.exception()
+        return result
+
     async def get_place_reviews(
         self,
         place_id: str,
@@ -20,39 +126,40 @@ class GooglePlacesClient:
     ) -> List[Dict[str, Any]]:
         """
         Fetch reviews for a Google Place
-        
+
         Args:
             place_id: Google Place ID
             language: Language code for reviews
-            
+
         Returns:
             List of review data from Google Places
         """
+        cached = self._reviews.get((place_id, language))
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        return await self._coalesce(
+            ("details", place_id, language), lambda: self._fetch_place_reviews(place_id, language)
+        )
+
+    async def _fetch_place_reviews(self, place_id: str, language: str) -> List[Dict[str, Any]]:
         params = {
             "place_id": place_id,
             "fields": "reviews,rating,user_ratings_total",
             "key": self.api_key,
             "language": language
         }
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/details/json",
-                    params=params,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get("status") == "OK":
-                    result = data.get("result", {})
-                    return result.get("reviews", [])
-                return []
-            except httpx.HTTPError as e:
-                print(f"Error fetching Google reviews: {e}")
-                return []
-    
+        try:
+            data = await self._get("/details/json", params)
+        except httpx.HTTPError as e:
+            print(f"Error fetching Google reviews: {e}")
+            return []
+
+        if data.get("status") != "OK":
+            return []
+        reviews = data.get("result", {}).get("reviews", [])
+        self._reviews[(place_id, language)] = (time.monotonic() + self.reviews_ttl, reviews)
+        return reviews
+
     async def search_place(
         self,
         query: str,
@@ -60,39 +167,89 @@ class GooglePlacesClient:
     ) -> Optional[str]:
         """
         Search for a place and return its place_id
-        
+
         Args:
             query: Search query (e.g., property name and address)
             location: Optional location bias (lat,lng)
-            
+
         Returns:
             Google Place ID if found, None otherwise
         """
+        cache_key = self._place_key(query, location)
+        if cache_key in self._place_ids:
+            return self._place_ids[cache_key]
+        return await self._coalesce(
+            ("search", cache_key), lambda: self._search_place(cache_key, query, location)
+        )
+
+    async def _search_place(self, cache_key: str, query: str, location: Optional[str]) -> Optional[str]:
         params = {
             "query": query,
             "key": self.api_key
         }
         if location:
             params["location"] = location
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/textsearch/json",
-                    params=params,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get("status") == "OK" and data.get("results"):
-                    return data["results"][0].get("place_id")
-                return None
-            except httpx.HTTPError as e:
-                print(f"Error searching Google Places: {e}")
-                return None
+
+        try:
+            data = await self._get("/textsearch/json", params)
+        except httpx.HTTPError as e:
+            print(f"Error searching Google Places: {e}")
+            return None
+
+        if data.get("status") == "OK" and data.get("results"):
+            place_id = data["results"][0].get("place_id")
+            if place_id:
+                self._place_ids[cache_key] = place_id
+                await asyncio.to_thread(self._save_place_ids)
+            return place_id
+        return None
+
+    async def get_reviews_for_places(
+        self,
+        place_ids: List[str],
+        language: str = "en"
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Reviews for many places, fetched concurrently"""
+        unique = list(dict.fromkeys(place_ids))
+        results = await asyncio.gather(*(self.get_place_reviews(p, language) for p in unique))
+        return dict(zip(unique, results))
+
+    async def get_reviews_for_properties(
+        self,
+        queries: Dict[str, str],
+        language: str = "en"
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Reviews for many properties in one concurrent batch
+
+        Args:
+            queries: Property id -> search query (e.g. name and address)
+
+        Returns:
+            Property id -> Google reviews; empty when no place was found
+        """
+        property_ids = list(queries)
+        place_ids = await asyncio.gather(*(self.search_place(queries[p]) for p in property_ids))
+        reviews = await self.get_reviews_for_places([p for p in place_ids if p], language)
+        return {
+            property_id: reviews.get(place_id, []) if place_id else []
+            for property_id, place_id in zip(property_ids, place_ids)
+        }
+
+
+_client: Optional[GooglePlacesClient] = None
 
 
 def get_google_places_client() -> GooglePlacesClient:
     """Dependency for getting Google Places client"""
-    return GooglePlacesClient()
+    global _client
+    if _client is None:
+        _client = GooglePlacesClient()
+    return _client
+
+
+async def close_google_places_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
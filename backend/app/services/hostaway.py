@@ -1,38 +1,252 @@
-import requests
-import json
-import os
+"""Async Hostaway API client"""
+import asyncio
+import random
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
 from app.config import settings
+from app.core.store.ingest import iter_export
+
+MOCK_DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "mock_reviews.json"
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Query parameters asking for the most recently submitted reviews first
+NEWEST_FIRST = {"sortBy": "submittedAt", "sortOrder": "desc"}
+
+
+class HostawayError(Exception):
+    """Raised when Hostaway cannot be reached within the retry budget"""
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of first attempts
+
+    Every first attempt deposits `ratio` tokens and every retry withdraws
+    one, so a failing upstream cannot multiply our request volume.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0):
+        self.ratio = ratio
+        self.capacity = min_tokens
+        self.tokens = min_tokens
+
+    def record_attempt(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
 
 class HostawayClient:
-    def __init__(self):
-        self.base_url = settings.HOSTAWAY_API_BASE
-        self.api_key = settings.HOSTAWAY_API_KEY
-        self.account_id = settings.HOSTAWAY_ACCOUNT_ID
-
-    def get_reviews(self):
-        url = f"{self.base_url}/v1/reviews"
-        headers = {
+    """
+    Client for the Hostaway reviews API
+
+    A single `httpx.AsyncClient` is shared by every call so connections are
+    pooled. Review pages (`limit`/`offset`) are fetched concurrently up to
+    `max_concurrency` at a time; transient failures are retried with
+    exponential backoff and full jitter, bounded per request by
+    `max_retries` and overall by a shared `RetryBudget`. A 429 pauses all
+    in-flight page fetches until its `Retry-After` has elapsed.
+    """
+
+    def __init__(
+        self,
+        http: Optional[httpx.AsyncClient] = None,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        account_id: Optional[int] = None,
+        page_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.base_url = (base_url or settings.HOSTAWAY_API_BASE).rstrip("/")
+        self.api_key = api_key if api_key is not None else settings.HOSTAWAY_API_KEY
+        self.account_id = account_id if account_id is not None else settings.HOSTAWAY_ACCOUNT_ID
+        self.page_size = page_size or settings.HOSTAWAY_PAGE_SIZE
+        self.max_concurrency = max_concurrency or settings.HOSTAWAY_MAX_CONCURRENCY
+        self.max_retries = max_retries if max_retries is not None else settings.HOSTAWAY_MAX_RETRIES
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_budget = RetryBudget()
+
+        self._http = http
+        self._owns_http = http is None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._paused_until = 0.0
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.HOSTAWAY_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency * 2,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                headers=self._headers(),
+            )
+        return self._http
+
+    def _headers(self) -> dict[str, str]:
+        return {
             "Content-Type": "application/json",
             "X-ACCOUNT-ID": str(self.account_id),
-            "X-API-KEY": self.api_key,
+            "X-API-KEY": self.api_key or "",
         }
 
-        try:
-            resp = requests.get(url, headers=headers, timeout=10)
+    async def aclose(self) -> None:
+        if self._http is not None and self._owns_http:
+            await self._http.aclose()
+        self._http = None
+
+    # -------------------------
+    # Requests
+    # -------------------------
+
+    async def _get(self, path: str, params: dict[str, Any]) -> dict:
+        """GET with rate-limit pauses, backoff with jitter and the retry budget"""
+        self.retry_budget.record_attempt()
+        attempt = 0
+        while True:
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                async with self._semaphore:
+                    resp = await self.http.get(f"{self.base_url}{path}", params=params)
+                if resp.status_code == 200:
+                    return resp.json()
+                if resp.status_code not in RETRYABLE_STATUS:
+                    raise HostawayError(f"Hostaway returned {resp.status_code}")
+                error: Exception = HostawayError(f"Hostaway returned {resp.status_code}")
+                retry_after = _retry_after(resp)
+            except httpx.TransportError as e:
+                error, retry_after = e, None
+
+            if attempt >= self.max_retries or not self.retry_budget.try_spend():
+                raise HostawayError(f"Giving up on {path} after {attempt + 1} attempts: {error}") from error
+            attempt += 1
+
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            else:
+                cap = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                await asyncio.sleep(random.uniform(0, cap))
+
+    async def _get_page(
+        self, offset: int, params: Optional[dict[str, Any]] = None
+    ) -> tuple[list[dict], Optional[int]]:
+        data = await self._get("/reviews", {"limit": self.page_size, "offset": offset, **(params or {})})
+        count = data.get("count")
+        return data.get("result") or [], int(count) if count is not None else None
+
+    async def iter_review_pages(self) -> AsyncIterator[list[dict]]:
+        """
+        Stream review pages as they arrive
+
+        The first page reveals the total count when Hostaway reports it, and
+        the remaining offsets are then fetched concurrently. Without a count,
+        pages are requested in waves of `max_concurrency` until a short page
+        marks the end.
+        """
+        first, total = await self._get_page(0)
+        yield first
+        if len(first) < self.page_size:
+            return
+
+        if total is not None:
+            offsets = range(self.page_size, total, self.page_size)
+            for task in asyncio.as_completed([self._get_page(o) for o in offsets]):
+                page, _ = await task
+                yield page
+            return
+
+        async for page in self._iter_waves(self.page_size):
+            yield page
+
+    async def iter_review_pages_newest_first(self) -> AsyncIterator[list[dict]]:
+        """
+        Stream review pages in offset order, most recently submitted first
+
+        Pages are fetched in waves of `max_concurrency` and yielded in
+        order, so a caller after recent reviews only can stop iterating
+        once it reaches ones it has seen; at most one wave is fetched past
+        that point.
+        """
+        async for page in self._iter_waves(0, NEWEST_FIRST):
+            yield page
+
+    async def _iter_waves(self, offset: int, params: Optional[dict[str, Any]] = None) -> AsyncIterator[list[dict]]:
+        """Pages from `offset` on, `max_concurrency` at a time, until a short page marks the end"""
+        while True:
+            wave = [offset + i * self.page_size for i in range(self.max_concurrency)]
+            pages = await asyncio.gather(*(self._get_page(o, params) for o in wave))
+            for page, _ in pages:
+                if page:
+                    yield page
+            if any(len(page) < self.page_size for page, _ in pages):
+                return
+            offset = wave[-1] + self.page_size
+
+    async def iter_reviews(self) -> AsyncIterator[dict]:
+        """Stream individual raw review items"""
+        async for page in self.iter_review_pages():
+            for item in page:
+                yield item
+
+    async def fetch_reviews(self) -> list[dict]:
+        """All raw review items from the live API"""
+        return [item async for item in self.iter_reviews()]
+
+    async def get_reviews(self) -> list[dict]:
+        """
+        Live reviews, or the bundled mock data when mock mode is configured
+
+        Upstream failures raise `HostawayError` rather than quietly serving
+        mock data in place of live reviews.
+        """
+        if settings.HOSTAWAY_USE_MOCK or not self.api_key:
+            return await asyncio.to_thread(self._load_mock_reviews)
+        return await self.fetch_reviews()
+
+    def _load_mock_reviews(self) -> list[dict]:
+        return list(iter_export(MOCK_DATA_PATH))
+
+
+def _retry_after(resp: httpx.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if value is None:
+        return 1.0 if resp.status_code == 429 else None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return 1.0
+
+
+_client: Optional[HostawayClient] = None
 
-            # ✅ If live API works
-            if resp.status_code == 200:
-                return resp.json().get("result", [])
 
-            # ❌ If sandbox rejects
-            print(f"Hostaway API failed with {resp.status_code}, using mock data.")
-            return self._load_mock_reviews()
+def get_hostaway_client() -> HostawayClient:
+    """Dependency for the shared Hostaway client"""
+    global _client
+    if _client is None:
+        _client = HostawayClient()
+    return _client
 
-        except Exception as e:
-            print(f"Error fetching Hostaway reviews: {e}")
-            return self._load_mock_reviews()
 
-    def _load_mock_reviews(self):
-        mock_path = os.path.join(os.path.dirname(__file__), "../../data/mock_reviews.json")
-        with open(mock_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+async def close_hostaway_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
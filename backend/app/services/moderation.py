@@ -0,0 +1,165 @@
+"""Review moderation, persisted to the database before it reaches the review store"""
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Mapping, Optional
+
+from app.config import settings
+from app.core.normalizers.hostaway import review_payload
+from app.core.store.reviews import ReviewStore, StoreChange
+from app.db.repositories.reviews import ReviewRepository
+from app.db.session import get_session_factory
+from app.models.enums import ReviewStatus
+
+# Columns a row cannot be stored without
+REQUIRED_COLUMNS = ("property_id", "property_name", "guest_name", "date", "source")
+
+# SQLite stamps whole seconds, so each poll re-reads the last second of the one before
+POLL_OVERLAP = timedelta(seconds=1)
+
+
+def review_row(record: Mapping[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    `ReviewModel` columns for a store record, or None if the database cannot hold it
+
+    Built from the record as stored rather than through `Review`, which
+    rejects the null and 10-point overall ratings Hostaway sends.
+    """
+    try:
+        row = review_payload(record, datetime.now(timezone.utc))
+    except (TypeError, ValueError):
+        # A rating that is not a number
+        return None
+    for field in ("categories", "created_at", "updated_at"):
+        del row[field]
+    if any(row[column] is None for column in REQUIRED_COLUMNS):
+        return None
+    return row
+
+
+async def moderate(
+    store: ReviewStore,
+    repository: ReviewRepository,
+    review_ids: Iterable[str],
+    status: ReviewStatus,
+    response: Optional[str] = None,
+) -> dict[str, str]:
+    """
+    Set the status (and optionally the response) of many reviews, durably
+
+    The store is loaded from exports and snapshots, so the database is the
+    record of moderation decisions: the batch is written there first, in one
+    transaction (adding rows for reviews the database has not seen), and only
+    then applied to the store. A failed write leaves the store untouched.
+
+    Other workers apply the decisions within ``MODERATION_POLL_SECONDS``
+    (see `ModerationWatcher`) as ordinary moderation writes, costing each of
+    them the size of the batch rather than of the dataset. No snapshot is
+    republished, so every worker keeps its dataset generation and change
+    feed clients (SSE, ``/reviews/changes``) get the decisions as a delta
+    instead of a resync. Returns each id's outcome, as
+    `ReviewStore.moderate` does, or "invalid" for a review the database
+    cannot hold (left as it was, without failing the rest of the batch).
+    """
+    ids = list(dict.fromkeys(str(review_id) for review_id in review_ids))
+    rows: list[dict[str, Any]] = []
+    invalid: list[str] = []
+    for record in store.records_for(ids):
+        row = review_row(record)
+        if row is None:
+            invalid.append(record["id"])
+        else:
+            rows.append(row)
+    try:
+        await repository.insert_missing(rows, commit=False)
+        await repository.update_status_many([row["id"] for row in rows], status, response, commit=False)
+        await repository.db.commit()
+    except Exception:
+        await repository.db.rollback()
+        raise
+    skipped = set(invalid)
+    outcomes = store.moderate([i for i in ids if i not in skipped], status.value, response)
+    return {review_id: "invalid" if review_id in skipped else outcomes[review_id] for review_id in ids}
+
+
+async def restore_moderation(
+    store: ReviewStore,
+    repository: Optional[ReviewRepository] = None,
+    since: Optional[datetime] = None,
+) -> int:
+    """
+    Re-apply the persisted moderation decisions to `store`; returns the reviews changed
+
+    Called after loading an export or snapshot that may predate them (on
+    startup, and before the sync publishes a snapshot of its own), and with
+    `since` to apply only the decisions made after a point in time.
+    """
+    if repository is None:
+        async with get_session_factory()() as session:
+            return await restore_moderation(store, ReviewRepository(session), since)
+    groups: dict[tuple[str, Optional[str]], list[str]] = defaultdict(list)
+    for review_id, status, response in await repository.get_statuses(since):
+        groups[status, response].append(review_id)
+    restored = 0
+    for (status, response), ids in groups.items():
+        outcomes = store.moderate(ids, status, response)
+        restored += sum(outcome == "updated" for outcome in outcomes.values())
+    return restored
+
+
+class ModerationWatcher:
+    """
+    Applies the moderation decisions other workers persist to this worker's store
+
+    Each poll applies the decisions updated since the previous one (those
+    already applied are no-ops). After the store reloads an export or
+    snapshot, which may predate them, the next poll applies them all.
+    """
+
+    def __init__(self, store: ReviewStore, interval: Optional[float] = None):
+        self.store = store
+        self.interval = interval if interval is not None else settings.MODERATION_POLL_SECONDS
+        self._since: Optional[datetime] = None     # None: apply every decision on the next poll
+        self._reloads = 0
+        self._task: Optional[asyncio.Task] = None
+        self._unsubscribe = store.subscribe(self._on_change)
+
+    def _on_change(self, change: StoreChange) -> None:
+        if change.kind == "reload":
+            self._reloads += 1
+            self._since = None
+
+    async def poll_once(self, repository: Optional[ReviewRepository] = None) -> int:
+        """Apply the decisions made since the last poll; returns the reviews changed"""
+        if repository is None:
+            async with get_session_factory()() as session:
+                return await self.poll_once(ReviewRepository(session))
+        since, reloads = self._since, self._reloads
+        # Read first: a decision stamped after it is re-read by the next poll
+        latest = await repository.last_updated()
+        restored = await restore_moderation(self.store, repository, since - POLL_OVERLAP if since else None)
+        if self._reloads == reloads:
+            self._since = latest
+        return restored
+
+    async def run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll_once()
+            except Exception as e:  # keep polling through database hiccups
+                print(f"Moderation poll failed: {e!r}")
+
+    def start(self) -> None:
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.run_forever(), name="moderation-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._unsubscribe()
@@ -0,0 +1,298 @@
+"""Background incremental sync of Hostaway reviews into the review store"""
+import asyncio
+import fcntl
+import json
+import os
+import time
+from contextlib import aclosing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from app.config import settings
+from app.core.normalizers.hostaway import parse_timestamp, resolve_property_id
+from app.core.store.reviews import ReviewStore, get_review_store
+from app.services.hostaway import HostawayClient, HostawayError, get_hostaway_client
+from app.services.moderation import restore_moderation
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parents[1] / "data" / "hostaway_sync_state.json"
+DEFAULT_LOCK_PATH = Path(__file__).resolve().parents[1] / "data" / "hostaway_sync.lock"
+
+# Fields owned locally (written by moderation) or derived on ingest; never overwritten by upstream
+LOCAL_FIELDS = ("status", "response", "source")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _mark(item: dict) -> tuple[datetime, str]:
+    submitted = item.get("submittedAt")
+    return (parse_timestamp(submitted) if submitted else EPOCH, str(item.get("id", "")))
+
+
+class LeaderLock:
+    """
+    Non-blocking exclusive ``flock`` on a file, so one process (of several
+    workers sharing the file) holds it at a time. The OS releases it if the
+    holder dies, letting another process take over.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class HostawaySync:
+    """
+    Polls Hostaway and upserts new or changed reviews into the store
+
+    A persisted high-water mark on (submittedAt, id) identifies brand-new
+    reviews without comparison; anything at or below it is only written when
+    its upstream content differs from the stored row. Most polls are
+    incremental: pages are requested newest first and paging stops after
+    a page holding nothing above the mark. Every `full_every`-th poll (and
+    the first) reads everything, picking up edits to older reviews. Changes
+    are applied in batches through `ReviewStore.upsert`, which updates
+    indexes and the affected properties' aggregates only. Upstream failures
+    are recorded and the current data is kept; nothing falls back to mock
+    data.
+
+    Only the worker holding `lock` polls; with ``REVIEW_SNAPSHOT_PATH``
+    set it publishes a snapshot after each change for the others to load.
+    """
+
+    def __init__(
+        self,
+        store: ReviewStore,
+        client: HostawayClient,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        state_path: Optional[Path] = None,
+        full_every: Optional[int] = None,
+        lock: Optional[LeaderLock] = None,
+    ):
+        self.store = store
+        self.client = client
+        self.interval = interval or settings.HOSTAWAY_SYNC_INTERVAL
+        self.batch_size = batch_size or settings.HOSTAWAY_SYNC_BATCH_SIZE
+        self.state_path = Path(state_path or settings.HOSTAWAY_SYNC_STATE_PATH or DEFAULT_STATE_PATH)
+        self.full_every = full_every if full_every is not None else settings.HOSTAWAY_SYNC_FULL_EVERY
+        self.lock = lock or LeaderLock(Path(settings.HOSTAWAY_SYNC_LOCK_PATH or DEFAULT_LOCK_PATH))
+        self.high_water_mark: Optional[tuple[datetime, str]] = self._load_state()
+
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.last_started_at: Optional[datetime] = None
+        self.last_success_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_seen = 0
+        self.last_full = False
+        self.last_pages = 0
+        self.last_batches: list[int] = []
+        self.last_properties: list[str] = []
+
+    # -------------------------
+    # State
+    # -------------------------
+
+    def _load_state(self) -> Optional[tuple[datetime, str]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return parse_timestamp(data["submitted_at"]), str(data["id"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_state(self) -> None:
+        if self.high_water_mark is None:
+            return
+        submitted_at, review_id = self.high_water_mark
+        tmp = self.state_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"submitted_at": submitted_at.isoformat(), "id": review_id}, f)
+        tmp.replace(self.state_path)
+
+    # -------------------------
+    # Sync
+    # -------------------------
+
+    def _changed(self, item: dict) -> Optional[dict]:
+        """The item to upsert (with local fields kept), or None if unchanged"""
+        existing = self.store.get_row(str(item.get("id", "")))
+        if existing is None:
+            return item
+        merged = {**item, **{k: existing[k] for k in LOCAL_FIELDS if k in existing}}
+        return None if merged == existing else merged
+
+    def _wants_full(self) -> bool:
+        if self.high_water_mark is None:
+            return True
+        if self.full_every <= 0:
+            return self.runs == 1
+        return (self.runs - 1) % self.full_every == 0
+
+    async def run_once(self, full: Optional[bool] = None) -> dict[str, Any]:
+        """Pull from Hostaway once (incrementally unless `full`) and apply the changes"""
+        started = time.perf_counter()
+        self.runs += 1
+        self.last_started_at = datetime.now(timezone.utc)
+        mark = self.high_water_mark
+        full = self._wants_full() if full is None else full or mark is None
+        seen = 0
+        pages = 0
+        batch: list[dict] = []
+        batches: list[int] = []
+        properties: set[str] = set()
+        newest = mark
+
+        async def flush() -> None:
+            if batch:
+                # A bulk upsert re-sorts the indexes; off the event loop, requests keep being served
+                await asyncio.to_thread(self.store.upsert, list(batch))
+                batches.append(len(batch))
+                batch.clear()
+
+        source = self.client.iter_review_pages() if full else self.client.iter_review_pages_newest_first()
+        # Stopping early is only safe while upstream really is sorted newest first
+        ordered = True
+        previous: Optional[tuple[datetime, str]] = None
+        try:
+            async with aclosing(source) as page_iter:
+                async for page in page_iter:
+                    pages += 1
+                    page_is_new = False
+                    for item in page:
+                        seen += 1
+                        key = _mark(item)
+                        if previous is not None and key > previous:
+                            ordered = False
+                        previous = key
+                        if newest is None or key > newest:
+                            newest = key
+                        is_new = mark is None or key > mark
+                        page_is_new = page_is_new or is_new
+                        upsert = item if is_new and self.store.get_row(key[1]) is None else self._changed(item)
+                        if upsert is None:
+                            continue
+                        batch.append(upsert)
+                        properties.add(resolve_property_id(upsert))
+                        if len(batch) >= self.batch_size:
+                            await flush()
+                    if not full and ordered and not page_is_new:
+                        # Everything further down was seen by an earlier poll
+                        break
+            await flush()
+        except HostawayError as e:
+            await flush()
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+        finally:
+            self.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.last_seen = seen
+            self.last_full = full
+            self.last_pages = pages
+            self.last_batches = batches
+            self.last_properties = sorted(properties)
+
+        if batches and settings.REVIEW_SNAPSHOT_PATH:
+            # Decisions another worker made since this one last refreshed must not be published away
+            await restore_moderation(self.store)
+            # Other workers pick the new snapshot up on their next refresh
+            await asyncio.to_thread(self.store.publish_snapshot, Path(settings.REVIEW_SNAPSHOT_PATH))
+        self.high_water_mark = newest
+        self._save_state()
+        self.last_success_at = datetime.now(timezone.utc)
+        self.last_error = None
+        return self.status()
+
+    async def run_forever(self) -> None:
+        while True:
+            # A worker that lost the race keeps checking, taking over if the leader exits
+            if not self.lock.acquire():
+                await asyncio.sleep(self.interval)
+                continue
+            try:
+                await self.run_once()
+            except HostawayError as e:
+                print(f"Hostaway sync failed: {e}")
+            except Exception as e:  # keep the worker alive on unexpected errors
+                self.failures += 1
+                self.last_error = repr(e)
+                print(f"Hostaway sync crashed: {e!r}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever(), name="hostaway-sync")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.lock.release()
+
+    def status(self) -> dict[str, Any]:
+        """Sync health for the /health endpoint"""
+        now = datetime.now(timezone.utc)
+        mark = self.high_water_mark
+        return {
+            "enabled": True,
+            "running": self._task is not None and not self._task.done(),
+            "leader": self.lock.held,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_success_at": self.last_success_at.isoformat() if self.last_success_at else None,
+            "lag_seconds": round((now - self.last_success_at).total_seconds(), 1) if self.last_success_at else None,
+            "last_duration_ms": self.last_duration_ms,
+            "last_full": self.last_full,
+            "last_pages": self.last_pages,
+            "last_seen": self.last_seen,
+            "last_batch_sizes": self.last_batches,
+            "last_affected_properties": self.last_properties,
+            "high_water_mark": {"submitted_at": mark[0].isoformat(), "id": mark[1]} if mark else None,
+            "last_error": self.last_error,
+        }
+
+
+_sync: Optional[HostawaySync] = None
+
+
+def get_hostaway_sync() -> HostawaySync:
+    global _sync
+    if _sync is None:
+        _sync = HostawaySync(get_review_store(), get_hostaway_client())
+    return _sync
+
+
+def sync_enabled() -> bool:
+    """The worker only runs against the live API"""
+    return settings.HOSTAWAY_SYNC_ENABLED and not settings.HOSTAWAY_USE_MOCK and bool(settings.HOSTAWAY_API_KEY)
@@ -1,12 +1,248 @@
 """Query filtering utilities"""
-from typing import List, Optional
-from datetime import datetime
+import base64
+import heapq
+import json
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from typing import Any, Callable, Iterable, List, Optional, Union
+from datetime import datetime, timezone
+from operator import attrgetter, itemgetter
+from app.core.normalizers.hostaway import parse_timestamp
+from app.core.store.reviews import SORT_KEYS, ReviewStore
 from app.models.review import Review
 from app.models.enums import ReviewStatus, ReviewSource
 
+Check = Callable[[Any], bool]
+
+
+def _label(value: Any) -> str:
+    return getattr(value, "value", value)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes as UTC so they compare with stored dates"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# Predicate factories: each binds its own getter/value so fused checks
+# never share closure variables.
+
+def _equals(get: Callable[[Any], Any], value: Any) -> Check:
+    return lambda r: get(r) == value
+
+
+def _at_least(get: Callable[[Any], Any], low: float) -> Check:
+    return lambda r: (get(r) or 0) >= low
+
+
+def _at_most(get: Callable[[Any], Any], high: float) -> Check:
+    return lambda r: (get(r) or 0) <= high
+
+
+def _date_between(get: Callable[[Any], Any], start: Optional[datetime], end: Optional[datetime]) -> Check:
+    if start and end:
+        return lambda r: start <= _as_utc(get(r)) <= end
+    if start:
+        return lambda r: _as_utc(get(r)) >= start
+    return lambda r: _as_utc(get(r)) <= end
+
+
+def _member(get: Callable[[Any], Any], ids: set) -> Check:
+    return lambda r: get(r) in ids
+
+
+def _contains(name: Callable[[Any], Any], comment: Callable[[Any], Any], term: str) -> Check:
+    return lambda r: term in (name(r) or "").lower() or term in (comment(r) or "").lower()
+
+
+class QueryPlan:
+    """
+    Execution plan for a set of review filters
+
+    The planner estimates how many rows each indexed predicate would yield
+    and reads candidates through the smallest one: an exact hash index
+    (property, status, source), the full-text index, the rating buckets
+    covering the requested range, or a bisected slice of the date-sorted
+    index. Every remaining
+    predicate is then evaluated in a single fused pass over those candidates,
+    cheapest and most selective first, without building intermediate lists.
+
+    Without a store (plain list input) the access path is a full scan and
+    search falls back to a substring check.
+    """
+
+    def __init__(
+        self,
+        source_rows: Union[ReviewStore, Iterable[Any]],
+        status: Optional[ReviewStatus] = None,
+        source: Optional[ReviewSource] = None,
+        property_id: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        search: Optional[str] = None,
+    ):
+        self.status = status
+        self.source = source
+        self.property_id = property_id
+        self.min_rating = min_rating
+        self.max_rating = max_rating
+        self.start_date = _as_utc(start_date)
+        self.end_date = _as_utc(end_date)
+        self.search = search.lower() if search else None
+        self._search_ids: set[str] = set()
+
+        if isinstance(source_rows, ReviewStore):
+            self.store: Optional[ReviewStore] = source_rows
+            self.rows: Optional[list] = None
+            self.total = len(source_rows)
+        else:
+            self.store = None
+            self.rows = list(source_rows)
+            self.total = len(self.rows)
+
+        self.access_kind, self.access, self.estimate, self._candidates = self._choose_access_path()
+        self.checks = self._residual_checks()
+
+    # -------------------------
+    # Planning
+    # -------------------------
+
+    def _choose_access_path(self) -> tuple[str, str, int, Callable[[], Iterable[Any]]]:
+        """Pick (kind, description, estimated rows, candidate producer)"""
+        if self.store is None:
+            return "scan", "full scan", self.total, lambda: self.rows
+
+        store = self.store
+        paths = [("scan", "full scan", self.total, store.records)]
+        if self.property_id:
+            ids = store.ids_for_property(self.property_id)
+            paths.append(("property", f"property index [{self.property_id}]", len(ids),
+                          lambda: store.records_for(ids)))
+        if self.status:
+            ids = store.ids_for_status(self.status)
+            paths.append(("status", f"status index [{_label(self.status)}]", len(ids),
+                          lambda: store.records_for(ids)))
+        if self.source:
+            ids = store.ids_for_source(self.source)
+            paths.append(("source", f"source index [{_label(self.source)}]", len(ids),
+                          lambda: store.records_for(ids)))
+        if self.start_date or self.end_date:
+            start, end = self.start_date, self.end_date
+            paths.append(("date", f"date index range [{start or '-inf'} .. {end or '+inf'}]",
+                          store.count_by_date(start, end),
+                          lambda: store.records_for(store.ids_by_date(start, end))))
+        if self.search:
+            ids = self._search_ids = store.search_ids(self.search)
+            paths.append(("search", f"search index [{self.search}]", len(ids),
+                          lambda: store.records_for(ids)))
+        if self.min_rating is not None or self.max_rating is not None:
+            # Bucketing is monotonic, so these buckets cover every match
+            low = round(self.min_rating) if self.min_rating is not None else 0
+            high = round(self.max_rating) if self.max_rating is not None else 10
+            buckets = [b for b in range(low, high + 1) if store.ids_for_rating(b)]
+            paths.append(("rating", f"rating buckets {buckets}",
+                          sum(len(store.ids_for_rating(b)) for b in buckets),
+                          lambda: (r for b in buckets for r in store.records_for(store.ids_for_rating(b)))))
+        return min(paths, key=lambda path: path[2])
+
+    def _residual_checks(self) -> list[tuple[str, int, Check]]:
+        """Predicates not already guaranteed by the access path, in evaluation order"""
+        store = self.store
+        indexed = store is not None
+        dicts = indexed or bool(self.rows and isinstance(self.rows[0], Mapping))
+        field = itemgetter if dicts else attrgetter
+        checks: list[tuple[str, int, Check]] = []
+
+        if self.property_id and self.access_kind != "property":
+            get, value = field("property_id"), self.property_id
+            size = len(store.ids_for_property(value)) if indexed else self.total
+            checks.append((f"property_id == {value!r}", size, _equals(get, value)))
+        if self.status and self.access_kind != "status":
+            get, value = field("status"), self.status
+            size = len(store.ids_for_status(value)) if indexed else self.total
+            checks.append((f"status == {_label(value)!r}", size, _equals(get, value)))
+        if self.source and self.access_kind != "source":
+            get, value = field("source"), self.source
+            size = len(store.ids_for_source(value)) if indexed else self.total
+            checks.append((f"source == {_label(value)!r}", size, _equals(get, value)))
+        if (self.start_date or self.end_date) and self.access_kind != "date":
+            get, start, end = field("date"), self.start_date, self.end_date
+            size = store.count_by_date(start, end) if indexed else self.total
+            name = f"{start or '-inf'} <= date <= {end or '+inf'}"
+            checks.append((name, size, _date_between(get, start, end)))
+        # Rating buckets are rounded, so exact bounds are always re-checked
+        if self.min_rating is not None:
+            get, low = field("rating"), self.min_rating
+            checks.append((f"rating >= {low}", self.total, _at_least(get, low)))
+        if self.max_rating is not None:
+            get, high = field("rating"), self.max_rating
+            checks.append((f"rating <= {high}", self.total, _at_most(get, high)))
+
+        if self.search and indexed and self.access_kind != "search":
+            size = len(self._search_ids)
+            name = f"id in search index [{self.search}]"
+            checks.append((name, size, _member(field("id"), self._search_ids)))
+
+        checks.sort(key=lambda check: check[1])
+
+        # Without an index, substring search is the most expensive predicate and runs last
+        if self.search and not indexed:
+            checks.append((
+                f"search {self.search!r} in guest_name/comment",
+                self.total,
+                _contains(field("guest_name"), field("comment"), self.search),
+            ))
+        return checks
+
+    # -------------------------
+    # Execution
+    # -------------------------
+
+    def execute(self) -> list:
+        """
+        Run the plan and return matching rows
+
+        Full-text matches from the store come back by relevance; otherwise
+        the order follows the access path.
+        """
+        matched = self._run()
+        if self.search and self.store is not None and len(matched) > 1:
+            scores = self.store.search_scores(self.search, (r["id"] for r in matched))
+            matched.sort(key=lambda r: scores.get(r["id"], 0.0), reverse=True)
+        return matched
+
+    def _run(self) -> list:
+        candidates = self._candidates()
+        tests = [test for _, _, test in self.checks]
+        if not tests:
+            return list(candidates)
+        if len(tests) == 1:
+            only = tests[0]
+            return [r for r in candidates if only(r)]
+
+        def matches(r) -> bool:
+            for test in tests:
+                if not test(r):
+                    return False
+            return True
+
+        return [r for r in candidates if matches(r)]
+
+    def explain(self) -> str:
+        """Human-readable description of the chosen plan"""
+        lines = [f"access: {self.access} (~{self.estimate} of {self.total} rows)"]
+        if self.checks:
+            lines.append("filter (fused, in order):")
+            lines.extend(f"  {name} (~{size} rows)" for name, size, _ in self.checks)
+        return "\n".join(lines)
+
 
 def filter_reviews(
-    reviews: List[Review],
+    reviews: Union[ReviewStore, List[Review]],
     status: Optional[ReviewStatus] = None,
     source: Optional[ReviewSource] = None,
     property_id: Optional[str] = None,
@@ -18,9 +254,9 @@ def filter_reviews(
 ) -> List[Review]:
     """
     Filter reviews based on multiple criteria
-    
+
     Args:
-        reviews: List of reviews to filter
+        reviews: Review store (index-assisted) or list of reviews to filter
         status: Filter by approval status
         source: Filter by review source
         property_id: Filter by property ID
@@ -29,66 +265,168 @@ def filter_reviews(
         start_date: Start date for review range
         end_date: End date for review range
         search: Search term for guest name or review text
-        
+
     Returns:
-        Filtered list of reviews
+        Filtered list of reviews (store records when given a store)
     """
-    filtered = reviews
-    
-    if status:
-        filtered = [r for r in filtered if r.status == status]
-    
-    if source:
-        filtered = [r for r in filtered if r.source == source]
-    
-    if property_id:
-        filtered = [r for r in filtered if r.property_id == property_id]
-    
-    if min_rating is not None:
-        filtered = [r for r in filtered if r.rating >= min_rating]
-    
-    if max_rating is not None:
-        filtered = [r for r in filtered if r.rating <= max_rating]
-    
-    if start_date:
-        filtered = [r for r in filtered if r.date >= start_date]
-    
-    if end_date:
-        filtered = [r for r in filtered if r.date <= end_date]
-    
-    if search:
-        search_lower = search.lower()
-        filtered = [
-            r for r in filtered
-            if search_lower in r.guest_name.lower() or search_lower in r.text.lower()
-        ]
-    
-    return filtered
+    return QueryPlan(
+        reviews,
+        status=status,
+        source=source,
+        property_id=property_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        start_date=start_date,
+        end_date=end_date,
+        search=search,
+    ).execute()
+
+
+def _sort_key(sort_by: str, dicts: bool) -> Optional[Callable[[Any], Any]]:
+    if sort_by not in SORT_KEYS:
+        return None
+    if dicts:
+        return SORT_KEYS[sort_by]
+    if sort_by == "guest_name":
+        return lambda r: r.guest_name.lower()
+    if sort_by == "property":
+        return lambda r: r.property_name.lower()
+    return attrgetter(sort_by)
 
 
 def sort_reviews(
     reviews: List[Review],
     sort_by: str = "date",
-    descending: bool = True
+    descending: bool = True,
+    limit: Optional[int] = None
 ) -> List[Review]:
     """
     Sort reviews by specified field
-    
+
     Args:
-        reviews: List of reviews to sort
-        sort_by: Field to sort by (date, rating, guest_name)
+        reviews: List of reviews (or store records) to sort
+        sort_by: Field to sort by (date, rating, guest_name, property)
         descending: Sort in descending order
-        
+        limit: Only return the first `limit` reviews, selected with a
+            bounded heap in O(n log k) instead of a full sort
+
     Returns:
         Sorted list of reviews
     """
-    reverse = descending
-    
+    key = _sort_key(sort_by, bool(reviews) and isinstance(reviews[0], Mapping))
+    if key is None:
+        return reviews if limit is None else reviews[:limit]
+
+    if limit is not None and limit < len(reviews):
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return select(limit, reviews, key=key)
+    return sorted(reviews, key=key, reverse=descending)
+
+
+# -------------------------
+# Keyset pagination
+# -------------------------
+
+def encode_cursor(sort_by: str, descending: bool, key: Any, review_id: str) -> str:
+    """Opaque cursor pointing just past (key, review_id) in a sort order"""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    payload = json.dumps([sort_by, descending, key, review_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> tuple[Any, str]:
+    """
+    Decode a cursor issued for the same sort
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_desc, key, review_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if cursor_sort != sort_by or cursor_desc != descending:
+        raise ValueError("Cursor was issued for a different sort order")
     if sort_by == "date":
-        return sorted(reviews, key=lambda r: r.date, reverse=reverse)
+        key = parse_timestamp(key)
     elif sort_by == "rating":
-        return sorted(reviews, key=lambda r: r.rating, reverse=reverse)
-    elif sort_by == "guest_name":
-        return sorted(reviews, key=lambda r: r.guest_name.lower(), reverse=reverse)
-    
-    return reviews
+        key = float(key)
+    return key, str(review_id)
+
+
+def _walk_order(
+    order: list[tuple[Any, str]],
+    after: Optional[tuple[Any, str]],
+    descending: bool,
+    count: int,
+    accept: Optional[set[str]] = None,
+) -> list[str]:
+    """Read up to `count` ids from a sorted (key, id) order, resuming after `after`"""
+    if descending:
+        pos = (bisect_left(order, after) if after else len(order)) - 1
+        step = -1
+    else:
+        pos = bisect_right(order, after) if after else 0
+        step = 1
+    ids: list[str] = []
+    while 0 <= pos < len(order) and len(ids) < count:
+        review_id = order[pos][1]
+        if accept is None or review_id in accept:
+            ids.append(review_id)
+        pos += step
+    return ids
+
+
+def paginate_reviews(
+    store: ReviewStore,
+    matches: Optional[List[dict]] = None,
+    sort_by: str = "date",
+    descending: bool = True,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> tuple[List[dict], Optional[str]]:
+    """
+    Return one page of store records and the cursor for the next page
+
+    Pages are keyed on (sort value, id). Over the whole store a page is a
+    bisect into the precomputed sort order plus `limit` steps. For a filtered
+    set of `m` matches, walking that order would visit about
+    `limit * n / m` entries, so when that exceeds `m` the page is instead
+    selected from the matches with a bounded heap (O(m log k)).
+
+    Raises:
+        ValueError: If `sort_by` is unknown or the cursor is invalid
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Cannot paginate by {sort_by!r}")
+    key_of = SORT_KEYS[sort_by]
+    after = decode_cursor(cursor, sort_by, descending) if cursor else None
+    order = store.sort_order(sort_by)
+    want = limit + 1    # one extra row tells us whether another page exists
+
+    if matches is None:
+        page = store.records_for(_walk_order(order, after, descending, want))
+    elif matches and want * len(store) / len(matches) <= len(matches):
+        accept = {r["id"] for r in matches}
+        page = store.records_for(_walk_order(order, after, descending, want, accept))
+    else:
+        def entry(r: dict) -> tuple[Any, str]:
+            return (key_of(r), r["id"])
+
+        candidates: Iterable[dict] = matches
+        if after is not None:
+            if descending:
+                candidates = (r for r in matches if entry(r) < after)
+            else:
+                candidates = (r for r in matches if entry(r) > after)
+        select = heapq.nlargest if descending else heapq.nsmallest
+        page = select(want, candidates, key=entry)
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last = page[-1]
+        next_cursor = encode_cursor(sort_by, descending, key_of(last), last["id"])
+    return page, next_cursor
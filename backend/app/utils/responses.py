@@ -0,0 +1,86 @@
+"""Fast serialization for large review listings"""
+from typing import Any, Iterable, Iterator, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.metrics.registry import span
+from app.models.enums import ResponseFormat
+
+# Aware datetimes as "...Z", matching Pydantic's output for UTC values
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Rows encoded per orjson call (and per chunk) when streaming
+STREAM_CHUNK_ROWS = 500
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson, skipping `jsonable_encoder`"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_json_array(items: Iterable[Any], head: bytes = b"[", tail: bytes = b"]") -> Iterator[bytes]:
+    """Encode a JSON array chunk by chunk, wrapped in `head` and `tail`"""
+    yield head
+    first = True
+    for chunk in _chunks(items, STREAM_CHUNK_ROWS):
+        body = dumps(chunk)[1:-1]
+        yield body if first else b"," + body
+        first = False
+    yield tail
+
+
+def iter_ndjson(items: Iterable[Any]) -> Iterator[bytes]:
+    """Encode one JSON document per line, chunk by chunk"""
+    for chunk in _chunks(items, STREAM_CHUNK_ROWS):
+        yield b"\n".join(map(dumps, chunk)) + b"\n"
+
+
+def listing_response(
+    items: Iterable[Any],
+    response_format: ResponseFormat,
+    envelope: Optional[dict] = None,
+    key: str = "result",
+) -> Any:
+    """
+    Serialize a review listing in the requested format
+
+    With an `envelope`, JSON formats nest the items under `key` inside it
+    (after the envelope's other fields); NDJSON always sends bare items and
+    moves a `next_cursor` from the envelope into an ``X-Next-Cursor`` header.
+    """
+    if response_format is ResponseFormat.NDJSON:
+        headers = {}
+        if envelope and envelope.get("next_cursor"):
+            headers["X-Next-Cursor"] = envelope["next_cursor"]
+        return StreamingResponse(iter_ndjson(items), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    if response_format is ResponseFormat.JSON_STREAM:
+        if envelope is None:
+            return StreamingResponse(iter_json_array(items), media_type="application/json")
+        head = dumps(envelope)[:-1] + (b"," if envelope else b"") + dumps(key) + b":["
+        return StreamingResponse(iter_json_array(items, head, b"]}"), media_type="application/json")
+
+    # Rows are built lazily, so this also covers materializing them
+    with span("serialize"):
+        items = items if isinstance(items, list) else list(items)
+        return FastJSONResponse({**envelope, key: items} if envelope is not None else items)
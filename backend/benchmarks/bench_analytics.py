@@ -0,0 +1,69 @@
+"""
+Benchmark the columnar analytics engine against the old multi-pass version
+
+Run from the backend directory:
+    python -m benchmarks.bench_analytics
+"""
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from app.core.aggregators.analytics import ReviewColumns, aggregate_reviews
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SOURCES = ["airbnb", "booking", "google", "hostaway", "manual"]
+
+
+def make_records(n: int) -> list[dict]:
+    rng = random.Random(42)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": str(i),
+            "property_id": f"property-{rng.randrange(200)}",
+            "rating": rng.randint(1, 5),
+            "source": rng.choice(SOURCES),
+            "date": start + timedelta(minutes=rng.randrange(2_000_000)),
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_analytics(reviews: list[dict]) -> dict:
+    """The five-pass implementation previously inlined in the endpoint"""
+    total = len(reviews)
+    rating_counts = Counter(r.get("rating", 0) for r in reviews)
+    source_counts = Counter(r.get("source", "unknown") for r in reviews)
+    positive = sum(1 for r in reviews if (r.get("rating") or 0) >= 4)
+    neutral = sum(1 for r in reviews if (r.get("rating") or 0) == 3)
+    negative = sum(1 for r in reviews if (r.get("rating") or 0) <= 2)
+    return {
+        "ratings": {k: round(v / total * 100, 1) for k, v in rating_counts.items()},
+        "sources": dict(source_counts),
+        "sentiment": (positive, neutral, negative),
+    }
+
+
+def timed(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    print(f"{'reviews':>10} {'legacy ms':>12} {'build ms':>10} {'engine ms':>11} {'speedup':>9}")
+    for n in SIZES:
+        records = make_records(n)
+        columns = ReviewColumns.from_records(records)
+        legacy = timed(legacy_analytics, records)
+        build = timed(ReviewColumns.from_records, records, repeat=1)
+        engine = timed(aggregate_reviews, columns)
+        print(f"{n:>10,} {legacy:>12.2f} {build:>10.2f} {engine:>11.2f} {legacy / engine:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure memory per review: dict rows and records against the columnar table
+
+Run from the backend directory:
+    python -m benchmarks.bench_memory
+"""
+import gc
+import json
+import tracemalloc
+
+from app.core.normalizers.hostaway import normalize_source, parse_timestamp, to_review_record
+from app.core.store.table import ReviewTable
+from benchmarks.bench_normalizer import make_items
+
+SIZES = [10_000, 100_000]
+
+
+def as_dicts(lines: list[str]) -> tuple[dict, dict]:
+    """The previous layout: a raw row dict and a record dict per review"""
+    rows, records = {}, {}
+    for line in lines:
+        row = json.loads(line)
+        row["source"] = normalize_source(row.get("channel") or "")
+        record = to_review_record(row)
+        rows[record["id"]] = row
+        records[record["id"]] = record
+    return rows, records
+
+
+def as_table(lines: list[str]) -> ReviewTable:
+    table = ReviewTable()
+    for line in lines:
+        row = json.loads(line)
+        row["source"] = normalize_source(row.get("channel") or "")
+        record = to_review_record(row)
+        table.put(row, record["property_id"], record["date"])
+    return table
+
+
+def measured(build, lines: list[str]) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(lines)
+    # The bounded timestamp cache is shared process state, not part of either layout
+    parse_timestamp.cache_clear()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, result
+
+
+def main() -> None:
+    print(f"{'reviews':>10} {'dict B/review':>14} {'table B/review':>15} {'ratio':>7}")
+    for n in SIZES:
+        # Parsed from NDJSON, so every review owns its strings as after a load
+        lines = [json.dumps(item) for item in make_items(n)]
+        dict_bytes, _ = measured(as_dicts, lines)
+        table_bytes, table = measured(as_table, lines)
+        assert len(table) == n
+        print(f"{n:>10} {dict_bytes / n:>14.0f} {table_bytes / n:>15.0f} {dict_bytes / table_bytes:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
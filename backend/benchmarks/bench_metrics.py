@@ -0,0 +1,61 @@
+"""
+Benchmark the per-request overhead of the metrics middleware
+
+Run from the backend directory:
+    python -m benchmarks.bench_metrics
+"""
+import asyncio
+import time
+
+from app.core.metrics.registry import RequestMetrics, span
+from app.middleware.metrics import MetricsMiddleware
+
+REQUESTS = 200_000
+BODY = b'{"status":"success"}'
+
+
+async def endpoint(scope, receive, send) -> None:
+    # What the router leaves in the scope for a matched route
+    scope["endpoint"] = endpoint
+    scope["path_params"] = {"property_id": "shoreditch-heights"}
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": BODY})
+
+
+async def endpoint_with_span(scope, receive, send) -> None:
+    with span("aggregate"):
+        await endpoint(scope, receive, send)
+
+
+async def run(app, n: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    headers = [(b"host", b"testserver"), (b"content-length", b"0")]
+    start = time.perf_counter()
+    for _ in range(n):
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/properties/shoreditch-heights/stats",
+            "headers": headers,
+        }
+        await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    bare = asyncio.run(run(endpoint, REQUESTS))
+    timed = asyncio.run(run(MetricsMiddleware(endpoint, RequestMetrics()), REQUESTS))
+    spanned = asyncio.run(run(MetricsMiddleware(endpoint_with_span, RequestMetrics()), REQUESTS))
+    print(f"{REQUESTS:,} requests")
+    print(f"{'':>22} {'us/request':>11} {'overhead us':>12}")
+    for label, seconds in (("bare", bare), ("middleware", timed), ("middleware + span", spanned)):
+        print(f"{label:>22} {seconds / REQUESTS * 1e6:>11.2f} {(seconds - bare) / REQUESTS * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
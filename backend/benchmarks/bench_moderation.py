@@ -0,0 +1,46 @@
+"""
+Benchmark bulk moderation against one status update per review
+
+Run from the backend directory:
+    python -m benchmarks.bench_moderation
+"""
+import time
+
+from app.core.cache.backends import MemoryBackend
+from app.core.cache.results import ResultCache
+from app.core.store.reviews import ReviewStore
+from benchmarks.bench_normalizer import make_items
+
+STORE_SIZE = 100_000
+BATCH_SIZES = [10, 100, 1_000, 10_000]
+
+
+def main() -> None:
+    store = ReviewStore()
+    store.replace_all(make_items(STORE_SIZE))
+    # Every write invalidates cached analytics, as in the app
+    ResultCache(store, MemoryBackend(1024), ttl=300.0)
+    ids = [str(i) for i in range(STORE_SIZE)]
+
+    print(f"{STORE_SIZE:,} reviews")
+    print(f"{'batch':>8} {'single ms':>11} {'bulk ms':>9} {'us/review':>10} {'+response ms':>13}")
+    for n in BATCH_SIZES:
+        batch = ids[:n]
+        t0 = time.perf_counter()
+        for review_id in batch:
+            store.set_status(review_id, "pending")
+        single = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        store.moderate(batch, "approved")
+        bulk = time.perf_counter() - t0
+
+        # Attaching a response rewrites each row, so it costs more per review
+        t0 = time.perf_counter()
+        store.moderate(batch, "rejected", f"Thank you for your feedback ({n})")
+        respond = time.perf_counter() - t0
+        print(f"{n:>8,} {single * 1000:>11.2f} {bulk * 1000:>9.2f} {bulk / n * 1e6:>10.2f} {respond * 1000:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark batch Hostaway normalization against per-item normalization
+
+Run from the backend directory:
+    python -m benchmarks.bench_normalizer
+"""
+import gc
+import random
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.normalizers.hostaway import HostawayNormalizer, resolve_property_id
+from app.data.properties import LISTING_TO_PROPERTY
+from app.models.review import Review
+
+SIZES = [1_000, 10_000, 100_000]
+CHANNELS = ["Airbnb", "Booking.com", "Google", "Hostaway", "airbnbOfficial"]
+
+
+def make_items(n: int) -> list[dict]:
+    rng = random.Random(42)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    listings = list(LISTING_TO_PROPERTY)
+    return [
+        {
+            "id": i,
+            "type": "guest-to-host",
+            "status": "published",
+            "rating": rng.randint(1, 5),
+            "publicReview": "Lovely stay, would come back",
+            "reviewCategory": [{"category": "cleanliness", "rating": rng.randint(1, 10)}],
+            # Whole seconds, so timestamps repeat the way real exports do
+            "submittedAt": (start + timedelta(seconds=rng.randrange(50_000_000))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "guestName": f"Guest {i}",
+            "listingName": rng.choice(listings),
+            "channel": rng.choice(CHANNELS),
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_source(raw: str) -> str:
+    """The regex classification previously run for every item"""
+    s_clean = re.sub(r"[^a-z0-9]+", "", str(raw).lower())
+    for name in ("airbnb", "booking", "google"):
+        if name in s_clean:
+            return name
+    return "hostaway"
+
+
+def per_item(items: list[dict]) -> list[Review]:
+    """One dict and one model validation per review"""
+    reviews = []
+    for item in items:
+        date = datetime.fromisoformat(item["submittedAt"].replace("Z", "+00:00"))
+        reviews.append(Review(
+            id=str(item["id"]),
+            property_id=resolve_property_id(item),
+            property_name=item["listingName"],
+            guest_name=item["guestName"],
+            comment=item.get("publicReview") or "",
+            rating=item["rating"],
+            date=date,
+            status="approved" if item["status"] == "published" else "pending",
+            source=legacy_source(item["channel"]),
+        ))
+    return reviews
+
+
+def timed(fn, *args, repeat: int = 3) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+        gc.enable()
+    return best * 1000, result
+
+
+def main() -> None:
+    print(f"{'reviews':>10} {'per-item ms':>12} {'batch ms':>10} {'speedup':>8}")
+    for n in SIZES:
+        items = make_items(n)
+        normalizer = HostawayNormalizer()
+        legacy_ms, legacy = timed(per_item, items)
+        batch_ms, batch = timed(normalizer.normalize_batch, items)
+        keys = ("id", "property_id", "rating", "date", "status", "source")
+        assert [r.model_dump(include=set(keys)) for r in legacy] == [r.model_dump(include=set(keys)) for r in batch]
+        print(f"{n:>10} {legacy_ms:>12.1f} {batch_ms:>10.1f} {legacy_ms / batch_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
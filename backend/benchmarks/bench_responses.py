@@ -0,0 +1,70 @@
+"""
+Benchmark review listing serialization: FastAPI's default path against orjson and streaming
+
+Run from the backend directory:
+    python -m benchmarks.bench_responses
+"""
+import json
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.normalizers.hostaway import review_payload
+from app.core.store.reviews import ReviewStore
+from app.models.review import Review
+from app.utils.responses import dumps, iter_json_array, iter_ndjson
+from benchmarks.bench_normalizer import make_items
+
+ROWS = 10_000
+REVIEWS = TypeAdapter(list[Review])
+
+
+def stdlib_json(content) -> bytes:
+    """What Starlette's JSONResponse does"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def first_chunk(chunks) -> float:
+    start = time.perf_counter()
+    next(chunks)
+    next(chunks)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    store = ReviewStore()
+    store.replace_all(make_items(ROWS))
+    records = store.records()
+    now = datetime.now()
+
+    print(f"GET /reviews/ ({ROWS} raw rows)")
+    default = timed(lambda: stdlib_json(jsonable_encoder({"status": "success", "result": store.rows()})))
+    fast = timed(lambda: dumps({"status": "success", "result": store.rows()}))
+    stream = timed(lambda: b"".join(iter_json_array(store.iter_rows())))
+    ndjson = timed(lambda: b"".join(iter_ndjson(store.iter_rows())))
+    ttfb = first_chunk(iter_json_array(store.iter_rows()))
+    print(f"  jsonable_encoder + json.dumps  {default:8.1f} ms")
+    print(f"  orjson                         {fast:8.1f} ms  ({default / fast:.1f}x)")
+    print(f"  chunked JSON array             {stream:8.1f} ms  first chunk after {ttfb:.1f} ms")
+    print(f"  NDJSON                         {ndjson:8.1f} ms")
+
+    print(f"GET /properties/{{id}}/reviews ({ROWS} records)")
+    validated = timed(lambda: stdlib_json(REVIEWS.dump_python(REVIEWS.validate_python(records), mode="json")))
+    direct = timed(lambda: dumps([review_payload(r, now) for r in records]))
+    print(f"  response_model validation      {validated:8.1f} ms")
+    print(f"  review_payload + orjson        {direct:8.1f} ms  ({validated / direct:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark full-text review search: inverted index vs linear substring scan
+
+Run from the backend directory:
+    python -m benchmarks.bench_search [n_reviews]
+"""
+import random
+import sys
+import time
+
+from app.core.store.search import SearchIndex
+
+WORDS = (
+    "amazing stay apartment spotless host responsive great location cozy space noise "
+    "night overall good experience average clean wifi unreliable lovely view kitchen "
+    "small bathroom dirty friendly checkin easy parking expensive quiet modern comfortable "
+    "bed shower towels station walk shops restaurants recommend again would definitely"
+).split()
+NAMES = "alice john maria chen omar sofia liam emma noah olivia lucas mia".split()
+QUERIES = ["clean", "wifi unreliable", '"host responsive"', "recommend", "alice spot", "w1234x", "zzz"]
+
+
+def make_corpus(n: int) -> list[tuple[str, str, str]]:
+    """Comments drawn from a Zipf-like vocabulary of real and filler words"""
+    rng = random.Random(7)
+    filler = [f"w{i}x" for i in range(20_000)]
+    vocab = WORDS + filler
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    corpus = []
+    for i in range(n):
+        words = rng.choices(vocab, weights, k=rng.randint(8, 30))
+        name = f"{rng.choice(NAMES).title()} {rng.choice(NAMES).title()}son"
+        corpus.append((str(i), name, " ".join(words)))
+    return corpus
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    corpus = make_corpus(n)
+
+    t0 = time.perf_counter()
+    index = SearchIndex()
+    for review_id, name, comment in corpus:
+        index.add(review_id, name, comment)
+    print(f"indexed {n:,} reviews in {time.perf_counter() - t0:.1f}s")
+
+    print(f"{'query':>24} {'hits':>8} {'index ms':>10} {'scan ms':>10}")
+    for query in QUERIES:
+        t0 = time.perf_counter()
+        hits = index.match_ids(query)
+        index_ms = (time.perf_counter() - t0) * 1000
+
+        term = query.strip('"').lower()
+        t0 = time.perf_counter()
+        [r for r in corpus if term in r[1].lower() or term in r[2].lower()]
+        scan_ms = (time.perf_counter() - t0) * 1000
+        print(f"{query:>24} {len(hits):>8,} {index_ms:>10.2f} {scan_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
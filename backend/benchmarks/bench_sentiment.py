@@ -0,0 +1,56 @@
+"""
+Benchmark sentiment scoring throughput: inline, across a process pool, and from the cache
+
+Run from the backend directory:
+    python -m benchmarks.bench_sentiment
+"""
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.sentiment.scorer import SentimentScorer
+
+SIZES = [1_000, 10_000, 100_000]
+PHRASES = [
+    "lovely stay", "the flat was spotless", "host was really helpful", "would not recommend",
+    "bed was uncomfortable", "great location", "a bit noisy at night", "check-in was smooth",
+    "the kitchen was dirty", "absolutely amazing views", "not as clean as the photos", "fine for a night",
+    "shower was broken", "very responsive host", "overpriced for what it is", "we loved the garden",
+]
+
+
+def make_texts(n: int) -> list[str]:
+    """Distinct review texts (a serial number keeps the cache from deduplicating them)"""
+    rng = random.Random(42)
+    return [
+        f"Stay {i}: " + ", but ".join(rng.sample(PHRASES, rng.randint(1, 4))) + rng.choice([".", "!", "!!"])
+        for i in range(n)
+    ]
+
+
+def timed(scorer: SentimentScorer, texts: list[str]) -> float:
+    t0 = time.perf_counter()
+    scorer.score(texts)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    workers = os.cpu_count() or 1
+    print(f"{workers} workers")
+    print(f"{'texts':>10} {'inline/s':>12} {'pool/s':>12} {'cached/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            texts = make_texts(n)
+            inline = SentimentScorer(Path(tmp) / f"inline-{n}.tsv", workers=1)
+            pooled = SentimentScorer(Path(tmp) / f"pool-{n}.tsv", workers=workers, pool_threshold=0)
+            inline_s = timed(inline, texts)
+            pool_s = timed(pooled, texts)
+            cached_s = timed(pooled, texts)
+            pooled.close()
+            print(f"{n:>10,} {n / inline_s:>12,.0f} {n / pool_s:>12,.0f} {n / cached_s:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
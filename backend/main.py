@@ -1,17 +1,56 @@
+from contextlib import asynccontextmanager
+
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config import settings
 from app.api.v1.router import api_router
+from app.core.metrics.registry import PROMETHEUS_CONTENT_TYPE, get_request_metrics
+from app.core.sentiment.scorer import close_sentiment_scorer
+from app.core.store.reviews import get_review_store
+from app.db.session import dispose_engine, init_db
+from app.services.google_places import close_google_places_client
+from app.services.hostaway import close_hostaway_client
+from app.services.moderation import ModerationWatcher
+from app.services.sync import get_hostaway_sync, sync_enabled
+from app.middleware.caching import ConditionalGetMiddleware
 from app.middleware.cors import setup_cors
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
 from app.middleware.error_handler import (
     http_error_handler,
     validation_error_handler,
     general_error_handler,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load and index reviews once, before the first request arrives
+    store = get_review_store()
+    # Moderation decisions live in the database; the export or snapshot may predate them,
+    # and other workers keep making more
+    await init_db()
+    watcher = ModerationWatcher(store)
+    await watcher.poll_once()
+    watcher.start()
+    # Hostaway is polled in the background (by one worker, see HostawaySync), so requests never wait on it
+    sync = get_hostaway_sync() if sync_enabled() else None
+    if sync is not None:
+        sync.start()
+    yield
+    if sync is not None:
+        await sync.stop()
+    await watcher.stop()
+    await close_hostaway_client()
+    await close_google_places_client()
+    close_sentiment_scorer()
+    await dispose_engine()
+
+
 app = FastAPI(
     title="Flex Living Reviews API",
     description="Backend API for managing property reviews, analytics, and integrations.",
@@ -19,6 +58,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
     docs_url=f"{settings.API_PREFIX}/docs",       # Swagger docs available under /api/v1/docs
     redoc_url=f"{settings.API_PREFIX}/redoc",     # Alternative docs at /api/v1/redoc
+    lifespan=lifespan,
 )
 
 origins = [
@@ -28,6 +68,14 @@ origins = [
 ]
 
 
+# Added first so CORS wraps it and 304s still carry CORS headers
+app.add_middleware(
+    ConditionalGetMiddleware,
+    version=lambda: get_review_store().version,
+    policies=settings.HTTP_CACHE_CONTROL,
+    prefix=settings.API_PREFIX,
+)
+
 setup_cors(app)
 
 app.add_middleware(
@@ -38,6 +86,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.ADMIN_TOKEN or settings.PROFILER_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        admin_token=settings.ADMIN_TOKEN,
+        sample_rate=settings.PROFILER_SAMPLE_RATE,
+        interval=settings.PROFILER_INTERVAL,
+    )
+
+# Added last so it wraps the other middleware and also times 304s and CORS preflights
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # ✅ Register custom error handlers
 app.add_exception_handler(StarletteHTTPException, http_error_handler)
 app.add_exception_handler(RequestValidationError, validation_error_handler)
@@ -64,4 +124,15 @@ async def root():
 @app.get("/health", tags=["system"])
 async def health_check():
     """Health check endpoint for monitoring"""
-    return {"status": "healthy"}
+    store = get_review_store()
+    return {
+        "status": "healthy",
+        "reviews": len(store),
+        "sync": get_hostaway_sync().status() if sync_enabled() else {"enabled": False},
+    }
+
+
+@app.get("/metrics", tags=["system"], include_in_schema=False)
+async def metrics():
+    """Request metrics in the Prometheus text format"""
+    return PlainTextResponse(get_request_metrics().render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,24 @@
+"""Shared fixtures"""
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.db.session import create_engine, init_db
+
+# The app's own engine (created on startup) never touches a database file
+settings.DATABASE_URL = "sqlite+aiosqlite://"
+
+
+@pytest.fixture
+async def engine():
+    """A fresh in-memory SQLite database with every table created"""
+    engine = create_engine("sqlite+aiosqlite://")
+    await init_db(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
@@ -0,0 +1,103 @@
+"""The bounded change log behind delta sync, and the /reviews/changes endpoint"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.store.changes import ChangeLog
+from app.core.store.reviews import DEFAULT_DATA_PATH, ReviewStore, get_review_store
+from main import app
+
+
+def test_log_trims_in_halves_and_raises_the_floor():
+    log = ChangeLog(capacity=4)
+    for change in range(1, 5):
+        log.record(change, [f"r{change}"])
+    assert (len(log), log.floor) == (4, 0)
+
+    log.record(5, ["r5"])
+
+    # Down to half the capacity; the newest entries survive
+    assert (len(log), log.floor) == (2, 3)
+    assert log.since(3) == {"r4": False, "r5": False}
+    assert log.since(4) == {"r5": False}
+    assert log.since(2) is None
+
+
+def test_log_reports_the_last_write_of_each_id():
+    log = ChangeLog(capacity=100)
+    log.record(1, ["a", "b"])
+    log.record(2, ["a"], deleted=True)
+    log.record(3, ["c"])
+
+    assert log.since(0) == {"a": True, "b": False, "c": False}
+    assert log.since(1) == {"a": True, "c": False}
+    assert log.since(3) == {}
+
+
+@pytest.fixture
+def store():
+    store = ReviewStore()
+    store.load_file(DEFAULT_DATA_PATH)
+    return store
+
+
+def test_changes_since_lists_writes_and_deletes(store):
+    items = json.loads(DEFAULT_DATA_PATH.read_text())
+    version = store.version
+    kept, gone = store.table().keys[:2]
+
+    store.upsert([{**items[0], "id": 7001}])
+    store.moderate([kept], "rejected")
+    store.remove(gone)
+
+    written, deleted = store.changes_since(version)
+    assert [record["id"] for record in written] == ["7001", kept]
+    assert deleted == [gone]
+    assert store.changes_since(store.version) == ([], [])
+
+
+def test_changes_past_the_floor_or_from_another_load_need_a_resync(store, tmp_path):
+    version = store.version
+    export = tmp_path / "other.json"
+    export.write_bytes(DEFAULT_DATA_PATH.read_bytes())
+    other = ReviewStore()
+    other.load_file(export)
+    assert other.generation != store.generation
+    assert store.changes_since(f"{other.generation}.0") is None
+
+    store._log.capacity = 2
+    for review_id in store.table().keys[:3]:
+        store.moderate([review_id], "rejected")
+    assert store.changes_since(version) is None
+
+    # Reloading the same file keeps the generation but starts the count again
+    later = store.version
+    store.load_file(DEFAULT_DATA_PATH)
+    assert store.changes_since(later) is None
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_changes_endpoint(client):
+    live = get_review_store()
+    items = json.loads(DEFAULT_DATA_PATH.read_text())
+    version = live.version
+
+    live.upsert([{**items[0], "id": 7002}])
+    live.remove("7002")
+    live.upsert([{**items[1], "id": 7003}])
+    body = client.get("/api/v1/reviews/changes", params={"since": version}).json()
+
+    assert body["resync"] is False
+    assert body["version"] == live.version
+    assert [review["id"] for review in body["upserted"]] == ["7003"]
+    assert body["deleted"] == ["7002"]
+
+    stale = client.get("/api/v1/reviews/changes", params={"since": "0000.1"}).json()
+    assert (stale["resync"], stale["upserted"], stale["deleted"]) == (True, [], [])
+    live.remove("7003")
@@ -0,0 +1,39 @@
+"""Conditional GET: ETags from the dataset version, and 304s for unchanged views"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.store.reviews import get_review_store
+from app.middleware.caching import etag_matches, make_etag
+from main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_etag_ignores_query_order_and_matches_weakly():
+    etag = make_etag("v.1", "/api/v1/reviews/", b"limit=5&sort_by=rating")
+
+    assert etag == make_etag("v.1", "/api/v1/reviews/", b"sort_by=rating&limit=5")
+    assert etag != make_etag("v.2", "/api/v1/reviews/", b"limit=5&sort_by=rating")
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_unchanged_listing_is_answered_with_304(client):
+    first = client.get("/api/v1/reviews/", params={"limit": 5})
+    etag = first.headers["etag"]
+
+    again = client.get("/api/v1/reviews/", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    live = get_review_store()
+    live.upsert([{**first.json()["result"][0], "id": 7004}])
+    live.remove("7004")
+    changed = client.get("/api/v1/reviews/", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
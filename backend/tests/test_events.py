@@ -0,0 +1,116 @@
+"""SSE fan-out: live events, Last-Event-ID resume, and resyncs"""
+import asyncio
+
+import pytest
+
+from app.core.events.broadcast import EventBroadcaster
+from app.core.store.reviews import DEFAULT_DATA_PATH, ReviewStore
+
+
+@pytest.fixture
+def store():
+    store = ReviewStore()
+    store.load_file(DEFAULT_DATA_PATH)
+    return store
+
+
+def events(chunk: bytes) -> list[str]:
+    return [line[len(b"event: "):].decode() for line in chunk.splitlines() if line.startswith(b"event: ")]
+
+
+def event_id(chunk: bytes) -> str:
+    return next(line[len(b"id: "):].decode() for line in chunk.splitlines() if line.startswith(b"id: "))
+
+
+async def written(store: ReviewStore, review_id: str, status: str = "rejected") -> None:
+    store.moderate([review_id], status)
+    # The change reaches the buffer on the loop's next turn
+    await asyncio.sleep(0)
+
+
+async def test_connected_client_receives_changes(store):
+    broadcaster = EventBroadcaster(store, buffer_size=8, heartbeat=0.05, max_ids=5)
+    stream = broadcaster.stream()
+    assert events(await anext(stream)) == ["ready"]
+
+    await written(store, store.table().keys[0])
+    chunk = await anext(stream)
+
+    assert events(chunk) == ["reviews.status", "properties.stats"]
+    assert event_id(chunk).endswith("-1")
+    assert await anext(stream) == b": keep-alive\n\n"
+    await stream.aclose()
+    assert broadcaster.clients == 0
+
+
+async def test_reconnect_resumes_after_the_last_event(store):
+    broadcaster = EventBroadcaster(store, buffer_size=8, heartbeat=0.05, max_ids=5)
+    keys = store.table().keys
+    first = broadcaster.stream()
+    await anext(first)
+    await written(store, keys[0])
+    last_seen = event_id(await anext(first))
+    await written(store, keys[1])
+    await written(store, keys[2])
+    await first.aclose()
+
+    resumed = broadcaster.stream(last_seen)
+    assert events(await anext(resumed)) == ["ready"]
+    missed = [await anext(resumed), await anext(resumed)]
+
+    assert [event_id(chunk).rsplit("-", 1)[1] for chunk in missed] == ["2", "3"]
+    assert broadcaster.resyncs == 0
+    await resumed.aclose()
+
+
+@pytest.mark.parametrize("last_event_id", ["other-1", "garbage", "stale"])
+async def test_unknown_resume_point_resyncs(store, last_event_id):
+    broadcaster = EventBroadcaster(store, buffer_size=2, heartbeat=0.05, max_ids=5)
+    keys = store.table().keys
+    client = broadcaster.stream()
+    await anext(client)
+    for review_id in keys[:4]:
+        await written(store, review_id)
+    await client.aclose()
+    if last_event_id == "stale":
+        # Our own id, but older than the two events the buffer still holds
+        last_event_id = f"{broadcaster._token}-1"
+
+    stream = broadcaster.stream(last_event_id)
+
+    assert events(await anext(stream)) == ["resync"]
+    assert events(await anext(stream)) == ["ready"]
+    assert broadcaster.resyncs == 1
+    await stream.aclose()
+
+
+async def test_client_that_falls_behind_is_resynced(store):
+    broadcaster = EventBroadcaster(store, buffer_size=2, heartbeat=0.05, max_ids=5)
+    keys = store.table().keys
+    stream = broadcaster.stream()
+    await anext(stream)
+
+    for review_id in keys[:4]:
+        await written(store, review_id)
+    chunk = await anext(stream)
+
+    assert events(chunk) == ["resync"]
+    assert event_id(chunk).endswith("-4")
+    await written(store, keys[4])
+    assert events(await anext(stream))[0] == "reviews.status"
+    await stream.aclose()
+
+
+async def test_reloads_and_large_writes_are_sent_as_resyncs(store):
+    broadcaster = EventBroadcaster(store, buffer_size=8, heartbeat=0.05, max_ids=2)
+    stream = broadcaster.stream()
+    await anext(stream)
+
+    store.moderate(store.table().keys[:3], "rejected")
+    await asyncio.sleep(0)
+    assert events(await anext(stream)) == ["resync"]
+
+    store.load_file(DEFAULT_DATA_PATH)
+    await asyncio.sleep(0)
+    assert events(await anext(stream)) == ["resync"]
+    await stream.aclose()
@@ -0,0 +1,60 @@
+"""GooglePlacesClient caching and request coalescing against a stub API"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.google_places import GooglePlacesClient
+
+
+class StubPlaces:
+    """Answers text searches and place details after a short delay, counting calls"""
+
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        endpoint = request.url.path.rsplit("/", 2)[-2]
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+        await asyncio.sleep(0.01)
+        if endpoint == "textsearch":
+            return httpx.Response(200, json={"status": "OK", "results": [{"place_id": "place-1"}]})
+        return httpx.Response(200, json={"status": "OK", "result": {"reviews": [{"text": "Great stay"}]}})
+
+
+@pytest.fixture
+def stub():
+    return StubPlaces()
+
+
+@pytest.fixture
+def client(stub, tmp_path):
+    http = httpx.AsyncClient(transport=httpx.MockTransport(stub))
+    return GooglePlacesClient(api_key="key", http=http, cache_path=tmp_path / "place_ids.json")
+
+
+async def test_concurrent_identical_searches_share_one_call(client, stub):
+    results = await asyncio.gather(*(client.search_place("Shoreditch Heights") for _ in range(5)))
+
+    assert results == ["place-1"] * 5
+    assert stub.calls == {"textsearch": 1}
+    # Resolved ids are cached, and persisted for the next process
+    assert await client.search_place("shoreditch heights ") == "place-1"
+    assert stub.calls == {"textsearch": 1}
+    assert "place-1" in client.cache_path.read_text()
+
+
+async def test_concurrent_identical_review_fetches_share_one_call(client, stub):
+    results = await asyncio.gather(*(client.get_place_reviews("place-1") for _ in range(5)))
+
+    assert all(reviews == [{"text": "Great stay"}] for reviews in results)
+    assert stub.calls == {"details": 1}
+    await client.get_place_reviews("place-1")
+    assert stub.calls == {"details": 1}
+
+
+async def test_properties_batch_searches_each_query_once(client, stub):
+    reviews = await client.get_reviews_for_properties({"a": "Camden Lofts", "b": "Camden Lofts"})
+
+    assert reviews == {"a": [{"text": "Great stay"}], "b": [{"text": "Great stay"}]}
+    assert stub.calls == {"textsearch": 1, "details": 1}
@@ -0,0 +1,116 @@
+"""HostawayClient against a stub Hostaway API (httpx.MockTransport)"""
+import time
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.hostaway import HostawayClient, HostawayError, RetryBudget
+
+TOTAL_REVIEWS = 23
+
+
+def review_item(n: int) -> dict:
+    return {"id": n, "type": "guest-to-host", "status": "published", "rating": 10}
+
+
+def reviews_page(request: httpx.Request, count: bool = True) -> httpx.Response:
+    limit = int(request.url.params["limit"])
+    offset = int(request.url.params["offset"])
+    body = {"status": "success", "result": [review_item(n) for n in range(offset, min(offset + limit, TOTAL_REVIEWS))]}
+    if count:
+        body["count"] = TOTAL_REVIEWS
+    return httpx.Response(200, json=body)
+
+
+def make_client(handler, **kwargs) -> HostawayClient:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    kwargs.setdefault("page_size", 5)
+    kwargs.setdefault("max_concurrency", 2)
+    kwargs.setdefault("backoff_base", 0.001)
+    return HostawayClient(http=http, base_url="https://stub.test/v1", api_key="key", account_id=1, **kwargs)
+
+
+@pytest.mark.parametrize("count", [True, False], ids=["with-count", "without-count"])
+async def test_fetches_every_page(count):
+    offsets = []
+
+    def handler(request):
+        offsets.append(int(request.url.params["offset"]))
+        return reviews_page(request, count=count)
+
+    client = make_client(handler)
+    items = await client.fetch_reviews()
+
+    assert sorted(item["id"] for item in items) == list(range(TOTAL_REVIEWS))
+    assert set(offsets) >= {0, 5, 10, 15, 20}
+    assert len(offsets) == len(set(offsets))
+
+
+async def test_429_waits_for_retry_after():
+    calls = []
+
+    def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.2"})
+        return reviews_page(request)
+
+    client = make_client(handler, page_size=50)
+    items = await client.fetch_reviews()
+
+    assert len(items) == TOTAL_REVIEWS
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+
+
+async def test_5xx_retries_stop_when_budget_is_spent():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    client = make_client(handler, max_retries=10)
+    client.retry_budget = RetryBudget(ratio=0.0, min_tokens=2)
+
+    with pytest.raises(HostawayError, match="after 3 attempts"):
+        await client.fetch_reviews()
+    # The first attempt plus the two retries the budget allows, not max_retries
+    assert calls == 3
+
+
+async def test_5xx_recovers_within_budget():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(502) if calls <= 2 else reviews_page(request)
+
+    client = make_client(handler, page_size=50)
+
+    assert len(await client.fetch_reviews()) == TOTAL_REVIEWS
+    assert calls == 3
+
+
+async def test_client_errors_are_not_retried():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(401)
+
+    with pytest.raises(HostawayError, match="401"):
+        await make_client(handler).fetch_reviews()
+    assert calls == 1
+
+
+async def test_upstream_failure_surfaces_instead_of_mock_data(monkeypatch):
+    monkeypatch.setattr(settings, "HOSTAWAY_USE_MOCK", False)
+    client = make_client(lambda request: httpx.Response(500), max_retries=1)
+
+    with pytest.raises(HostawayError):
+        await client.get_reviews()
@@ -0,0 +1,34 @@
+"""HostawayNormalizer agrees with what the review store serves"""
+import json
+
+from app.core.normalizers.hostaway import HostawayNormalizer, review_payload
+from app.core.store.reviews import DEFAULT_DATA_PATH, ReviewStore
+from app.models.enums import ReviewSource
+from app.models.review import Review
+
+COMPARED = {"id", "property_id", "property_name", "guest_name", "rating", "comment",
+            "date", "source", "status", "response", "categories"}
+
+
+def test_normalizer_matches_store_payloads():
+    items = json.loads(DEFAULT_DATA_PATH.read_text())
+    store = ReviewStore()
+    store.upsert(items)
+
+    reviews = HostawayNormalizer().normalize_batch(items)
+    records = store.records_for([str(item["id"]) for item in items])
+
+    assert len(reviews) == len(records) == len(items)
+    for review, record in zip(reviews, records):
+        served = Review.model_validate(review_payload(record, review.created_at))
+        assert review.model_dump(include=COMPARED) == served.model_dump(include=COMPARED)
+
+
+def test_unknown_channels_and_missing_dates():
+    item = {"id": 7, "rating": 4, "channel": "direct", "listingName": "Somewhere", "guestName": "Ann"}
+
+    review = HostawayNormalizer().normalize(item)
+
+    assert review.source == ReviewSource.HOSTAWAY
+    assert review.date.tzinfo is not None
+    assert review.created_at.tzinfo is not None
@@ -0,0 +1,157 @@
+"""HostawaySync polling against a stub Hostaway API"""
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.core.store.reviews import ReviewStore
+from app.services.hostaway import HostawayClient
+from app.services.sync import HostawaySync, LeaderLock
+
+PAGE_SIZE = 5
+
+
+def review_item(n: int) -> dict:
+    return {
+        "id": n,
+        "type": "guest-to-host",
+        "status": "published",
+        "rating": 10,
+        "publicReview": f"Stay number {n}",
+        "guestName": f"Guest {n}",
+        "listingName": "2B N1 A - 29 Shoreditch Heights",
+        "submittedAt": f"2024-01-{n + 1:02d} 12:00:00",
+        "reviewCategory": [],
+    }
+
+
+class StubHostaway:
+    """Serves `items` by limit/offset, newest first when asked to sort"""
+
+    def __init__(self, count: int, honor_sort: bool = True):
+        self.items = [review_item(n) for n in range(count)]
+        self.honor_sort = honor_sort
+        self.offsets: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        offset, limit = int(params["offset"]), int(params["limit"])
+        self.offsets.append(offset)
+        items = self.items
+        if self.honor_sort and params.get("sortOrder") == "desc":
+            items = sorted(items, key=lambda item: item["submittedAt"], reverse=True)
+        return httpx.Response(200, json={"status": "success", "result": items[offset:offset + limit]})
+
+
+@pytest.fixture
+def make_sync(tmp_path):
+    def make(stub: StubHostaway, **kwargs) -> HostawaySync:
+        http = httpx.AsyncClient(transport=httpx.MockTransport(stub))
+        client = HostawayClient(
+            http=http, base_url="https://stub.test/v1", api_key="key", account_id=1,
+            page_size=PAGE_SIZE, max_concurrency=1,
+        )
+        kwargs.setdefault("full_every", 0)
+        return HostawaySync(
+            ReviewStore(), client, state_path=tmp_path / "state.json",
+            lock=LeaderLock(tmp_path / "sync.lock"), **kwargs,
+        )
+    return make
+
+
+async def test_first_run_reads_everything(make_sync):
+    stub = StubHostaway(23)
+    sync = make_sync(stub)
+
+    status = await sync.run_once()
+
+    assert status["last_full"] is True
+    assert status["last_seen"] == 23
+    assert len(sync.store) == 23
+
+
+async def test_incremental_run_stops_at_the_high_water_mark(make_sync):
+    stub = StubHostaway(23)
+    sync = make_sync(stub)
+    await sync.run_once()
+    stub.items += [review_item(23), review_item(24)]
+    stub.offsets.clear()
+
+    status = await sync.run_once()
+
+    assert status["last_full"] is False
+    # The first page holds both new reviews; the second is all old, so paging stops
+    assert stub.offsets == [0, PAGE_SIZE]
+    assert sync.store.get_row("24") is not None
+    assert sync.high_water_mark[1] == "24"
+
+
+async def test_unsorted_upstream_is_read_in_full(make_sync):
+    stub = StubHostaway(23, honor_sort=False)
+    sync = make_sync(stub)
+    await sync.run_once()
+    stub.items.append(review_item(30))
+
+    status = await sync.run_once()
+
+    assert status["last_seen"] == 24
+    assert sync.store.get_row("30") is not None
+
+
+async def test_periodic_full_run_picks_up_edits(make_sync):
+    stub = StubHostaway(23)
+    sync = make_sync(stub, full_every=2)
+    await sync.run_once()
+    stub.items[0]["publicReview"] = "Edited after posting"
+
+    await sync.run_once()   # incremental: the edited review is below the mark
+    assert sync.store.get_row("0")["publicReview"] == "Stay number 0"
+    await sync.run_once()   # full
+    assert sync.store.get_row("0")["publicReview"] == "Edited after posting"
+
+
+async def test_only_the_lock_holder_polls(make_sync, tmp_path):
+    stub = StubHostaway(3)
+    leader, follower = make_sync(stub, interval=0.01), make_sync(stub, interval=0.01)
+
+    leader.start()
+    await asyncio.sleep(0.05)
+    follower.start()
+    await asyncio.sleep(0.05)
+
+    assert leader.status()["leader"] and leader.runs > 0
+    assert not follower.status()["leader"] and follower.runs == 0
+
+    await leader.stop()
+    await asyncio.sleep(0.05)
+    assert follower.status()["leader"] and follower.runs > 0
+    await follower.stop()
+
+
+async def test_full_run_keeps_moderation(make_sync):
+    stub = StubHostaway(5)
+    sync = make_sync(stub)
+    await sync.run_once()
+    sync.store.moderate(["3"], "rejected", "Not a guest")
+
+    await sync.run_once(full=True)
+
+    row = sync.store.get_row("3")
+    assert (row["status"], row["response"]) == ("rejected", "Not a guest")
+
+
+async def test_batches_are_applied_off_the_event_loop(make_sync):
+    sync = make_sync(StubHostaway(7), batch_size=3)
+    upsert, threads = sync.store.upsert, []
+
+    def recording_upsert(items):
+        threads.append(threading.current_thread())
+        return upsert(items)
+
+    sync.store.upsert = recording_upsert
+    await sync.run_once()
+
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+    assert len(sync.store) == 7
@@ -0,0 +1,51 @@
+"""Streaming backfill into a review snapshot"""
+import gzip
+import json
+
+from app.core.store.ingest import ingest_files, iter_export, main
+from app.core.store.reviews import DEFAULT_DATA_PATH, ReviewStore
+
+
+def write_exports(tmp_path):
+    items = json.loads(DEFAULT_DATA_PATH.read_text())
+    ndjson = tmp_path / "first.ndjson.gz"
+    with gzip.open(ndjson, "wt", encoding="utf-8") as f:
+        f.write("\n".join(json.dumps(item) for item in items))
+    later = tmp_path / "second.json"
+    later.write_text(json.dumps([{**item, "id": item["id"] + 1000} for item in items]))
+    return items, ndjson, later
+
+
+def test_iter_export_reads_arrays_and_ndjson(tmp_path):
+    items, ndjson, later = write_exports(tmp_path)
+
+    assert list(iter_export(ndjson)) == items
+    assert [item["id"] for item in iter_export(later)] == [item["id"] + 1000 for item in items]
+
+
+def test_ingest_files_upserts_in_batches(tmp_path):
+    items, ndjson, later = write_exports(tmp_path)
+    store = ReviewStore()
+
+    reports = ingest_files(store, [ndjson, later], batch_size=3, on_progress=None)
+
+    assert [r.records for r in reports] == [len(items), len(items)]
+    assert reports[0].batches == -(-len(items) // 3)
+    assert len(store) == 2 * len(items)
+
+
+def test_cli_backfills_a_snapshot(tmp_path, capsys):
+    items, ndjson, later = write_exports(tmp_path)
+    snapshot = tmp_path / "reviews.snapshot"
+
+    main(["--snapshot", str(snapshot), str(ndjson)])
+    main(["--snapshot", str(snapshot), "--batch-size", "2", str(later)])
+    store = ReviewStore()
+    store.load_file(snapshot)
+    assert len(store) == 2 * len(items)
+
+    main(["--snapshot", str(snapshot), "--replace", str(later)])
+    store.load_file(snapshot)
+    assert len(store) == len(items)
+    assert store.get_row(str(items[0]["id"])) is None
+    assert "wrote" in capsys.readouterr().out
@@ -0,0 +1,120 @@
+"""Moderation is written to the database before the review store, and restored from it"""
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.store.reviews import DEFAULT_DATA_PATH, ReviewStore
+from app.db.repositories.reviews import ReviewRepository
+from app.models.enums import ReviewStatus
+from app.config import settings
+from app.services.moderation import ModerationWatcher, moderate, restore_moderation
+
+
+def loaded_store() -> ReviewStore:
+    store = ReviewStore()
+    store.load_file(DEFAULT_DATA_PATH)
+    return store
+
+
+async def test_decisions_are_persisted_then_applied(session):
+    store = loaded_store()
+    ids = [record["id"] for record in store.records()[:3]]
+    repository = ReviewRepository(session)
+
+    outcomes = await moderate(store, repository, ids + ["missing"], ReviewStatus.APPROVED, "Thanks!")
+
+    assert outcomes == {**{review_id: "updated" for review_id in ids}, "missing": "not_found"}
+    assert sorted(await repository.get_statuses()) == sorted((review_id, "approved", "Thanks!") for review_id in ids)
+    assert {store.get_record(review_id)["status"] for review_id in ids} == {"approved"}
+
+    # A second decision updates the rows the first one added
+    await moderate(store, repository, ids[:1], ReviewStatus.REJECTED)
+    assert (await repository.get_by_id(ids[0])).status == ReviewStatus.REJECTED
+
+
+async def test_reloaded_store_gets_decisions_back(session):
+    store = loaded_store()
+    review_id = store.records()[0]["id"]
+    repository = ReviewRepository(session)
+    await moderate(store, repository, [review_id], ReviewStatus.REJECTED, "Not a guest")
+
+    fresh = loaded_store()
+    assert fresh.get_record(review_id)["status"] != "rejected"
+
+    assert await restore_moderation(fresh, repository) == 1
+    record = fresh.get_record(review_id)
+    assert (record["status"], record["response"]) == ("rejected", "Not a guest")
+    assert await restore_moderation(fresh, repository) == 0
+
+
+async def test_failed_write_leaves_the_store_untouched(session, monkeypatch):
+    store = loaded_store()
+    review_id = store.records()[0]["id"]
+    before = store.get_record(review_id)["status"]
+    repository = ReviewRepository(session)
+
+    async def fail(*args, **kwargs):
+        raise OperationalError("UPDATE reviews", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(repository, "update_status_many", fail)
+    with pytest.raises(OperationalError):
+        await moderate(store, repository, [review_id], ReviewStatus.APPROVED)
+
+    assert store.get_record(review_id)["status"] == before
+    assert await repository.get_statuses() == []
+
+
+async def test_raw_ratings_are_stored_and_bad_rows_reported(session):
+    store = loaded_store()
+    item = {
+        "type": "guest-to-host", "status": "pending", "publicReview": "Fine",
+        "guestName": "Ana", "listingName": "2B N1 A - 29 Shoreditch Heights",
+        "submittedAt": "2024-05-01 10:00:00", "reviewCategory": [],
+    }
+    store.upsert([
+        {**item, "id": 901, "rating": None},
+        {**item, "id": 902, "rating": 9},
+        {**item, "id": 903, "rating": 8, "guestName": None},
+    ])
+    repository = ReviewRepository(session)
+
+    outcomes = await moderate(store, repository, ["901", "902", "903"], ReviewStatus.APPROVED)
+
+    assert outcomes == {"901": "updated", "902": "updated", "903": "invalid"}
+    assert sorted(await repository.get_statuses()) == [("901", "approved", None), ("902", "approved", None)]
+    assert store.get_record("903")["status"] == "pending"
+
+
+async def test_other_workers_apply_decisions_without_a_snapshot(session, tmp_path, monkeypatch):
+    snapshot = tmp_path / "reviews.snap"
+    monkeypatch.setattr(settings, "REVIEW_SNAPSHOT_PATH", str(snapshot))
+    here, there = loaded_store(), loaded_store()
+    first, second = [record["id"] for record in here.records()[:2]]
+    repository = ReviewRepository(session)
+    watcher = ModerationWatcher(there, interval=0)
+    generation = there.generation
+
+    await moderate(here, repository, [first], ReviewStatus.REJECTED)
+    assert await watcher.poll_once(repository) == 1
+    await moderate(here, repository, [second], ReviewStatus.REJECTED, "Spam")
+    assert await watcher.poll_once(repository) == 1
+
+    assert not snapshot.exists()
+    assert there.generation == generation
+    assert there.get_record(first)["status"] == "rejected"
+    assert (there.get_record(second)["status"], there.get_record(second)["response"]) == ("rejected", "Spam")
+
+
+async def test_watcher_reapplies_everything_after_a_reload(session):
+    here, there = loaded_store(), loaded_store()
+    review_id = here.records()[0]["id"]
+    repository = ReviewRepository(session)
+    watcher = ModerationWatcher(there, interval=0)
+    await moderate(here, repository, [review_id], ReviewStatus.REJECTED)
+    await watcher.poll_once(repository)
+
+    there.load_file(DEFAULT_DATA_PATH)
+    assert there.get_record(review_id)["status"] != "rejected"
+
+    assert await watcher.poll_once(repository) == 1
+    assert there.get_record(review_id)["status"] == "rejected"
+    await watcher.stop()
@@ -0,0 +1,65 @@
+"""ResultCache invalidation driven by review store writes"""
+import json
+
+import pytest
+
+from app.core.cache.backends import CacheBackend, MemoryBackend
+from app.core.cache.results import ALL_REVIEWS, REVIEW_CONTENT, ResultCache, property_tag
+from app.core.store.reviews import DEFAULT_DATA_PATH, ReviewStore
+
+
+@pytest.fixture
+def items():
+    return json.loads(DEFAULT_DATA_PATH.read_text())
+
+
+@pytest.fixture
+def store(items):
+    store = ReviewStore()
+    store.upsert(items)
+    return store
+
+
+@pytest.fixture
+def cache(store):
+    return ResultCache(store, MemoryBackend(), ttl=60)
+
+
+def cached(cache: ResultCache, name: str, depends_on) -> bool:
+    """Whether `name` is still cached (fills it if not)"""
+    hits = cache.hits
+    cache.get_or_compute(name, {}, lambda: {"name": name}, depends_on=depends_on)
+    return cache.hits > hits
+
+
+def fill(cache: ResultCache, store: ReviewStore) -> list[tuple[str, list[str]]]:
+    entries = [("everything", [ALL_REVIEWS]), ("portfolio", [REVIEW_CONTENT])]
+    entries += [(pid, [property_tag(pid)]) for pid in store.property_ids()]
+    for name, tags in entries:
+        cached(cache, name, tags)
+    return entries
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_upsert_drops_only_the_touched_property_and_portfolio_results(cache, store, items):
+    entries = fill(cache, store)
+    item = items[0]
+    property_id = store.records_for([str(item["id"])])[0]["property_id"]
+    store.upsert([{**item, "publicReview": "Rewritten"}])
+
+    still_cached = {name for name, tags in entries if cached(cache, name, tags)}
+
+    assert still_cached == {name for name, _ in entries} - {"everything", "portfolio", property_id}
+
+
+def test_moderation_keeps_content_results(cache, store, items):
+    entries = fill(cache, store)
+    store.set_status(str(items[0]["id"]), "rejected")
+
+    still_cached = {name for name, tags in entries if cached(cache, name, tags)}
+
+    assert still_cached == {name for name, _ in entries} - {"everything"}
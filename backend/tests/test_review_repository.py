@@ -0,0 +1,123 @@
+"""ReviewRepository against an in-memory aiosqlite database"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.repositories.reviews import ReviewRepository
+from app.models.enums import ReviewSource, ReviewStatus
+from app.models.review import Review, ReviewFilters
+
+BASE_DATE = datetime(2024, 1, 1)
+
+
+def make_review(n: int, **overrides) -> Review:
+    fields = {
+        "id": f"r{n:03d}",
+        "property_id": "shoreditch-heights" if n % 2 else "camden-lofts",
+        "property_name": "Shoreditch Heights" if n % 2 else "Camden Lofts",
+        "guest_name": f"Guest {n}",
+        "rating": 1.0 + n % 5,
+        "comment": f"Stay number {n}",
+        # Pairs of reviews share a date, so keyset pagination has ties to break
+        "date": BASE_DATE + timedelta(days=n // 2),
+        "source": ReviewSource.HOSTAWAY,
+    }
+    fields.update(overrides)
+    return Review(**fields)
+
+
+@pytest.fixture
+async def repo(session):
+    repo = ReviewRepository(session)
+    await repo.upsert_many([make_review(n) for n in range(10)])
+    return repo
+
+
+async def test_create_and_get_by_id(session):
+    repo = ReviewRepository(session)
+    created = await repo.create(make_review(1, comment="Lovely flat"))
+
+    assert created.id == "r001"
+    fetched = await repo.get_by_id("r001")
+    assert fetched is not None
+    assert fetched.comment == "Lovely flat"
+    assert fetched.source == ReviewSource.HOSTAWAY
+    assert fetched.status == ReviewStatus.PENDING
+    assert await repo.get_by_id("missing") is None
+
+
+async def test_get_all_orders_newest_first_with_id_tiebreak(repo):
+    reviews = await repo.get_all(limit=100)
+
+    keys = [(r.date, r.id) for r in reviews]
+    assert keys == sorted(keys, reverse=True)
+    assert len(reviews) == 10
+
+
+async def test_keyset_pagination_continues_after_cursor(repo):
+    expected = [r.id for r in await repo.get_all(limit=100)]
+
+    seen = []
+    after = None
+    while True:
+        page = await repo.get_all(limit=3, after=after)
+        if not page:
+            break
+        seen.extend(r.id for r in page)
+        last = page[-1]
+        after = (last.date, last.id)
+
+    assert seen == expected
+
+
+async def test_keyset_pagination_ascending_by_rating(repo):
+    first = await repo.get_all(limit=4, sort_by="rating", descending=False)
+    last = first[-1]
+    rest = await repo.get_all(limit=100, sort_by="rating", descending=False, after=(last.rating, last.id))
+
+    keys = [(r.rating, r.id) for r in first + rest]
+    assert keys == sorted(keys)
+    assert len(keys) == 10
+
+
+async def test_filters_and_count(repo):
+    filters = ReviewFilters(property_id="shoreditch-heights", min_rating=3.0)
+    reviews = await repo.get_all(filters=filters)
+
+    assert reviews
+    assert all(r.property_id == "shoreditch-heights" and r.rating >= 3.0 for r in reviews)
+    assert await repo.count(filters) == len(reviews)
+    assert [r.id for r in await repo.get_by_property("camden-lofts")] == [
+        f"r{n:03d}" for n in (8, 6, 4, 2, 0)
+    ]
+
+
+async def test_upsert_updates_existing_rows(repo):
+    written = await repo.upsert_many([
+        make_review(1, comment="Edited upstream", rating=5.0),
+        make_review(42),
+    ])
+
+    assert written == 2
+    assert await repo.count() == 11
+    updated = await repo.get_by_id("r001")
+    assert updated.comment == "Edited upstream"
+    assert updated.rating == 5.0
+
+
+async def test_update_status(repo):
+    updated = await repo.update_status("r003", ReviewStatus.APPROVED, response="Thanks!")
+
+    assert updated.status == ReviewStatus.APPROVED
+    assert updated.response == "Thanks!"
+    assert (await repo.get_by_id("r003")).status == ReviewStatus.APPROVED
+    assert await repo.update_status("missing", ReviewStatus.APPROVED) is None
+
+
+async def test_update_status_many(repo):
+    found = await repo.update_status_many(["r001", "r002", "missing"], ReviewStatus.REJECTED)
+
+    assert found == {"r001", "r002"}
+    rejected = await repo.get_all(filters=ReviewFilters(status=ReviewStatus.REJECTED))
+    assert {r.id for r in rejected} == {"r001", "r002"}
+    assert await repo.update_status_many([], ReviewStatus.APPROVED) == set()
@@ -0,0 +1,53 @@
+"""ReviewStore writes keep the sort orders readers hold (without the lock) sorted"""
+import json
+
+import pytest
+
+from app.core.store.reviews import BULK_UPSERT_THRESHOLD, DEFAULT_DATA_PATH, ReviewStore
+
+
+@pytest.fixture
+def store():
+    store = ReviewStore()
+    store.load_file(DEFAULT_DATA_PATH)
+    return store
+
+
+def later_copies(count: int) -> list[dict]:
+    items = json.loads(DEFAULT_DATA_PATH.read_text())
+    return [{**items[n % len(items)], "id": 5000 + n, "guestName": f"Guest {n}"} for n in range(count)]
+
+
+def test_bulk_upsert_publishes_new_sort_orders(store):
+    count = BULK_UPSERT_THRESHOLD + 1
+    held = {field: store.sort_order(field) for field in ("date", "rating", "guest_name")}
+    before = {field: list(order) for field, order in held.items()}
+
+    store.upsert(later_copies(count))
+
+    for field, order in held.items():
+        assert order == before[field]
+        current = store.sort_order(field)
+        assert current is not order
+        assert current == sorted(current)
+        assert len(current) == len(order) + count
+    assert store.count_by_date() == len(store)
+
+
+def test_small_upsert_keeps_sort_orders_sorted(store):
+    held = store.sort_order("rating")
+    size = len(held)
+
+    store.upsert(later_copies(3))
+
+    assert held == sorted(held)
+    assert len(held) == size + 3
+
+
+def test_remove_keeps_sort_orders_sorted(store):
+    review_id = store.sort_order("date")[0][1]
+
+    assert store.remove(review_id)
+
+    assert review_id not in {entry[1] for entry in store.sort_order("date")}
+    assert store.ids_by_date() == [entry[1] for entry in store.sort_order("date")]
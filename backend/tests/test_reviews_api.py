@@ -0,0 +1,85 @@
+"""Review listing endpoints, served from the store loaded from the mock export"""
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_property_reviews_are_served_in_review_shape(client):
+    response = client.get("/api/v1/properties/shoreditch-heights/reviews")
+
+    assert response.status_code == 200
+    reviews = response.json()
+    assert reviews
+    assert {"id", "property_id", "rating", "source", "status", "created_at"} <= set(reviews[0])
+    assert {review["source"] for review in reviews} <= {"hostaway", "google", "airbnb", "booking"}
+
+
+def test_property_reviews_do_not_claim_a_validated_schema(client):
+    spec = client.get("/api/v1/openapi.json").json()
+    content = spec["paths"]["/api/v1/properties/{property_id}/reviews"]["get"]["responses"]["200"]["content"]
+
+    assert "$ref" not in str(content)
+
+
+def test_listing_phases_are_timed_separately(client):
+    client.get("/api/v1/reviews/", params={"limit": 2, "sort_by": "rating"})
+    client.get("/api/v1/reviews/", params={"min_rating": 1})
+
+    metrics = client.get("/metrics").text
+    for phase in ("filter", "paginate", "serialize"):
+        assert f'route="/api/v1/reviews/",phase="{phase}"' in metrics
+
+
+@pytest.mark.parametrize("sort_by", ["date", "rating", "guest_name", "property"])
+def test_filtered_listing_can_be_sorted(client, sort_by):
+    response = client.get("/api/v1/reviews/", params={"min_rating": 1, "sort_by": sort_by, "sort_desc": False})
+
+    assert response.status_code == 200
+    reviews = response.json()["result"]
+    assert reviews
+    if sort_by == "rating":
+        assert [r["rating"] for r in reviews] == sorted(r["rating"] for r in reviews)
+
+
+
+def test_sort_fields_match_the_store():
+    from app.core.store.reviews import SORT_KEYS
+    from app.models.enums import SortField
+
+    assert {field.value for field in SortField} == set(SORT_KEYS)
+
+
+def test_unknown_sort_field_is_rejected(client):
+    assert client.get("/api/v1/reviews/", params={"sort_by": "bogus"}).status_code == 422
+
+
+@pytest.mark.parametrize("params", [{}, {"limit": 100}, {"min_rating": 1}])
+def test_listing_sorts_by_property(client, params):
+    response = client.get("/api/v1/reviews/", params={"sort_by": "property", "sort_desc": False, **params})
+
+    names = [review["listingName"].lower() for review in response.json()["result"]]
+    assert names and names == sorted(names)
+
+def test_moderation_is_persisted_before_it_is_served(client):
+    from app.db.repositories.reviews import ReviewRepository
+    from app.db.session import get_session_factory
+
+    review_id = str(client.get("/api/v1/reviews/", params={"limit": 1}).json()["result"][0]["id"])
+    response = client.post("/api/v1/reviews/moderation", json={"ids": [review_id], "status": "rejected"})
+
+    assert response.json()["updated"] == 1
+    listed = client.get("/api/v1/reviews/", params={"status": "rejected"}).json()["result"]
+    assert review_id in {str(review["id"]) for review in listed}
+
+    async def persisted():
+        async with get_session_factory()() as session:
+            return await ReviewRepository(session).get_statuses()
+
+    assert client.portal.call(persisted) == [(review_id, "rejected", None)]
@@ -0,0 +1,95 @@
+"""Sentiment scoring: the append-only score cache, the long-lived pool, and scoring outside the store lock"""
+import threading
+
+import numpy as np
+
+from app.core.sentiment.scorer import CACHE_HEADER, SentimentScorer, content_key
+from app.core.store import reviews as store_module
+from app.core.store.reviews import DEFAULT_DATA_PATH, ReviewStore
+
+
+def test_misses_are_appended_not_rewritten(tmp_path):
+    path = tmp_path / "scores.tsv"
+    scorer = SentimentScorer(path, workers=1)
+
+    scorer.score(["great stay", "dirty room", "   "])
+    first = path.read_text()
+    assert first.startswith(CACHE_HEADER)
+    assert len(first.splitlines()) == 3
+
+    scorer.score(["great stay", "lovely host"])
+    second = path.read_text()
+    assert second.startswith(first)
+    assert second[len(first):].startswith(content_key("lovely host") + "\t")
+    assert (scorer.scored, scorer.cache_hits) == (3, 1)
+
+
+def test_cache_reloads_and_skips_torn_lines(tmp_path):
+    path = tmp_path / "scores.tsv"
+    texts = ["great stay", "dirty room"]
+    expected = SentimentScorer(path, workers=1).score(texts)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(content_key("cut short"))
+
+    reloaded = SentimentScorer(path, workers=1)
+    np.testing.assert_array_equal(reloaded.score(texts), expected)
+    assert (reloaded.scored, reloaded.cache_hits) == (0, 2)
+
+
+def test_other_lexicon_versions_are_discarded(tmp_path):
+    path = tmp_path / "scores.tsv"
+    path.write_text("lexicon-v0\n" + content_key("great stay") + "\t0.5\n")
+
+    scorer = SentimentScorer(path, workers=1)
+    scorer.score(["great stay"])
+
+    assert scorer.scored == 1
+    assert path.read_text().startswith(CACHE_HEADER)
+    assert len(path.read_text().splitlines()) == 2
+
+
+def test_pool_is_started_once_and_reused(tmp_path):
+    scorer = SentimentScorer(tmp_path / "scores.tsv", workers=2, batch_size=2, pool_threshold=0)
+    try:
+        inline = SentimentScorer(tmp_path / "inline.tsv", workers=1).score(["a fine stay", "awful noise", "nice"])
+        np.testing.assert_array_equal(scorer.score(["a fine stay", "awful noise", "nice"]), inline)
+        pool = scorer._pool
+        assert pool is not None
+        scorer.score(["clean and quiet", "terrible wifi"])
+        assert scorer._pool is pool
+    finally:
+        scorer.close()
+    assert scorer._pool is None
+
+
+def test_analytics_scores_outside_the_store_lock(tmp_path, monkeypatch):
+    store = ReviewStore()
+    store.load_file(DEFAULT_DATA_PATH)
+    inner = SentimentScorer(tmp_path / "scores.tsv", workers=1)
+    held = []
+
+    class Probe:
+        def score(self, texts):
+            # Another thread can only take the lock if scoring does not hold it
+            got = []
+
+            def take():
+                got.append(store._lock.acquire(timeout=1))
+                if got[0]:
+                    store._lock.release()
+
+            thread = threading.Thread(target=take)
+            thread.start()
+            thread.join()
+            held.append(not got[0])
+            return inner.score(texts)
+
+    monkeypatch.setattr(store_module, "get_sentiment_scorer", lambda: Probe())
+    columns, sentiment = store.analytics_columns()
+
+    assert held == [False]
+    assert len(sentiment) == len(columns)
+    assert inner.scored > 0
+    # Already scored: nothing left to hand the scorer
+    store.analytics_columns()
+    assert held == [False]
@@ -0,0 +1,102 @@
+"""Publishing, mapping and refreshing review snapshots"""
+import json
+
+import pytest
+
+from app.core.store.reviews import DEFAULT_DATA_PATH, ReviewStore
+from app.core.store.snapshot import SnapshotTable, is_snapshot
+
+
+@pytest.fixture
+def items():
+    return json.loads(DEFAULT_DATA_PATH.read_text())
+
+
+@pytest.fixture
+def published(tmp_path):
+    store = ReviewStore()
+    store.load_file(DEFAULT_DATA_PATH)
+    path = store.publish_snapshot(tmp_path / "reviews.snap")
+    return store, path
+
+
+def test_snapshot_round_trips_every_row(published):
+    store, path = published
+
+    table = SnapshotTable(path)
+
+    assert is_snapshot(path) and not is_snapshot(DEFAULT_DATA_PATH)
+    assert table.keys == store.table().keys
+    for review_id, slot in store.table().slots.items():
+        assert table.row(table.slots[review_id]) == store.table().row(slot)
+        assert table.record_dict(table.slots[review_id]) == store.table().record_dict(slot)
+
+
+def test_removed_rows_are_left_out(published, tmp_path):
+    store, _ = published
+    removed = store.table().keys[0]
+    store.remove(removed)
+
+    table = SnapshotTable(store.publish_snapshot(tmp_path / "smaller.snap"))
+
+    assert removed not in table.slots
+    assert len(table) == len(store)
+
+
+def test_mapped_table_is_read_only(published):
+    _, path = published
+    table = SnapshotTable(path)
+
+    assert table.ratings.readonly and table.arena.buffer.readonly
+    with pytest.raises(TypeError):
+        table.set_value(0, "status", "rejected")
+    with pytest.raises(TypeError):
+        table.put({"id": 1}, "p", None)
+
+
+def test_first_write_thaws_a_private_copy(published):
+    _, path = published
+    before = path.read_bytes()
+    store = ReviewStore()
+    store.load_file(path)
+    assert isinstance(store.table(), SnapshotTable)
+    review_id = store.table().keys[0]
+
+    store.moderate([review_id], "rejected", "Not a guest")
+
+    assert not isinstance(store.table(), SnapshotTable)
+    record = store.get_record(review_id)
+    assert (record["status"], record["response"]) == ("rejected", "Not a guest")
+    assert path.read_bytes() == before
+
+
+def test_republished_snapshot_is_swapped_in(published, items):
+    writer, path = published
+    reader = ReviewStore()
+    reader.load_file(path)
+    old_table, generation = reader.table(), reader.generation
+    assert reader.refresh() is False
+
+    writer.upsert([{**items[0], "id": 9001}])
+    writer.publish_snapshot(path)
+
+    assert [p.name for p in path.parent.iterdir()] == [path.name]
+    # A mapping taken before the swap still reads the old file
+    assert "9001" not in old_table.slots
+    assert old_table.row(0) == writer.table().row(writer.table().slots[old_table.keys[0]])
+
+    assert reader.refresh() is True
+    assert reader.generation != generation
+    assert isinstance(reader.table(), SnapshotTable)
+    assert reader.get_row("9001") is not None
+    assert len(reader) == len(writer)
+    assert reader.refresh() is False
+
+
+def test_workers_mapping_one_snapshot_agree_on_the_version(published):
+    _, path = published
+    first, second = ReviewStore(), ReviewStore()
+    first.load_file(path)
+    second.load_file(path)
+
+    assert first.version == second.version
@@ -14,5 +14,6 @@ export enum ReviewStatus {
 export enum SortField {
   DATE = "date",
   RATING = "rating",
+  GUEST_NAME = "guest_name",
   PROPERTY = "property",
 }
@@ -14,6 +14,7 @@ export enum ReviewStatus {
 export enum SortField {
   DATE = "date",
   RATING = "rating",
+  GUEST_NAME = "guest_name",
   PROPERTY = "property",
 }
 